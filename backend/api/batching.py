@@ -0,0 +1,114 @@
+import asyncio
+from typing import TYPE_CHECKING, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from backend.api import profiling
+from backend.api.config import PREDICT_BATCH_MAX_ROWS, PREDICT_BATCH_WINDOW_MS
+from backend.models.name_conventions import INDEX_COL
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from backend.models.tabular_regressor import TabularRegressor
+
+
+class _Batch:
+    def __init__(self, model: "TabularRegressor"):
+        self.model = model
+        self.frames: list["pd.DataFrame"] = []
+        self.futures: list[asyncio.Future] = []
+        self.rows = 0
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class PredictBatcher:
+    """
+    Micro-batching layer for concurrent predictions against the same fitted model.
+
+    Requests for one model are held for up to ``window_ms`` milliseconds, or until
+    ``max_rows`` rows are queued, then stacked into a single DataFrame, predicted
+    with one ``model.predict`` call in the threadpool and split back per request.
+    A non-positive window disables batching and predicts each request on its own.
+    """
+
+    def __init__(self, window_ms: float = 2.0, max_rows: int = 1_000):
+        self.window_s = window_ms / 1000
+        self.max_rows = max_rows
+        self._pending: dict[int, _Batch] = {}
+        self._running: set[asyncio.Task] = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.window_s > 0
+
+    async def predict(
+        self, model: "TabularRegressor", X: "pd.DataFrame"
+    ) -> "pd.DataFrame":
+        if not self.enabled:
+            parts = await run_in_threadpool(_predict_stacked, model, [X])
+            return parts[0]
+
+        loop = asyncio.get_running_loop()
+        key = id(model)  # batches hold a reference, so ids are not reused meanwhile
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = _Batch(model)
+            batch.timer = loop.call_later(self.window_s, self._flush, key)
+            self._pending[key] = batch
+        future = loop.create_future()
+        batch.frames.append(X)
+        batch.futures.append(future)
+        batch.rows += len(X)
+        if batch.rows >= self.max_rows:
+            self._flush(key)
+        return await future
+
+    def _flush(self, key: int):
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        batch.timer.cancel()
+        task = asyncio.ensure_future(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: _Batch):
+        try:
+            parts = await run_in_threadpool(_predict_stacked, batch.model, batch.frames)
+        except Exception as exc:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for future, part in zip(batch.futures, parts):
+            if not future.done():
+                future.set_result(part)
+
+
+def _predict_stacked(
+    model: "TabularRegressor", frames: list["pd.DataFrame"]
+) -> list["pd.DataFrame"]:
+    import pandas as pd
+
+    # A batch is profiled with the request that opened it, if that one is profiled
+    with profiling.profile_thread():
+        if len(frames) == 1:
+            return [model.predict(frames[0])]
+        stacked = pd.concat(frames, ignore_index=True)
+        preds = model.predict(stacked)
+    parts = []
+    start = 0
+    for frame in frames:
+        stop = start + len(frame)
+        part = preds.iloc[start:stop].reset_index(drop=True)
+        # Restore each request's own index dtype, which concat may have widened
+        part[INDEX_COL] = frame[INDEX_COL].reset_index(drop=True)
+        parts.append(part)
+        start = stop
+    return parts
+
+
+predict_batcher = PredictBatcher(
+    window_ms=PREDICT_BATCH_WINDOW_MS, max_rows=PREDICT_BATCH_MAX_ROWS
+)
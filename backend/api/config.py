@@ -1,3 +1,4 @@
+import json
 import os
 from datetime import timedelta
 
@@ -8,14 +9,64 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 15
 def access_token_timedelta() -> timedelta:
     return timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
+# Define password hashing pool (bcrypt runs on its own bounded worker threads)
+PASSWORD_POOL_WORKERS = int(
+    os.getenv("PASSWORD_POOL_WORKERS", str(max(1, (os.cpu_count() or 1) // 2)))
+)
+PASSWORD_POOL_MAX_QUEUE = int(os.getenv("PASSWORD_POOL_MAX_QUEUE", "64"))
+
+# Define Prometheus metrics exposition: always at the admin-scoped /metrics route and,
+# if METRICS_PORT is set, also unauthenticated on METRICS_ADDR:METRICS_PORT
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+METRICS_ADDR = os.getenv("METRICS_ADDR", "127.0.0.1")
+
 # Define IP key salt for rate limiting
 IP_KEY_SALT = os.getenv("IP_KEY_SALT")
 
 # Define Redis database URL
 REDIS_URL = os.getenv("REDIS_URL")
 
+# Define HTTP body compression settings
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+MAX_DECOMPRESSED_BODY_BYTES = int(
+    os.getenv("MAX_DECOMPRESSED_BODY_BYTES", str(32 * 1024 * 1024))
+)
+
+# Define request body size limits in bytes, enforced before the body is parsed.
+# BODY_SIZE_LIMITS maps route prefixes to per-role limits ("*" matches any role,
+# "anonymous" requests without a valid token); other routes use MAX_BODY_BYTES.
+MAX_BODY_BYTES = int(os.getenv("MAX_BODY_BYTES", str(64 * 1024)))
+BODY_SIZE_LIMITS: dict[str, dict[str, int]] = json.loads(
+    os.getenv("BODY_SIZE_LIMITS", "null")
+) or {
+    "/tabular_regressor/train_predict": {
+        "client": 16 * 1024 * 1024,
+        "admin": 32 * 1024 * 1024,
+    },
+    "/admin/import_users": {"admin": 8 * 1024 * 1024},
+}
+
 # DEFINE RATE LIMITING SETTINGS
 DEFAULT_RL = (10, 60) # DEFAULT_RL[0] requests per DEFAULT_RL[1] seconds
+RATE_LIMIT_SYNC_SECONDS = float(os.getenv("RATE_LIMIT_SYNC_SECONDS", "1"))
+HASH_IP_CACHE_SIZE = int(os.getenv("HASH_IP_CACHE_SIZE", "65536"))
+
+# Define cost-weighted rate limiting: each user may spend COST_BUDGET[0] cost units
+# (rows x columns x model factor) per COST_BUDGET[1] seconds on train_predict
+COST_LIMIT_ENABLED = os.getenv("COST_LIMIT_ENABLED", "1") == "1"
+COST_BUDGET = (
+    int(os.getenv("COST_BUDGET_UNITS", "20000000")),
+    int(os.getenv("COST_BUDGET_SECONDS", "60")),
+)
+
+# Define user cache settings for get_current_user (optionally invalidated across
+# workers through Redis pub/sub)
+USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+USER_CACHE_PUBSUB = os.getenv("USER_CACHE_PUBSUB", "0") == "1"
+
+# Define verified token cache size (entries expire with their tokens)
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
 
 # Define available scopes and implications
 SCOPES: dict[str, str] = {
@@ -25,3 +76,78 @@ SCOPES: dict[str, str] = {
 SCOPE_IMPLICATIONS: dict[str, set[str]] = {
     "admin": {"client"},
 }
+
+# Define the per-worker CPU budget shared by estimator fits (n_jobs); defaults to
+# the cores of the host divided by the number of workers
+CPU_BUDGET_THREADS = int(
+    os.getenv(
+        "CPU_BUDGET_THREADS",
+        str(max(1, (os.cpu_count() or 1) // int(os.getenv("WEB_CONCURRENCY", "1")))),
+    )
+)
+CPU_BUDGET_MAX_JOBS_PER_FIT = int(os.getenv("CPU_BUDGET_MAX_JOBS_PER_FIT", "0"))
+# Seconds a fit waits for a free thread before it is rejected with 503
+CPU_BUDGET_TIMEOUT_SECONDS = float(os.getenv("CPU_BUDGET_TIMEOUT_SECONDS", "30"))
+BLAS_THREADS_PER_WORKER = int(os.getenv("BLAS_THREADS_PER_WORKER", "1"))
+
+# Define fair-share training scheduler settings: fits run at most
+# FAIR_SHARE_MAX_CONCURRENT at a time and queued fits are ordered by each user's
+# decayed CPU-seconds divided by the weight of their role. It defaults to the CPU
+# budget threads, so extra fits queue here in fair-share order instead of waiting
+# for a thread of the budget
+FAIR_SHARE_MAX_CONCURRENT = int(
+    os.getenv("FAIR_SHARE_MAX_CONCURRENT", str(CPU_BUDGET_THREADS))
+)
+FAIR_SHARE_HALF_LIFE_SECONDS = float(os.getenv("FAIR_SHARE_HALF_LIFE_SECONDS", "300"))
+ROLE_WEIGHTS: dict[str, float] = {scope: 1.0 for scope in SCOPES}
+ROLE_WEIGHTS.update(json.loads(os.getenv("ROLE_WEIGHTS", '{"admin": 2.0}')))
+
+# Define the per-worker memory budget for train_predict (0 disables it): requests are
+# admitted while the sum of their estimated peak memory fits, otherwise they wait up
+# to MEMORY_QUEUE_TIMEOUT_SECONDS; peak RSS is sampled every MEMORY_SAMPLE_INTERVAL_MS
+MEMORY_BUDGET_BYTES = int(os.getenv("MEMORY_BUDGET_MB", "256")) * 1024 * 1024
+MEMORY_QUEUE_TIMEOUT_SECONDS = float(os.getenv("MEMORY_QUEUE_TIMEOUT_SECONDS", "30"))
+MEMORY_SAMPLE_INTERVAL_MS = float(os.getenv("MEMORY_SAMPLE_INTERVAL_MS", "50"))
+
+# Define the startup warm-up: import the estimators and run a tiny fit/predict of
+# every model in the background so the first request does not pay for it
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "1") == "1"
+
+# Define result cache settings (fitted models and responses of repeated requests)
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "1") == "1"
+RESULT_CACHE_MAX_MODELS = int(os.getenv("RESULT_CACHE_MAX_MODELS", "16"))
+RESULT_CACHE_MAX_RESPONSES = int(os.getenv("RESULT_CACHE_MAX_RESPONSES", "128"))
+RESULT_CACHE_TTL_SECONDS = int(os.getenv("RESULT_CACHE_TTL_SECONDS", "600"))
+RESULT_CACHE_REDIS = os.getenv("RESULT_CACHE_REDIS", "0") == "1"
+RESULT_CACHE_REDIS_MAX_BYTES = int(
+    os.getenv("RESULT_CACHE_REDIS_MAX_BYTES", str(8 * 1024 * 1024))
+)
+
+# Define prediction micro-batching settings (a window of 0 disables batching)
+PREDICT_BATCH_WINDOW_MS = float(os.getenv("PREDICT_BATCH_WINDOW_MS", "0"))
+PREDICT_BATCH_MAX_ROWS = int(os.getenv("PREDICT_BATCH_MAX_ROWS", "1000"))
+
+# Define admin user listing page sizes (keyset pagination) and export batch size
+ADMIN_LIST_PAGE_SIZE = int(os.getenv("ADMIN_LIST_PAGE_SIZE", "100"))
+ADMIN_LIST_MAX_PAGE_SIZE = int(os.getenv("ADMIN_LIST_MAX_PAGE_SIZE", "1000"))
+ADMIN_EXPORT_BATCH_SIZE = int(os.getenv("ADMIN_EXPORT_BATCH_SIZE", "1000"))
+
+# Define bulk user import limits (rows per request, rows per insert transaction)
+ADMIN_IMPORT_MAX_USERS = int(os.getenv("ADMIN_IMPORT_MAX_USERS", "10000"))
+ADMIN_IMPORT_BATCH_SIZE = int(os.getenv("ADMIN_IMPORT_BATCH_SIZE", "500"))
+
+# Define Server-Timing headers (per-request stage durations) for these path prefixes
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "0") == "1"
+SERVER_TIMING_PATHS: list[str] = json.loads(
+    os.getenv("SERVER_TIMING_PATHS", '["/tabular_regressor/", "/auth/login"]')
+)
+
+# Define request profiling: admins opt in per request with the X-Profile header and
+# a fraction of requests to PROFILE_SAMPLE_PATHS is profiled at random
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_SAMPLE_PATHS: list[str] = json.loads(
+    os.getenv("PROFILE_SAMPLE_PATHS", '["/tabular_regressor/"]')
+)
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_MAX_ACTIVE = int(os.getenv("PROFILE_MAX_ACTIVE", "4"))
+PROFILE_BUFFER_SIZE = int(os.getenv("PROFILE_BUFFER_SIZE", "20"))
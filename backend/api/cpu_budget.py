@@ -0,0 +1,151 @@
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator, Optional
+
+from fastapi import HTTPException, status
+from threadpoolctl import threadpool_limits
+
+from backend.api.config import (
+    BLAS_THREADS_PER_WORKER,
+    CPU_BUDGET_MAX_JOBS_PER_FIT,
+    CPU_BUDGET_THREADS,
+    CPU_BUDGET_TIMEOUT_SECONDS,
+)
+from backend.api.metrics import (
+    CPU_BUDGET_CAPACITY,
+    CPU_BUDGET_GRANTED,
+    CPU_BUDGET_IN_USE,
+    CPU_BUDGET_WAIT_SECONDS,
+)
+
+if TYPE_CHECKING:
+    from backend.models.tabular_regressor import TabularRegressor
+
+
+class CpuBudget:
+    """
+    Worker-wide budget of threads handed out to estimator fits as ``n_jobs``.
+
+    A fit is granted its share of the free threads: at most ``max_jobs_per_fit``
+    and ``threads`` divided by the fits running or waiting, so an idle worker gives
+    one fit all of them and concurrent fits split them. When no thread is free the
+    fit blocks until one is released, so granted threads never exceed ``threads``;
+    after ``timeout`` seconds it is rejected with 503.
+    """
+
+    def __init__(self, threads: int, max_jobs_per_fit: int = 0, timeout: float = 30.0):
+        if threads < 1:
+            raise ValueError("threads must be at least 1")
+        self.threads = threads
+        self.max_jobs_per_fit = max_jobs_per_fit or threads
+        self.timeout = timeout
+        self.in_use = 0
+        self.running = 0
+        self.waiting = 0
+        self._cond = threading.Condition()
+        CPU_BUDGET_CAPACITY.set(threads)
+
+    def acquire(self, max_jobs: Optional[int] = None) -> int:
+        """Block until a thread is free and grant this fit its share (n_jobs)."""
+        limit = min(max_jobs or self.max_jobs_per_fit, self.max_jobs_per_fit)
+        start = time.perf_counter()
+        with self._cond:
+            self.waiting += 1
+            try:
+                free = self._cond.wait_for(
+                    lambda: self.in_use < self.threads, self.timeout
+                )
+            finally:
+                self.waiting -= 1
+            if not free:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="CPU budget exhausted, try again later",
+                    headers={"Retry-After": str(math.ceil(self.timeout))},
+                )
+            share = self.threads // (self.running + self.waiting + 1)
+            n_jobs = max(1, min(limit, share, self.threads - self.in_use))
+            self.in_use += n_jobs
+            self.running += 1
+            CPU_BUDGET_IN_USE.set(self.in_use)
+        CPU_BUDGET_WAIT_SECONDS.observe(time.perf_counter() - start)
+        CPU_BUDGET_GRANTED.observe(n_jobs)
+        return n_jobs
+
+    def release(self, n_jobs: int):
+        with self._cond:
+            self.in_use -= n_jobs
+            self.running -= 1
+            CPU_BUDGET_IN_USE.set(self.in_use)
+            self._cond.notify_all()
+
+    @contextmanager
+    def allocate(self, max_jobs: Optional[int] = None) -> Iterator[int]:
+        """
+        Grant n_jobs for the duration of the block, charging the calling thread
+        for all of them (see thread_cpu_time).
+        """
+        n_jobs = self.acquire(max_jobs)
+        start = time.perf_counter()
+        thread_start = time.thread_time()
+        try:
+            yield n_jobs
+        finally:
+            self.release(n_jobs)
+            if n_jobs > 1:
+                wall = time.perf_counter() - start
+                own = time.thread_time() - thread_start
+                extra = max(0.0, wall * n_jobs - own)
+                _thread_usage.extra = getattr(_thread_usage, "extra", 0.0) + extra
+
+    def stats(self) -> dict:
+        return {
+            "threads": self.threads,
+            "in_use": self.in_use,
+            "running": self.running,
+            "waiting": self.waiting,
+            "max_jobs_per_fit": self.max_jobs_per_fit,
+        }
+
+
+# Per-thread CPU-seconds spent by parallel fits on threads other than the caller
+_thread_usage = threading.local()
+
+
+def thread_cpu_time() -> float:
+    """
+    CPU time of the calling thread, like ``time.thread_time``, except that blocks
+    holding a grant of n_jobs > 1 count as their wall time times n_jobs: their work
+    runs on joblib threads that ``time.thread_time`` does not see.
+    """
+    return time.thread_time() + getattr(_thread_usage, "extra", 0.0)
+
+
+def limit_native_threads(threads: int = BLAS_THREADS_PER_WORKER):
+    """
+    Cap BLAS/OpenMP thread pools of this process; parallelism comes from
+    concurrent requests and the n_jobs granted by the CPU budget instead.
+    """
+    threadpool_limits(limits=threads)
+
+
+def set_n_jobs(model: "TabularRegressor", n_jobs: int):
+    """Set n_jobs on every fitted sklearn estimator of a model that supports it."""
+    from backend.models.tabular_regressor import TabularRegressor
+
+    base_model = getattr(model, "base_model", None)
+    children = base_model.values() if isinstance(base_model, dict) else [base_model]
+    for child in children:
+        if isinstance(child, TabularRegressor):
+            set_n_jobs(child, n_jobs)
+        elif child is not None and "n_jobs" in child.get_params():
+            child.set_params(n_jobs=n_jobs)
+
+
+cpu_budget = CpuBudget(
+    threads=CPU_BUDGET_THREADS,
+    max_jobs_per_fit=CPU_BUDGET_MAX_JOBS_PER_FIT,
+    timeout=CPU_BUDGET_TIMEOUT_SECONDS,
+)
@@ -1,37 +1,90 @@
+import asyncio
 import os
 from contextlib import asynccontextmanager
 
 import redis.asyncio as redis
-from fastapi import Depends, FastAPI, Request
+from fastapi import Depends, FastAPI
 from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import Response, JSONResponse, FileResponse
-from fastapi_limiter import FastAPILimiter
-from fastapi_limiter.depends import RateLimiter
-
-from backend.api.config import DEFAULT_RL, REDIS_URL
+from fastapi.responses import JSONResponse, FileResponse
+from prometheus_client import start_http_server
+
+from backend.api.config import (
+    BODY_SIZE_LIMITS,
+    COMPRESSION_MIN_SIZE,
+    DEFAULT_RL,
+    MAX_BODY_BYTES,
+    MAX_DECOMPRESSED_BODY_BYTES,
+    METRICS_ADDR,
+    METRICS_PORT,
+    PROFILE_SAMPLE_PATHS,
+    PROFILE_SAMPLE_RATE,
+    REDIS_URL,
+    SERVER_TIMING_ENABLED,
+    SERVER_TIMING_PATHS,
+    USER_CACHE_PUBSUB,
+    WARMUP_ENABLED,
+)
+from backend.api.cpu_budget import limit_native_threads
+from backend.api.metrics import observe_model_stage
+from backend.api.middleware.body_limit import BodySizeLimitMiddleware
+from backend.api.middleware.compression import CompressionMiddleware
+from backend.api.middleware.profiling import ProfilingMiddleware
+from backend.api.middleware.security_headers import SecurityHeadersMiddleware
+from backend.api.middleware.server_timing import ServerTimingMiddleware
 from backend.api.routers.admin import router as admin_router
 from backend.api.routers.auth import router as auth_router
+from backend.api.routers.monitoring import router as monitoring_router
 from backend.api.routers.tabular_regressor import router as tabular_regressor_router
 from backend.api.schemas.main_schemas import WelcomeResponse
-from backend.api.security.config import DEFAULT_CSP, DOCS_CSP
-from backend.api.security.limiter import real_ip
+from backend.api.security.auth import (
+    listen_user_invalidations,
+    use_invalidation_publisher,
+)
+from backend.api.security.config import DOCS_CSP, SECURITY_HEADERS
+from backend.api.security.cost_limiter import cost_limiter
+from backend.api.security.limiter import RateLimiter, rate_limit_state
+from backend.api.serving import check_worker_setup
 from backend.api.version import __version__ as api_version
+from backend.api.warmup import warm_up_in_background
+from backend.db.session import dispose_inherited_pools
+from backend.models.hooks import register_timing_hook
 from backend.models.version import __version__ as model_version
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Code that runs on app startup
+    limit_native_threads()
+    # Workers forked by gunicorn (preload_app) must not share the parent's pools
+    dispose_inherited_pools()
+    warmup = asyncio.create_task(warm_up_in_background()) if WARMUP_ENABLED else None
+    metrics_server = None
+    if METRICS_PORT:
+        metrics_server, _ = start_http_server(METRICS_PORT, addr=METRICS_ADDR)
     r = redis.from_url(REDIS_URL, encoding="utf-8", decode_responses=True)
-    await FastAPILimiter.init(r, identifier=real_ip)
+    rate_limit_state.start(r)
+    cost_limiter.use_redis(r)
+    check_worker_setup(r)
+    invalidation_listener = None
+    if USER_CACHE_PUBSUB:
+        use_invalidation_publisher(r)
+        invalidation_listener = asyncio.create_task(listen_user_invalidations(r))
 
     # Point where the app is running
     yield
 
     # When the application is shutting down
-    if FastAPILimiter.redis:
-        await FastAPILimiter.redis.close()
+    if warmup is not None:
+        warmup.cancel()
+    if invalidation_listener is not None:
+        invalidation_listener.cancel()
+        use_invalidation_publisher(None)
+    await rate_limit_state.stop()
+    cost_limiter.use_redis(None)
+    await r.aclose()
+    if metrics_server is not None:
+        metrics_server.shutdown()
 
 
 app = FastAPI(
@@ -56,22 +109,33 @@ frontend_dir = os.path.join(os.path.dirname(__file__), "../../frontend")
 frontend_dir = os.path.abspath(frontend_dir)
 app.mount("/frontend", StaticFiles(directory=frontend_dir, html=True), name="frontend")
 
-# Middleware to add security headers to each response
-@app.middleware("http")
-async def add_security_headers(request: Request, call_next):
-    response: Response = await call_next(request)
-
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-    response.headers["Strict-Transport-Security"] = (
-        "max-age=63072000; includeSubDomains; preload"
-    )
-    if "Content-Security-Policy" not in response.headers:
-        response.headers["Content-Security-Policy"] = DEFAULT_CSP
+# Middleware to reject oversized request bodies before they are parsed
+# (added first so it sees decompressed bodies: later middlewares wrap earlier ones)
+app.add_middleware(
+    BodySizeLimitMiddleware, limits=BODY_SIZE_LIMITS, default_limit=MAX_BODY_BYTES
+)
 
-    return response
+# Middleware to decompress request bodies and compress large responses
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=COMPRESSION_MIN_SIZE,
+    max_decompressed_size=MAX_DECOMPRESSED_BODY_BYTES,
+)
+
+# Middleware to profile requests on demand (X-Profile header from admins) or sampled
+app.add_middleware(
+    ProfilingMiddleware,
+    sample_rate=PROFILE_SAMPLE_RATE,
+    sample_paths=PROFILE_SAMPLE_PATHS,
+)
+
+# Middleware to report per-request stage durations in a Server-Timing header
+if SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware, path_prefixes=SERVER_TIMING_PATHS)
+
+# Middleware to add security headers to each response (added last so it is the
+# outermost and also covers the early responses of the middlewares above)
+app.add_middleware(SecurityHeadersMiddleware, headers=SECURITY_HEADERS)
 
 
 @app.get("/favicon.ico")
@@ -117,6 +181,10 @@ def custom_redoc():
 app.include_router(auth_router)
 app.include_router(tabular_regressor_router)
 app.include_router(admin_router)
+app.include_router(monitoring_router)
+
+# Model fit/predict durations are reported through the models timing hooks
+register_timing_hook(observe_model_stage)
 
 
 welcome_kwargs = dict(
@@ -0,0 +1,204 @@
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException, status
+
+from backend.api.config import (
+    MEMORY_BUDGET_BYTES,
+    MEMORY_QUEUE_TIMEOUT_SECONDS,
+    MEMORY_SAMPLE_INTERVAL_MS,
+)
+from backend.api.metrics import (
+    MEMORY_BUDGET_CAPACITY,
+    MEMORY_BUDGET_QUEUED,
+    MEMORY_BUDGET_REJECTIONS,
+    MEMORY_BUDGET_RESERVED,
+    TRAIN_PREDICT_MEMORY_ESTIMATE_BYTES,
+    TRAIN_PREDICT_PEAK_MEMORY_BYTES,
+)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def process_rss_bytes() -> Optional[int]:
+    """Resident set size of this process, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+class _Watch:
+    __slots__ = ("start", "peak")
+
+    def __init__(self, rss: int):
+        self.start = rss
+        self.peak = rss
+
+
+class RssSampler:
+    """
+    Samples the process RSS every ``interval_s`` from a daemon thread while any
+    watch is active, keeping the peak seen by each watch. RSS is process-wide, so
+    requests running at the same time see each other's allocations.
+    """
+
+    def __init__(self, interval_s: float = 0.05):
+        self.interval_s = interval_s
+        self._watches: set[_Watch] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> Optional[_Watch]:
+        rss = process_rss_bytes()
+        if rss is None:
+            return None
+        watch = _Watch(rss)
+        with self._lock:
+            self._watches.add(watch)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="rss-sampler", daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+        return watch
+
+    def stop(self, watch: _Watch) -> int:
+        """Stop the watch and return its peak RSS growth in bytes."""
+        with self._lock:
+            self._watches.discard(watch)
+        rss = process_rss_bytes() or watch.peak
+        return max(watch.peak, rss) - watch.start
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            with self._lock:
+                if not self._watches:
+                    self._wake.clear()
+                    continue
+                rss = process_rss_bytes()
+                for watch in self._watches:
+                    watch.peak = max(watch.peak, rss)
+            time.sleep(self.interval_s)
+
+
+class MemoryBudget:
+    """
+    Worker-wide admission control on the estimated peak memory of requests.
+
+    A request reserves its estimate for the duration of the block. Requests are
+    admitted in arrival order while the reservations fit in ``budget_bytes``;
+    others wait up to ``queue_timeout`` seconds and are then rejected with 503.
+    A request estimated above the whole budget is rejected with 413 at once.
+    A budget of 0 disables admission control (peak memory is still sampled).
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int,
+        queue_timeout: float = 30.0,
+        sampler: Optional[RssSampler] = None,
+    ):
+        self.budget_bytes = budget_bytes
+        self.queue_timeout = queue_timeout
+        self.sampler = sampler or RssSampler()
+        self.reserved = 0
+        self._waiters: deque[tuple[int, asyncio.Future]] = deque()
+        MEMORY_BUDGET_CAPACITY.set(budget_bytes)
+
+    @asynccontextmanager
+    async def reserve(self, nbytes: int, model_type: str) -> AsyncIterator[None]:
+        """Hold nbytes of the budget for the block and record its peak memory."""
+        TRAIN_PREDICT_MEMORY_ESTIMATE_BYTES.labels(model_type).observe(nbytes)
+        if self.budget_bytes:
+            await self._acquire(nbytes)
+        else:
+            nbytes = 0
+        watch = self.sampler.start()
+        try:
+            yield
+        finally:
+            if watch is not None:
+                peak = self.sampler.stop(watch)
+                TRAIN_PREDICT_PEAK_MEMORY_BYTES.labels(model_type).observe(peak)
+            self._release(nbytes)
+
+    async def _acquire(self, nbytes: int):
+        if nbytes > self.budget_bytes:
+            MEMORY_BUDGET_REJECTIONS.labels("too_large").inc()
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Request needs about {math.ceil(nbytes / 2**20)} MiB, "
+                f"above the memory budget of {self.budget_bytes // 2**20} MiB",
+            )
+        if not self._waiters and self.reserved + nbytes <= self.budget_bytes:
+            self._take(nbytes)
+            return
+
+        waiter = (nbytes, asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        MEMORY_BUDGET_QUEUED.inc()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter[1]), self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if waiter[1].done() and not waiter[1].cancelled():
+                # Granted just before timing out or being cancelled
+                self._release(nbytes)
+            else:
+                waiter[1].cancel()
+                self._waiters.remove(waiter)
+                MEMORY_BUDGET_QUEUED.dec()
+                self._wake()
+            if isinstance(exc, asyncio.CancelledError):
+                raise
+            MEMORY_BUDGET_REJECTIONS.labels("timeout").inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Memory budget exhausted, try again later",
+                headers={"Retry-After": str(math.ceil(self.queue_timeout))},
+            )
+
+    def _take(self, nbytes: int):
+        self.reserved += nbytes
+        MEMORY_BUDGET_RESERVED.set(self.reserved)
+
+    def _release(self, nbytes: int):
+        self.reserved -= nbytes
+        MEMORY_BUDGET_RESERVED.set(self.reserved)
+        self._wake()
+
+    def _wake(self):
+        """Admit waiters in arrival order while they fit."""
+        while self._waiters:
+            nbytes, future = self._waiters[0]
+            if self.reserved + nbytes > self.budget_bytes:
+                break
+            self._waiters.popleft()
+            MEMORY_BUDGET_QUEUED.dec()
+            self._take(nbytes)
+            future.set_result(None)
+
+    def stats(self) -> dict:
+        return {
+            "budget_bytes": self.budget_bytes,
+            "reserved_bytes": self.reserved,
+            "queued": len(self._waiters),
+            "rss_bytes": process_rss_bytes(),
+        }
+
+
+memory_budget = MemoryBudget(
+    budget_bytes=MEMORY_BUDGET_BYTES,
+    queue_timeout=MEMORY_QUEUE_TIMEOUT_SECONDS,
+    sampler=RssSampler(interval_s=MEMORY_SAMPLE_INTERVAL_MS / 1000),
+)
@@ -0,0 +1,152 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+# --- Result cache ---
+RESULT_CACHE_LOOKUPS = Counter(
+    "webpredictor_result_cache_lookups_total",
+    "Result cache lookups by entry kind (model/response), tier and outcome",
+    ["kind", "tier", "outcome"],
+)
+
+# --- Request admission ---
+REQUEST_BODY_REJECTIONS = Counter(
+    "webpredictor_request_body_rejections_total",
+    "Requests rejected for exceeding the body size limit, by route and role",
+    ["route", "role"],
+)
+
+RATE_LIMIT_REJECTIONS = Counter(
+    "webpredictor_rate_limit_rejections_total",
+    "Requests rejected with 429 by the rate limiter, by route",
+    ["route"],
+)
+COST_LIMIT_CHARGED = Counter(
+    "webpredictor_cost_limit_charged_units_total",
+    "Cost units charged against user budgets, by model type",
+    ["model_type"],
+)
+COST_LIMIT_REJECTIONS = Counter(
+    "webpredictor_cost_limit_rejections_total",
+    "Requests rejected with 429 for exceeding the cost budget, by model type",
+    ["model_type"],
+)
+
+# --- Password hashing pool ---
+PASSWORD_POOL_QUEUED = Gauge(
+    "webpredictor_password_pool_queued",
+    "Password hash/verify jobs waiting for a bcrypt worker",
+)
+PASSWORD_POOL_ACTIVE = Gauge(
+    "webpredictor_password_pool_active",
+    "Password hash/verify jobs currently running",
+)
+PASSWORD_POOL_WAIT_SECONDS = Histogram(
+    "webpredictor_password_pool_wait_seconds",
+    "Time password jobs spend queued before a bcrypt worker picks them up",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+PASSWORD_POOL_REJECTIONS = Counter(
+    "webpredictor_password_pool_rejections_total",
+    "Password jobs rejected because the bcrypt queue was full",
+)
+
+# --- Fair-share training scheduler ---
+FAIR_SHARE_QUEUED = Gauge(
+    "webpredictor_fair_share_queued_jobs",
+    "Training jobs waiting in the fair-share scheduler, by role",
+    ["role"],
+)
+FAIR_SHARE_WAIT_SECONDS = Histogram(
+    "webpredictor_fair_share_wait_seconds",
+    "Time training jobs waited in the fair-share scheduler, by role",
+    ["role"],
+)
+FAIR_SHARE_CPU_SECONDS = Counter(
+    "webpredictor_fair_share_cpu_seconds_total",
+    "CPU-seconds spent by scheduled training jobs, by role",
+    ["role"],
+)
+
+# --- CPU budget ---
+CPU_BUDGET_CAPACITY = Gauge(
+    "webpredictor_cpu_budget_threads",
+    "Threads this worker may spend on estimator parallelism",
+)
+CPU_BUDGET_IN_USE = Gauge(
+    "webpredictor_cpu_budget_threads_in_use",
+    "Threads currently granted to running fits (effective parallelism)",
+)
+CPU_BUDGET_GRANTED = Histogram(
+    "webpredictor_cpu_budget_granted_jobs",
+    "n_jobs granted to each fit",
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+CPU_BUDGET_WAIT_SECONDS = Histogram(
+    "webpredictor_cpu_budget_wait_seconds",
+    "Time fits waited for a free thread of the CPU budget",
+)
+
+# --- Memory budget ---
+_MEMORY_BUCKETS = tuple(2**i * 1024 * 1024 for i in range(11))  # 1 MiB .. 1 GiB
+MEMORY_BUDGET_CAPACITY = Gauge(
+    "webpredictor_memory_budget_bytes", "Memory budget of this worker in bytes"
+)
+MEMORY_BUDGET_RESERVED = Gauge(
+    "webpredictor_memory_budget_reserved_bytes",
+    "Estimated memory reserved by admitted train_predict requests",
+)
+MEMORY_BUDGET_QUEUED = Gauge(
+    "webpredictor_memory_budget_queued",
+    "train_predict requests waiting for memory budget",
+)
+MEMORY_BUDGET_REJECTIONS = Counter(
+    "webpredictor_memory_budget_rejections_total",
+    "Requests rejected by the memory budget, by reason (too_large/timeout)",
+    ["reason"],
+)
+TRAIN_PREDICT_MEMORY_ESTIMATE_BYTES = Histogram(
+    "webpredictor_train_predict_memory_estimate_bytes",
+    "Estimated peak memory of train_predict requests, by model type",
+    ["model_type"],
+    buckets=_MEMORY_BUCKETS,
+)
+TRAIN_PREDICT_PEAK_MEMORY_BYTES = Histogram(
+    "webpredictor_train_predict_peak_memory_bytes",
+    "Process RSS growth sampled while a train_predict request ran, by model type",
+    ["model_type"],
+    buckets=_MEMORY_BUCKETS,
+)
+
+# --- train_predict stages and workload ---
+TRAIN_PREDICT_STAGE_SECONDS = Histogram(
+    "webpredictor_train_predict_stage_seconds",
+    "Duration of each train_predict stage, by stage and model type",
+    ["stage", "model_type"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+MODEL_STAGE_SECONDS = Histogram(
+    "webpredictor_model_stage_seconds",
+    "Duration of model fit/predict calls, by stage and model class",
+    ["stage", "model_class"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+TRAIN_PREDICT_REQUESTS = Counter(
+    "webpredictor_train_predict_requests_total",
+    "train_predict requests by model type and whether the response was cached",
+    ["model_type", "cached"],
+)
+TRAIN_PREDICT_ROWS = Counter(
+    "webpredictor_train_predict_rows_total",
+    "Rows received by train_predict, by model type and dataset (train/predict)",
+    ["model_type", "dataset"],
+)
+TRAIN_PREDICT_COLUMNS = Histogram(
+    "webpredictor_train_predict_columns",
+    "Feature plus target columns per train_predict request, by model type",
+    ["model_type"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 150, 200),
+)
+
+
+def observe_model_stage(stage: str, model_class: str, seconds: float):
+    """Timing hook for backend.models.hooks feeding MODEL_STAGE_SECONDS."""
+    MODEL_STAGE_SECONDS.labels(stage, model_class).observe(seconds)
@@ -0,0 +1,99 @@
+from typing import Optional
+
+from fastapi import HTTPException, status
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.api.metrics import REQUEST_BODY_REJECTIONS
+from backend.api.security.auth import token_scopes
+
+ANONYMOUS_ROLE = "anonymous"
+
+
+class BodySizeLimitMiddleware:
+    """
+    Pure ASGI middleware enforcing request body size limits before parsing.
+
+    The limit is chosen by the longest route prefix in ``limits`` and the role of
+    the bearer token (its most generous scope), falling back to the "*" entry, or
+    the "anonymous" entry without a valid token, and then to ``default_limit``.
+    A declared Content-Length above the limit is rejected without reading the body;
+    otherwise the bytes are counted while the app streams them in and the read
+    fails with 413 as soon as the limit is passed.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limits: Optional[dict[str, dict[str, int]]] = None,
+        default_limit: int = 64 * 1024,
+    ):
+        self.app = app
+        self.default_limit = default_limit
+        # Longest prefixes first so the most specific route wins
+        self.limits = sorted((limits or {}).items(), key=lambda kv: -len(kv[0]))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        route, role, limit = self._resolve_limit(scope["path"], headers)
+        content_length = headers.get("content-length")
+        if content_length is not None and content_length.isdigit():
+            if int(content_length) > limit:
+                REQUEST_BODY_REJECTIONS.labels(route, role).inc()
+                response = JSONResponse(
+                    {"detail": _detail(limit)},
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                )
+                await response(scope, receive, send)
+                return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    REQUEST_BODY_REJECTIONS.labels(route, role).inc()
+                    # FastAPI re-raises HTTPExceptions raised while reading the body
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=_detail(limit),
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    def _resolve_limit(self, path: str, headers: Headers) -> tuple[str, str, int]:
+        for prefix, role_limits in self.limits:
+            if path.startswith(prefix):
+                break
+        else:
+            return "default", "*", self.default_limit
+
+        scopes = _bearer_scopes(headers)
+        if not scopes:
+            limit = role_limits.get(ANONYMOUS_ROLE, self.default_limit)
+            return prefix, ANONYMOUS_ROLE, limit
+        candidates = [(role_limits[s], s) for s in scopes if s in role_limits]
+        if candidates:
+            limit, role = max(candidates)
+            return prefix, role, limit
+        return prefix, scopes[0], role_limits.get("*", self.default_limit)
+
+
+def _bearer_scopes(headers: Headers) -> list[str]:
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return []
+    return token_scopes(token.strip())
+
+
+def _detail(limit: int) -> str:
+    return f"Request body exceeds {limit} bytes"
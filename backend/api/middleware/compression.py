@@ -0,0 +1,274 @@
+import zlib
+from typing import Iterator, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import zstandard
+    from zstandard import ZstdError
+except ImportError:  # zstd support is optional, gzip is always available
+    zstandard = None
+
+    class ZstdError(Exception):
+        pass
+
+
+READ_CHUNK_SIZE = 64 * 1024
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript")
+
+
+def supported_encodings() -> list[str]:
+    """Content encodings understood by this server, by preference."""
+    return (["zstd"] if zstandard is not None else []) + ["gzip"]
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware handling compressed bodies in both directions.
+
+    Requests sent with ``Content-Encoding: gzip|deflate|zstd`` are decompressed
+    while the app reads them, rejecting bodies that expand beyond
+    ``max_decompressed_size`` (413), corrupt bodies (400) and unknown encodings
+    (415).
+    Responses of compressible media types at least ``minimum_size`` bytes long are
+    compressed with the best encoding offered in ``Accept-Encoding``.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        max_decompressed_size: int = 32 * 1024 * 1024,
+        gzip_level: int = 6,
+        zstd_level: int = 3,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.max_decompressed_size = max_decompressed_size
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        content_encoding = headers.get("content-encoding", "identity").strip().lower()
+        encoding = _negotiate(headers.get("accept-encoding", ""))
+        app_send = send
+        if encoding is not None:
+            app_send = _CompressingResponder(send, encoding, self).send
+        if content_encoding == "identity":
+            await self.app(scope, receive, app_send)
+            return
+
+        if content_encoding not in supported_encodings() + ["deflate"]:
+            response = JSONResponse(
+                {"detail": f"Unsupported Content-Encoding '{content_encoding}'"},
+                status_code=415,
+            )
+            await response(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def tracked_send(message: Message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await app_send(message)
+
+        body = _DecompressedBody(receive, content_encoding, self.max_decompressed_size)
+        try:
+            await self.app(_strip_body_headers(scope), body.receive, tracked_send)
+        except _BodyError as exc:
+            # Raised while the app reads the body; FastAPI apps turn it into a
+            # response themselves, plain ASGI apps let it propagate up to here
+            if response_started:
+                raise
+            response = JSONResponse({"detail": exc.detail}, status_code=exc.status_code)
+            await response(scope, receive, send)
+
+
+class _DecompressedBody:
+    """
+    ``receive`` replacement decompressing the request body as the app reads it.
+
+    The compressed body is buffered (bounded by ``max_size``) and then handed out
+    in decompressed chunks of at most ``READ_CHUNK_SIZE`` bytes, so a body limit
+    enforced further in (BodySizeLimitMiddleware) stops the decompression as soon
+    as it is passed instead of after the whole body has been inflated.
+    """
+
+    def __init__(self, receive: Receive, encoding: str, max_size: int):
+        self._receive = receive
+        self.encoding = encoding
+        self.max_size = max_size
+        self._chunks: Optional[Iterator[bytes]] = None
+        self._size = 0
+        self._done = False
+
+    async def receive(self) -> Message:
+        if self._done:
+            return await self._receive()
+        if self._chunks is None:
+            compressed = bytearray()
+            more_body = True
+            while more_body:
+                message = await self._receive()
+                if message["type"] == "http.disconnect":
+                    self._done = True
+                    return message
+                compressed += message.get("body", b"")
+                more_body = message.get("more_body", False)
+                if len(compressed) > self.max_size:
+                    raise _BodyError(413, "Request body too large")
+            self._chunks = _iter_decompressed(bytes(compressed), self.encoding)
+
+        try:
+            chunk = next(self._chunks, None)
+        except (zlib.error, ZstdError):
+            raise _BodyError(400, f"Malformed {self.encoding} request body")
+        if chunk is None:
+            self._done = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        self._size += len(chunk)
+        if self._size > self.max_size:
+            raise _BodyError(413, "Decompressed request body too large")
+        return {"type": "http.request", "body": chunk, "more_body": True}
+
+
+class _BodyError(HTTPException):
+    """Body decoding error, an HTTPException so FastAPI re-raises it while parsing."""
+
+
+class _CompressingResponder:
+    """Wraps ``send`` to compress the response body once its size is known."""
+
+    def __init__(self, send: Send, encoding: str, config: CompressionMiddleware):
+        self._send = send
+        self.encoding = encoding
+        self.config = config
+        self.start_message: Optional[Message] = None
+        self.compressor = None
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            headers = MutableHeaders(raw=start["headers"])
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            # Streamed bodies may still declare their total size up front
+            size = int(headers.get("content-length", -1))
+            if size < 0 and not more_body:
+                size = len(body)
+            if (
+                "content-encoding" in headers
+                or not _is_compressible(headers.get("content-type", ""))
+                or 0 <= size < self.config.minimum_size
+            ):
+                await self._send(start)
+                await self._send(message)
+                return
+
+            self.compressor = _new_compressor(self.encoding, self.config)
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del headers["content-length"]
+                await self._send(start)
+                await self._send_chunk(body, more_body=True)
+            else:
+                payload = self.compressor.compress(body) + self.compressor.flush()
+                headers["Content-Length"] = str(len(payload))
+                await self._send(start)
+                await self._send({"type": "http.response.body", "body": payload})
+            return
+
+        if self.compressor is None:
+            await self._send(message)
+            return
+        await self._send_chunk(
+            message.get("body", b""), more_body=message.get("more_body", False)
+        )
+
+    async def _send_chunk(self, body: bytes, more_body: bool):
+        payload = self.compressor.compress(body)
+        if not more_body:
+            payload += self.compressor.flush()
+        await self._send(
+            {"type": "http.response.body", "body": payload, "more_body": more_body}
+        )
+
+
+def _iter_decompressed(data: bytes, encoding: str) -> Iterator[bytes]:
+    """Yield decompressed chunks of bounded size, so bombs are caught early."""
+    if encoding == "zstd":
+        with zstandard.ZstdDecompressor().stream_reader(data) as reader:
+            while chunk := reader.read(READ_CHUNK_SIZE):
+                yield chunk
+        return
+    # gzip and deflate (zlib) streams, detected from the header
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)
+    while not decompressor.eof:
+        chunk = decompressor.decompress(data, READ_CHUNK_SIZE)
+        data = decompressor.unconsumed_tail
+        if not chunk and not data:
+            break
+        yield chunk
+    if not decompressor.eof:
+        raise zlib.error("Truncated compressed stream")
+
+
+def _new_compressor(encoding: str, config: CompressionMiddleware):
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=config.zstd_level).compressobj()
+    return zlib.compressobj(config.gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+
+def _negotiate(accept_encoding: str) -> Optional[str]:
+    """Pick the preferred supported encoding with a non-zero q-value."""
+    offered = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        offered[name] = q
+    for encoding in supported_encodings():
+        if offered.get(encoding, offered.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def _is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES) or "+json" in content_type
+
+
+def _strip_body_headers(scope: Scope) -> Scope:
+    """Drop the encoding and length headers, which no longer describe the body."""
+    headers = [
+        (k, v)
+        for k, v in scope["headers"]
+        if k not in (b"content-encoding", b"content-length")
+    ]
+    return {**scope, "headers": headers}
@@ -0,0 +1,64 @@
+import random
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.api import profiling
+from backend.api.security.auth import token_scopes
+
+PROFILE_HEADER = "x-profile"
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware profiling requests with ``backend.api.profiling``.
+
+    A request is profiled when it sends ``X-Profile: 1`` with a bearer token
+    carrying the admin scope, or, for paths starting with one of
+    ``sample_paths``, at random with probability ``sample_rate``. Profiled
+    responses carry an ``X-Profile-Id`` header naming the profile to fetch from
+    ``/admin/profiles``.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float, sample_paths: list[str]):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.sample_paths = tuple(sample_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        trigger = self._trigger(scope) if scope["type"] == "http" else None
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = profiling.RequestProfile(scope["method"], scope["path"], trigger)
+
+        async def send_with_id(message: Message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                headers = list(message.get("headers", ()))
+                headers.append((b"x-profile-id", str(profile.id).encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        with profiling.profiled(profile) as active:
+            await self.app(scope, receive, send_with_id if active else send)
+
+    def _trigger(self, scope: Scope):
+        headers = Headers(scope=scope)
+        if headers.get(PROFILE_HEADER) == "1" and _is_admin(headers):
+            return "header"
+        if (
+            self.sample_rate > 0
+            and scope["path"].startswith(self.sample_paths)
+            and random.random() < self.sample_rate
+        ):
+            return "sample"
+        return None
+
+
+def _is_admin(headers: Headers) -> bool:
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    return "admin" in token_scopes(token.strip())
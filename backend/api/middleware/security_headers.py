@@ -0,0 +1,37 @@
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class SecurityHeadersMiddleware:
+    """
+    Pure ASGI middleware appending security headers to every HTTP response.
+
+    The header block is encoded once at startup and appended at
+    ``http.response.start``. Headers the route already set (such as the
+    ``DOCS_CSP`` Content-Security-Policy of the docs pages) are left untouched.
+    """
+
+    def __init__(self, app: ASGIApp, headers: dict[str, str]):
+        self.app = app
+        self.headers = [
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in headers.items()
+        ]
+        self.names = frozenset(name for name, _ in self.headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                raw = list(message.get("headers", ()))
+                present = {name.lower() for name, _ in raw}
+                if present.isdisjoint(self.names):
+                    raw.extend(self.headers)
+                else:
+                    raw.extend(h for h in self.headers if h[0] not in present)
+                message["headers"] = raw
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
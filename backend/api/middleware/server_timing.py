@@ -0,0 +1,36 @@
+from time import perf_counter
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.api import server_timing
+
+
+class ServerTimingMiddleware:
+    """
+    Pure ASGI middleware adding a ``Server-Timing`` header with the stage durations
+    recorded through ``backend.api.server_timing`` during the request, plus the
+    total time until the response starts. Only paths starting with one of
+    ``path_prefixes`` are instrumented; other requests pass straight through.
+    """
+
+    def __init__(self, app: ASGIApp, path_prefixes: list[str]):
+        self.app = app
+        self.path_prefixes = tuple(path_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter()
+        timings = server_timing.start()
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                value = server_timing.header_value(timings, perf_counter() - start)
+                headers = list(message.get("headers", ()))
+                headers.append((b"server-timing", value.encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
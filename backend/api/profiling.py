@@ -0,0 +1,190 @@
+import itertools
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from backend.api.config import (
+    PROFILE_BUFFER_SIZE,
+    PROFILE_INTERVAL_MS,
+    PROFILE_MAX_ACTIVE,
+)
+
+MAX_STACK_DEPTH = 128
+
+_ids = itertools.count(1)
+
+
+class RequestProfile:
+    """Stack samples of the threads working on one request."""
+
+    def __init__(self, method: str, path: str, trigger: str):
+        self.id = next(_ids)
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.created = time.time()
+        self.duration_s = 0.0
+        self.status: Optional[int] = None
+        self.samples: Counter[tuple[str, ...]] = Counter()
+        self.threads: Counter[int] = Counter()  # thread id -> nesting depth
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "created": self.created,
+            "method": self.method,
+            "path": self.path,
+            "trigger": self.trigger,
+            "status": self.status,
+            "duration_ms": round(self.duration_s * 1000, 3),
+            "samples": sum(self.samples.values()),
+        }
+
+    def top_functions(self, limit: int) -> list[dict]:
+        """Functions by samples on top of the stack (self) and anywhere (total)."""
+        own: Counter[str] = Counter()
+        total: Counter[str] = Counter()
+        for stack, count in self.samples.items():
+            own[stack[-1]] += count
+            for frame in set(stack):
+                total[frame] += count
+        ranked = sorted(total, key=lambda f: (-own[f], -total[f]))[:limit]
+        return [
+            {"function": f, "self_samples": own[f], "total_samples": total[f]}
+            for f in ranked
+        ]
+
+    def collapsed(self) -> str:
+        """Samples in the collapsed stack format of flamegraph.pl and speedscope."""
+        return "".join(f"{';'.join(s)} {n}\n" for s, n in self.samples.most_common())
+
+
+class StackSampler:
+    """
+    Statistical profiler: a daemon thread reads the current frame of every thread
+    registered by an active profile each ``interval_s`` and counts its stack.
+    Unlike cProfile it adds no per-call overhead and several requests can be
+    profiled at once. The event loop thread also runs other requests, so their
+    coroutines appear in a profile while it is active.
+    """
+
+    def __init__(self, interval_s: float = 0.005, max_active: int = 4):
+        self.interval_s = interval_s
+        self.max_active = max_active
+        self._active: list[RequestProfile] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, profile: RequestProfile) -> bool:
+        """Start sampling profile; False if max_active profiles already run."""
+        with self._lock:
+            if len(self._active) >= self.max_active:
+                return False
+            self._active.append(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="stack-sampler", daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+        return True
+
+    def remove(self, profile: RequestProfile):
+        with self._lock:
+            self._active.remove(profile)
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            with self._lock:
+                if not self._active:
+                    self._wake.clear()
+                    continue
+                frames = sys._current_frames()
+                for profile in self._active:
+                    for thread_id in tuple(profile.threads):
+                        frame = frames.get(thread_id)
+                        if frame is not None:
+                            profile.samples[_stack(frame)] += 1
+            del frames
+            time.sleep(self.interval_s)
+
+
+def _stack(frame) -> tuple[str, ...]:
+    stack = []
+    while frame is not None and len(stack) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        name = getattr(code, "co_qualname", code.co_name)  # co_qualname is 3.11+
+        stack.append(f"{frame.f_globals.get('__name__', '?')}:{name}")
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+class ProfileStore:
+    """Ring buffer keeping the ``max_profiles`` most recent request profiles."""
+
+    def __init__(self, max_profiles: int = 20):
+        self._profiles: deque[RequestProfile] = deque(maxlen=max_profiles)
+
+    def add(self, profile: RequestProfile):
+        self._profiles.append(profile)
+
+    def get(self, profile_id: int) -> Optional[RequestProfile]:
+        return next((p for p in self._profiles if p.id == profile_id), None)
+
+    def list(self) -> list[RequestProfile]:
+        return list(reversed(self._profiles))
+
+    def clear(self):
+        self._profiles.clear()
+
+
+# Profile of the current request; None outside profiled requests
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("profile", default=None)
+
+sampler = StackSampler(
+    interval_s=PROFILE_INTERVAL_MS / 1000, max_active=PROFILE_MAX_ACTIVE
+)
+profile_store = ProfileStore(max_profiles=PROFILE_BUFFER_SIZE)
+
+
+@contextmanager
+def profiled(profile: RequestProfile) -> Iterator[bool]:
+    """Sample the current thread, and threads joining via profile_thread, for
+    the block; yields False (and samples nothing) if the sampler is saturated."""
+    if not sampler.add(profile):
+        yield False
+        return
+    token = _current.set(profile)
+    start = time.perf_counter()
+    try:
+        with profile_thread():
+            yield True
+    finally:
+        profile.duration_s = time.perf_counter() - start
+        _current.reset(token)
+        sampler.remove(profile)
+        profile_store.add(profile)
+
+
+@contextmanager
+def profile_thread() -> Iterator[None]:
+    """Include the current thread in the request's profile (no-op otherwise)."""
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    thread_id = threading.get_ident()
+    profile.threads[thread_id] += 1
+    try:
+        yield
+    finally:
+        profile.threads[thread_id] -= 1
+        if not profile.threads[thread_id]:
+            del profile.threads[thread_id]
@@ -0,0 +1,204 @@
+import hashlib
+import hmac
+import logging
+import pickle
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional
+
+import orjson
+import redis
+
+from backend.api.caching import TTLCache
+from backend.api.config import (
+    REDIS_URL,
+    RESULT_CACHE_ENABLED,
+    RESULT_CACHE_MAX_MODELS,
+    RESULT_CACHE_MAX_RESPONSES,
+    RESULT_CACHE_REDIS,
+    RESULT_CACHE_REDIS_MAX_BYTES,
+    RESULT_CACHE_TTL_SECONDS,
+    SECRET_KEY,
+)
+from backend.api.metrics import RESULT_CACHE_LOOKUPS
+from backend.api.schemas.tabular_regressor_schemas import TrainPredictRequest
+from backend.models.version import __version__ as model_version
+
+if TYPE_CHECKING:
+    from backend.models.tabular_regressor import TabularRegressor
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "webpredictor:result_cache"
+
+
+@dataclass
+class FittedModel:
+    """A model fitted on one training set plus everything derived from it."""
+
+    model: "TabularRegressor"
+    feature_columns: list[str]
+    metrics: dict[str, dict[str, float]]
+
+
+class ResultCache:
+    """
+    Content-addressed cache for /tabular_regressor/train_predict.
+
+    Fitted models are keyed by a canonical hash of the training inputs, so a
+    repeated training set skips fitting. Full responses are keyed by the training
+    hash plus the prediction rows, so an identical request skips all computation.
+    Entries live in a local LRU tier and, optionally, in Redis to be shared across
+    workers. Redis payloads are signed since fitted models are pickled.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_models: int = 16,
+        max_responses: int = 128,
+        ttl_seconds: int = 600,
+        redis_url: Optional[str] = None,
+        redis_max_bytes: int = 8 * 1024 * 1024,
+        signing_key: Optional[str] = None,
+    ):
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.redis_max_bytes = redis_max_bytes
+        self.models: TTLCache[str, FittedModel] = TTLCache(max_models, ttl_seconds)
+        self.responses: TTLCache[str, dict] = TTLCache(max_responses, ttl_seconds)
+        self._signing_key = (signing_key or "").encode("utf-8")
+        self._redis = None
+        if enabled and redis_url:
+            self._redis = redis.Redis.from_url(
+                redis_url, socket_timeout=0.5, socket_connect_timeout=0.5
+            )
+
+    # --- Keys ---
+
+    @staticmethod
+    def train_key(payload: TrainPredictRequest) -> str:
+        canonical = {
+            "model_type": payload.model_type,
+            "target_columns": payload.target_columns,
+            "feature_columns": payload.feature_columns,
+            "train_data": payload.train_data.model_dump(),
+            "model_version": model_version,
+        }
+        return _digest(canonical)
+
+    @staticmethod
+    def response_key(train_key: str, payload: TrainPredictRequest) -> str:
+        return _digest(
+            {"train_key": train_key, "predict_data": payload.predict_data.model_dump()}
+        )
+
+    # --- Fitted models ---
+
+    def get_model(self, key: str) -> Optional[FittedModel]:
+        if not self.enabled:
+            return None
+        entry = self.models.get(key)
+        if entry is not None:
+            RESULT_CACHE_LOOKUPS.labels("model", "local", "hit").inc()
+            return entry
+        RESULT_CACHE_LOOKUPS.labels("model", "local", "miss").inc()
+        raw = self._redis_get("model", key)
+        if raw is not None:
+            entry = pickle.loads(raw)
+            self.models.set(key, entry)
+        return entry
+
+    def set_model(self, key: str, entry: FittedModel):
+        if not self.enabled:
+            return
+        self.models.set(key, entry)
+        self._redis_set("model", key, pickle.dumps(entry))
+
+    # --- Full responses ---
+
+    def get_response(self, key: str) -> Optional[dict[str, Any]]:
+        if not self.enabled:
+            return None
+        content = self.responses.get(key)
+        if content is not None:
+            RESULT_CACHE_LOOKUPS.labels("response", "local", "hit").inc()
+            return content
+        RESULT_CACHE_LOOKUPS.labels("response", "local", "miss").inc()
+        raw = self._redis_get("response", key)
+        if raw is not None:
+            content = orjson.loads(raw)
+            self.responses.set(key, content)
+        return content
+
+    def set_response(self, key: str, content: dict[str, Any]):
+        if not self.enabled:
+            return
+        self.responses.set(key, content)
+        self._redis_set("response", key, orjson.dumps(content))
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "redis": self._redis is not None,
+            "models": self.models.stats(),
+            "responses": self.responses.stats(),
+        }
+
+    def clear(self):
+        self.models.clear()
+        self.responses.clear()
+
+    # --- Redis tier ---
+
+    def _redis_get(self, kind: str, key: str) -> Optional[bytes]:
+        if self._redis is None:
+            return None
+        try:
+            raw = self._redis.get(f"{REDIS_KEY_PREFIX}:{kind}:{key}")
+        except redis.RedisError as exc:
+            logger.warning("Result cache Redis read failed: %s", exc)
+            RESULT_CACHE_LOOKUPS.labels(kind, "redis", "error").inc()
+            return None
+        payload = self._unsign(raw) if raw is not None else None
+        RESULT_CACHE_LOOKUPS.labels(
+            kind, "redis", "miss" if payload is None else "hit"
+        ).inc()
+        return payload
+
+    def _redis_set(self, kind: str, key: str, payload: bytes):
+        if self._redis is None or len(payload) > self.redis_max_bytes:
+            return
+        try:
+            self._redis.set(
+                f"{REDIS_KEY_PREFIX}:{kind}:{key}",
+                self._sign(payload),
+                ex=self.ttl_seconds,
+            )
+        except redis.RedisError as exc:
+            logger.warning("Result cache Redis write failed: %s", exc)
+
+    def _sign(self, payload: bytes) -> bytes:
+        return hmac.new(self._signing_key, payload, hashlib.sha256).digest() + payload
+
+    def _unsign(self, raw: bytes) -> Optional[bytes]:
+        signature, payload = raw[:32], raw[32:]
+        expected = hmac.new(self._signing_key, payload, hashlib.sha256).digest()
+        if not hmac.compare_digest(signature, expected):
+            logger.warning("Discarding result cache entry with invalid signature")
+            return None
+        return payload
+
+
+def _digest(obj: Any) -> str:
+    return hashlib.sha256(orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+result_cache = ResultCache(
+    enabled=RESULT_CACHE_ENABLED,
+    max_models=RESULT_CACHE_MAX_MODELS,
+    max_responses=RESULT_CACHE_MAX_RESPONSES,
+    ttl_seconds=RESULT_CACHE_TTL_SECONDS,
+    redis_url=REDIS_URL if RESULT_CACHE_REDIS else None,
+    redis_max_bytes=RESULT_CACHE_REDIS_MAX_BYTES,
+    signing_key=SECRET_KEY,
+)
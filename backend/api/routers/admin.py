@@ -1,15 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException, Security
-from fastapi_limiter.depends import RateLimiter
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
-
-from backend.api.config import DEFAULT_RL
-from backend.api.schemas.admin_schemas import UserCreate, UserId, UserOut
-from backend.api.security.auth import get_current_user
-from backend.db.models import User
-from backend.db.session import get_db
+import csv
+import io
+from typing import Optional
+
+import orjson
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    Security,
+)
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from backend.api.config import (
+    ADMIN_EXPORT_BATCH_SIZE,
+    ADMIN_IMPORT_BATCH_SIZE,
+    ADMIN_IMPORT_MAX_USERS,
+    ADMIN_LIST_MAX_PAGE_SIZE,
+    ADMIN_LIST_PAGE_SIZE,
+    DEFAULT_RL,
+)
+from backend.api.cpu_budget import cpu_budget
+from backend.api.memory_budget import memory_budget
+from backend.api.profiling import RequestProfile, profile_store
+from backend.api.result_cache import result_cache
+from backend.api.scheduler import fair_share_scheduler
+from backend.api.schemas.admin_schemas import (
+    UserCreate,
+    UserId,
+    UserImport,
+    UserImportResponse,
+    UserImportResult,
+    UserOut,
+)
+from backend.api.security.auth import get_current_user, invalidate_user
+from backend.api.security.limiter import RateLimiter
+from backend.api.security.passwords import password_hasher
+from backend.db.models import User
+from backend.db.session import AsyncSessionLocal, get_async_db, pool_status
 
 router = APIRouter(
     prefix="/admin",
@@ -22,35 +56,41 @@ router = APIRouter(
 
 
 @router.post("/create_user", response_model=UserOut, summary="Create a new user")
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
-    existing = db.query(User).filter(User.user == user.user).first()
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    existing = await db.scalar(select(User).where(User.user == user.user))
     if existing:
         raise HTTPException(status_code=409, detail="User already exists")
 
     pwd_plain = user.password
-    pwd_hash = pwd_context.hash(pwd_plain)
+    pwd_hash = await password_hasher.ahash(pwd_plain)
     data = dict(user=user.user, password=pwd_hash, role=user.role)
     db_obj = User(**data)
     db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    await invalidate_user(db_obj.user)
     return UserOut(id=db_obj.id, user=db_obj.user, role=db_obj.role)
 
 
-@router.post("/delete_user", response_model=UserOut, summary="Delete a user")
-def delete_user(user_id: UserId, db: Session = Depends(get_db)):
+async def _find_user(db: AsyncSession, user_id: UserId) -> User:
     if user_id.id is not None:
-        r = db.query(User).filter_by(id=user_id.id).first()
+        r = await db.scalar(select(User).where(User.id == user_id.id))
     elif user_id.user is not None:
-        r = db.query(User).filter_by(user=user_id.user).first()
+        r = await db.scalar(select(User).where(User.user == user_id.user))
     else:
         raise HTTPException(status_code=400, detail="Invalid user identifier")
 
     if not r:
         raise HTTPException(status_code=404, detail="User not found")
+    return r
+
 
-    db.delete(r)
-    db.commit()
+@router.post("/delete_user", response_model=UserOut, summary="Delete a user")
+async def delete_user(user_id: UserId, db: AsyncSession = Depends(get_async_db)):
+    r = await _find_user(db, user_id)
+    await db.delete(r)
+    await db.commit()
+    await invalidate_user(r.user)
     return UserOut(id=r.id, user=r.user, role=r.role)
 
 
@@ -61,33 +101,264 @@ change_password_kwargs = dict(
 
 
 @router.post("/change_password", **change_password_kwargs)
-def change_password(user: UserCreate, db: Session = Depends(get_db)):
-    existing = db.query(User).filter(User.user == user.user).first()
+async def change_password(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    existing = await db.scalar(select(User).where(User.user == user.user))
     if not existing:
         raise HTTPException(status_code=404, detail="User not found")
-    existing.password = pwd_context.hash(user.password)
+    existing.password = await password_hasher.ahash(user.password)
     if user.role and user.role != existing.role:
         existing.role = user.role
-    db.commit()
-    db.refresh(existing)
+    await db.commit()
+    await db.refresh(existing)
+    await invalidate_user(existing.user)
     return UserOut(id=existing.id, user=existing.user, role=existing.role)
 
 
-@router.get("/", response_model=list[UserOut], summary="List all users")
-def list_users(db: Session = Depends(get_db)):
-    rows = db.query(User).all()
+def _user_page(after_id: int, limit: int, role: Optional[str]):
+    """Keyset page of (id, user, role) rows ordered by the indexed id column."""
+    query = select(User.id, User.user, User.role).where(User.id > after_id)
+    if role is not None:
+        query = query.where(User.role == role)
+    return query.order_by(User.id).limit(limit)
+
+
+list_users_kwargs = dict(
+    response_model=list[UserOut],
+    summary="List users (paginated by id; next page cursor in X-Next-After-Id)",
+)
+
+
+@router.get("/", **list_users_kwargs)
+async def list_users(
+    response: Response,
+    after_id: int = Query(0, ge=0, description="Return users with a greater id"),
+    limit: int = Query(ADMIN_LIST_PAGE_SIZE, ge=1, le=ADMIN_LIST_MAX_PAGE_SIZE),
+    role: Optional[str] = Query(None, description="Only users with this role"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    rows = (await db.execute(_user_page(after_id, limit, role))).all()
+    if len(rows) == limit:
+        response.headers["X-Next-After-Id"] = str(rows[-1].id)
     return [{"id": r.id, "user": r.user, "role": r.role} for r in rows]
 
 
-@router.post("/get_user", response_model=UserOut, summary="Get user by id or user")
-def get_user(user_id: UserId, db: Session = Depends(get_db)):
-    if user_id.id is not None:
-        r = db.query(User).filter_by(id=user_id.id).first()
-    elif user_id.user is not None:
-        r = db.query(User).filter_by(user=user_id.user).first()
-    else:
-        raise HTTPException(status_code=400, detail="Invalid user identifier")
+async def _export_users(role: Optional[str]):
+    # One short session per batch, so a slow client never holds a transaction open
+    after_id = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            page = _user_page(after_id, ADMIN_EXPORT_BATCH_SIZE, role)
+            rows = (await db.execute(page)).all()
+        if not rows:
+            return
+        yield b"".join(
+            orjson.dumps({"id": r.id, "user": r.user, "role": r.role}) + b"\n"
+            for r in rows
+        )
+        if len(rows) < ADMIN_EXPORT_BATCH_SIZE:
+            return
+        after_id = rows[-1].id
 
-    if not r:
-        raise HTTPException(status_code=404, detail="User not found")
+
+@router.get("/export", summary="Export all users as NDJSON (streamed)")
+def export_users(role: Optional[str] = Query(None, description="Only this role")):
+    return StreamingResponse(_export_users(role), media_type="application/x-ndjson")
+
+
+def _parse_import_rows(body: bytes, content_type: str) -> list[dict]:
+    """Read import rows from a CSV (with a header row) or a JSON list body."""
+    try:
+        if content_type.startswith("text/csv"):
+            reader = csv.DictReader(io.StringIO(body.decode("utf-8-sig")))
+            # Empty CSV cells mean "not provided"
+            return [{k: v for k, v in row.items() if v} for row in reader]
+        rows = orjson.loads(body)
+    except (UnicodeDecodeError, csv.Error, orjson.JSONDecodeError) as exc:
+        raise HTTPException(status_code=400, detail=f"Unreadable import body: {exc}")
+    if isinstance(rows, dict):
+        rows = rows.get("users")
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=400, detail="Expected a list of users")
+    return rows
+
+
+async def _existing_users(db: AsyncSession, names: list[str]) -> set[str]:
+    existing = set()
+    for start in range(0, len(names), ADMIN_IMPORT_BATCH_SIZE):
+        chunk = names[start : start + ADMIN_IMPORT_BATCH_SIZE]
+        existing.update(await db.scalars(select(User.user).where(User.user.in_(chunk))))
+    return existing
+
+
+async def _insert_one_by_one(db: AsyncSession, values: list[dict]) -> dict[str, int]:
+    """Insert rows in separate transactions, skipping the ones that conflict."""
+    ids = {}
+    for value in values:
+        try:
+            ids[value["user"]] = await db.scalar(
+                insert(User).values(**value).returning(User.id)
+            )
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+    return ids
+
+
+import_users_kwargs = dict(
+    response_model=UserImportResponse,
+    summary="Bulk import users from a JSON list or CSV (user,password,role)",
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "schema": {"type": "array", "items": UserImport.model_json_schema()}
+                },
+                "text/csv": {"schema": {"type": "string"}},
+            },
+            "required": True,
+        }
+    },
+)
+
+
+@router.post("/import_users", **import_users_kwargs)
+async def import_users(request: Request):
+    raw_rows = _parse_import_rows(
+        await request.body(), request.headers.get("content-type", "")
+    )
+    if len(raw_rows) > ADMIN_IMPORT_MAX_USERS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {ADMIN_IMPORT_MAX_USERS} users per import",
+        )
+
+    results: list[Optional[UserImportResult]] = [None] * len(raw_rows)
+    candidates: dict[str, tuple[int, UserImport]] = {}
+    for i, raw in enumerate(raw_rows):
+        try:
+            row = UserImport.model_validate(raw)
+        except ValidationError as exc:
+            user = raw.get("user") if isinstance(raw, dict) else None
+            detail = "; ".join(e["msg"] for e in exc.errors())
+            results[i] = UserImportResult(
+                row=i, user=user, status="invalid", detail=detail
+            )
+            continue
+        if row.password_hash is not None and not password_hasher.is_hash(
+            row.password_hash
+        ):
+            results[i] = UserImportResult(
+                row=i, user=row.user, status="invalid", detail="Unknown hash format"
+            )
+        elif row.user in candidates:
+            results[i] = UserImportResult(row=i, user=row.user, status="duplicate")
+        else:
+            candidates[row.user] = (i, row)
+
+    # One IN query per batch instead of one lookup per user; the session is closed
+    # before hashing so no connection is held during the (long) bcrypt phase
+    async with AsyncSessionLocal() as db:
+        existing = await _existing_users(db, list(candidates))
+    for name in existing:
+        i, _ = candidates.pop(name)
+        results[i] = UserImportResult(row=i, user=name, status="exists")
+
+    # Plain passwords are hashed concurrently on the bcrypt pool
+    to_hash = [row for _, row in candidates.values() if row.password is not None]
+    hashes = await password_hasher.ahash_many([row.password for row in to_hash])
+    hashed = {row.user: h for row, h in zip(to_hash, hashes)}
+
+    pending = list(candidates.values())
+    async with AsyncSessionLocal() as db:
+        for start in range(0, len(pending), ADMIN_IMPORT_BATCH_SIZE):
+            batch = pending[start : start + ADMIN_IMPORT_BATCH_SIZE]
+            values = [
+                dict(
+                    user=row.user,
+                    password=hashed.get(row.user, row.password_hash),
+                    role=row.role,
+                )
+                for _, row in batch
+            ]
+            try:
+                inserted = await db.execute(
+                    insert(User).returning(User.id, User.user), values
+                )
+                ids = {r.user: r.id for r in inserted}
+                await db.commit()
+            except IntegrityError:
+                # Users created concurrently by another request; retrying the batch
+                # row by row reports only the conflicting rows
+                await db.rollback()
+                ids = await _insert_one_by_one(db, values)
+            for i, row in batch:
+                if row.user in ids:
+                    results[i] = UserImportResult(
+                        row=i, user=row.user, status="created", id=ids[row.user]
+                    )
+                else:
+                    results[i] = UserImportResult(
+                        row=i,
+                        user=row.user,
+                        status="error",
+                        detail="Created concurrently",
+                    )
+
+    created = sum(r.status == "created" for r in results)
+    return UserImportResponse(
+        created=created, skipped=len(results) - created, results=results
+    )
+
+
+@router.post("/get_user", response_model=UserOut, summary="Get user by id or user")
+async def get_user(user_id: UserId, db: AsyncSession = Depends(get_async_db)):
+    r = await _find_user(db, user_id)
     return UserOut(id=r.id, user=r.user, role=r.role)
+
+
+@router.get("/result_cache", summary="Result cache statistics")
+def result_cache_stats():
+    return result_cache.stats()
+
+
+@router.get("/scheduler", summary="Fair-share training scheduler statistics")
+def scheduler_stats():
+    return {
+        **fair_share_scheduler.stats(),
+        "cpu_budget": cpu_budget.stats(),
+        "memory_budget": memory_budget.stats(),
+    }
+
+
+@router.get("/db_pool", summary="Users database connection pool status")
+def db_pool_status():
+    return pool_status()
+
+
+@router.get("/profiles", summary="Recent request profiles (most recent first)")
+def list_profiles():
+    return [p.summary() for p in profile_store.list()]
+
+
+def _find_profile(profile_id: int) -> RequestProfile:
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+
+@router.get("/profiles/{profile_id}", summary="Hottest functions of a profile")
+def get_profile(profile_id: int, limit: int = Query(50, ge=1, le=1000)):
+    profile = _find_profile(profile_id)
+    return {**profile.summary(), "functions": profile.top_functions(limit)}
+
+
+collapsed_profile_kwargs = dict(
+    response_class=PlainTextResponse,
+    summary="Profile stacks in collapsed format (flamegraph.pl, speedscope)",
+)
+
+
+@router.get("/profiles/{profile_id}/collapsed", **collapsed_profile_kwargs)
+def get_profile_collapsed(profile_id: int):
+    return _find_profile(profile_id).collapsed()
@@ -1,5 +1,4 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi_limiter.depends import RateLimiter
 
 from backend.api.config import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
@@ -13,6 +12,7 @@ from backend.api.security.auth import (
     create_access_token,
     validate_credentials,
 )
+from backend.api.security.limiter import RateLimiter
 
 router = APIRouter(
     prefix="/auth",
@@ -29,10 +29,10 @@ login_kwargs = dict(
 
 
 @router.post("/login", **login_kwargs)
-def login(creds=Depends(validate_credentials)):
+async def login(creds=Depends(validate_credentials)):
     username, password, scopes = creds
 
-    user = authenticate_user(username, password)
+    user = await authenticate_user(username, password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
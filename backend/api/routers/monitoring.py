@@ -0,0 +1,35 @@
+import os
+
+from fastapi import APIRouter, Response, Security
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    generate_latest,
+    multiprocess,
+)
+
+from backend.api.security.auth import get_current_user
+
+# Not rate limited: scrapers poll it every few seconds with an admin token
+router = APIRouter(
+    tags=["monitoring"],
+    dependencies=[Security(get_current_user, scopes=["admin"])],
+)
+
+
+@router.get("/metrics", summary="Prometheus metrics in text exposition format")
+def metrics():
+    return Response(generate_latest(metrics_registry()), media_type=CONTENT_TYPE_LATEST)
+
+
+def metrics_registry() -> CollectorRegistry:
+    """
+    The default registry, or with PROMETHEUS_MULTIPROC_DIR set (several gunicorn
+    workers) a registry aggregating the metrics of all workers.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
@@ -1,16 +1,33 @@
-import numpy as np
+from contextlib import contextmanager
+from time import perf_counter
+
 from fastapi import APIRouter, Depends, Security
-from fastapi_limiter.depends import RateLimiter
-from sklearn.metrics import mean_absolute_error, mean_squared_error
+from fastapi.responses import ORJSONResponse
+from starlette.concurrency import run_in_threadpool
 
+from backend.api import profiling, server_timing
+from backend.api.batching import predict_batcher
 from backend.api.config import DEFAULT_RL
+from backend.api.cpu_budget import cpu_budget, set_n_jobs
+from backend.api.memory_budget import memory_budget
+from backend.api.metrics import (
+    TRAIN_PREDICT_COLUMNS,
+    TRAIN_PREDICT_REQUESTS,
+    TRAIN_PREDICT_ROWS,
+    TRAIN_PREDICT_STAGE_SECONDS,
+)
+from backend.api.result_cache import FittedModel, result_cache
+from backend.api.scheduler import fair_share_scheduler
 from backend.api.schemas.tabular_regressor_schemas import (
     AVAILABLE_MODELS,
+    PARALLEL_MODELS,
     TrainPredictMetrics,
     TrainPredictRequest,
     TrainPredictResponse,
 )
 from backend.api.security.auth import get_current_user
+from backend.api.security.cost_limiter import cost_limiter
+from backend.api.security.limiter import RateLimiter
 from backend.api.version import __version__ as api_version
 from backend.db.models import User
 from backend.models.name_conventions import INDEX_COL, PRED_SUFFIX
@@ -25,27 +42,129 @@ router = APIRouter(
 
 
 def _format_predictions(preds_df):
-    predictions = []
-    for _, row in preds_df.iterrows():
-        idx = row[INDEX_COL]
-        values = {c: float(row[c]) for c in preds_df.columns if c != INDEX_COL}
-        predictions.append({"index": idx, "values": values})
-    return predictions
+    """
+    Build the prediction rows straight from the DataFrame NumPy buffers, avoiding
+    per-row pandas Series and Pydantic model construction.
+    """
+    import numpy as np
+
+    value_cols = [c for c in preds_df.columns if c != INDEX_COL]
+    indexes = preds_df[INDEX_COL].tolist()
+    values = preds_df[value_cols].to_numpy(dtype=np.float64).tolist()
+    return [
+        {"index": idx, "values": dict(zip(value_cols, row))}
+        for idx, row in zip(indexes, values)
+    ]
 
 
+# The response is serialized with orjson and bypasses response_model validation;
+# response_model is kept so the OpenAPI schema still documents TrainPredictResponse.
 train_predict_kwargs = dict(
     summary="Train a tabular regressor model and return predictions",
     response_model=TrainPredictResponse,
+    response_class=ORJSONResponse,
 )
 
 
 @router.post("/train_predict", **train_predict_kwargs)
-def train_and_predict(
+async def train_and_predict(
     payload: TrainPredictRequest,
     user: User = Security(get_current_user, scopes=["client"]),
 ):
-    train_df = payload.train_data.to_dataframe()
-    predict_df = payload.predict_data.to_dataframe()
+    _count_request(payload)
+    # CPU-bound stages run in the threadpool; only batched predictions are awaited
+    train_key, response_key, content, fitted = await run_in_threadpool(_lookup, payload)
+    if content is not None:
+        TRAIN_PREDICT_REQUESTS.labels(payload.model_type, "true").inc()
+        with _stage("serialize", payload):
+            return ORJSONResponse(content)
+    TRAIN_PREDICT_REQUESTS.labels(payload.model_type, "false").inc()
+
+    # Requests that compute spend more of the user's budget than the flat rate
+    # limit; responses served from the result cache are not charged
+    await cost_limiter.charge(user.user, payload.estimated_cost(), payload.model_type)
+
+    # Requests are admitted while their estimated peak memory fits the worker budget
+    async with memory_budget.reserve(payload.estimated_memory(), payload.model_type):
+        if fitted is None:
+            # Fits are queued by the fair-share scheduler so no user monopolizes them
+            fitted = await fair_share_scheduler.run(
+                user.user, user.role, _fit_and_cache, train_key, payload
+            )
+        X_predict = await run_in_threadpool(_predict_frame, payload, fitted)
+        with _stage("predict", payload):
+            predictions_df = await predict_batcher.predict(fitted.model, X_predict)
+        with _stage("format", payload):
+            predictions = _format_predictions(predictions_df)
+    content = {
+        "model_type": payload.model_type,
+        "model_version": model_version,
+        "api_version": api_version,
+        "targets": payload.target_columns,
+        "metrics": fitted.metrics,
+        "predictions": predictions,
+    }
+    await run_in_threadpool(result_cache.set_response, response_key, content)
+    with _stage("serialize", payload):
+        return ORJSONResponse(content)
+
+
+@contextmanager
+def _stage(name: str, payload: TrainPredictRequest):
+    """
+    Time a train_predict stage into the stage histogram and Server-Timing, and
+    sample the thread running it when the request is profiled.
+    """
+    start = perf_counter()
+    try:
+        with profiling.profile_thread():
+            yield
+    finally:
+        elapsed = perf_counter() - start
+        TRAIN_PREDICT_STAGE_SECONDS.labels(name, payload.model_type).observe(elapsed)
+        server_timing.record(name, elapsed)
+
+
+def _count_request(payload: TrainPredictRequest):
+    model_type = payload.model_type
+    TRAIN_PREDICT_ROWS.labels(model_type, "train").inc(len(payload.train_data.rows))
+    TRAIN_PREDICT_ROWS.labels(model_type, "predict").inc(len(payload.predict_data.rows))
+    TRAIN_PREDICT_COLUMNS.labels(model_type).observe(payload.n_columns())
+
+
+def _lookup(payload: TrainPredictRequest):
+    """Resolve the cached response, or the cached fitted model, for the payload."""
+    with _stage("cache_lookup", payload):
+        # Identical requests are answered from the result cache without computation
+        train_key = result_cache.train_key(payload)
+        response_key = result_cache.response_key(train_key, payload)
+        content = result_cache.get_response(response_key)
+        if content is not None:
+            return train_key, response_key, content, None
+
+        # A repeated training set reuses the fitted model and its metrics
+        return train_key, response_key, None, result_cache.get_model(train_key)
+
+
+def _fit_and_cache(train_key: str, payload: TrainPredictRequest) -> FittedModel:
+    fitted = _fit_model(payload)
+    result_cache.set_model(train_key, fitted)
+    return fitted
+
+
+def _predict_frame(payload: TrainPredictRequest, fitted: FittedModel):
+    with _stage("dataframe", payload):
+        predict_df = payload.predict_data.to_dataframe()
+    return predict_df[[INDEX_COL] + fitted.feature_columns].copy()
+
+
+def _fit_model(payload: TrainPredictRequest) -> FittedModel:
+    # Imported on first use to keep the API import fast (see warmup)
+    import numpy as np
+    from sklearn.metrics import mean_absolute_error, mean_squared_error
+
+    with _stage("dataframe", payload):
+        train_df = payload.train_data.to_dataframe()
     target_cols = payload.target_columns
     feature_cols = payload.feature_columns or [
         c for c in train_df.columns if c not in (target_cols + [INDEX_COL])
@@ -54,33 +173,35 @@ def train_and_predict(
     # Build X and y DataFrames
     X_train = train_df[[INDEX_COL] + feature_cols].copy()
     y_train = train_df[[INDEX_COL] + target_cols].copy()
-    X_predict = predict_df[[INDEX_COL] + feature_cols].copy()
 
-    # Create model and fit
-    model = payload.get_model_instance()
-    model.fit(X_train, y_train)
+    # Create model and fit with the n_jobs granted by the worker CPU budget
+    max_jobs = None if payload.model_type in PARALLEL_MODELS else 1
+    with cpu_budget.allocate(max_jobs) as n_jobs:
+        model = payload.get_model_instance(n_jobs=n_jobs)
+        with _stage("fit", payload):
+            model.fit(X_train, y_train)
+        with _stage("train_predict", payload):
+            preds_df_train = model.predict(X_train)
+    # Batched predictions run concurrently, so they stay single-threaded
+    set_n_jobs(model, 1)
 
     # Evaluate metrics (MSE vs baseline mean predictor)
     mse = {}
     mae = {}
     baseline_mse = {}
-    for t in target_cols:
-        preds_df_train = model.predict(X_train)
-        pred_col = t + PRED_SUFFIX
-        mse[t] = float(mean_squared_error(y_train[t], preds_df_train[pred_col]))
-        mae[t] = float(mean_absolute_error(y_train[t], preds_df_train[pred_col]))
-        baseline_mse[t] = float(
-            mean_squared_error(y_train[t], np.full_like(y_train[t], y_train[t].mean()))
-        )
-
-    predictions_df = model.predict(X_predict)
-    return TrainPredictResponse(
-        model_type=payload.model_type,
-        model_version=model_version,
-        api_version=api_version,
-        targets=target_cols,
-        metrics=TrainPredictMetrics(mse=mse, mae=mae, baseline_mse=baseline_mse),
-        predictions=_format_predictions(predictions_df),
+    with _stage("metrics", payload):
+        for t in target_cols:
+            pred_col = t + PRED_SUFFIX
+            y_t = y_train[t]
+            mse[t] = float(mean_squared_error(y_t, preds_df_train[pred_col]))
+            mae[t] = float(mean_absolute_error(y_t, preds_df_train[pred_col]))
+            baseline_mse[t] = float(
+                mean_squared_error(y_t, np.full_like(y_t, y_t.mean()))
+            )
+
+    metrics = TrainPredictMetrics(mse=mse, mae=mae, baseline_mse=baseline_mse)
+    return FittedModel(
+        model=model, feature_columns=feature_cols, metrics=metrics.model_dump()
     )
 
 
@@ -0,0 +1,197 @@
+import asyncio
+import math
+import time
+from typing import Any, Callable, Optional, TypeVar
+
+from starlette.concurrency import run_in_threadpool
+
+from backend.api.config import (
+    FAIR_SHARE_HALF_LIFE_SECONDS,
+    FAIR_SHARE_MAX_CONCURRENT,
+    ROLE_WEIGHTS,
+)
+from backend.api.cpu_budget import thread_cpu_time
+from backend.api.metrics import (
+    FAIR_SHARE_CPU_SECONDS,
+    FAIR_SHARE_QUEUED,
+    FAIR_SHARE_WAIT_SECONDS,
+)
+
+T = TypeVar("T")
+
+
+class _UserState:
+    __slots__ = ("usage", "updated", "queued", "running", "jobs", "wait_seconds")
+
+    def __init__(self, now: float):
+        self.usage = 0.0  # decayed CPU-seconds
+        self.updated = now
+        self.queued = 0
+        self.running = 0
+        self.jobs = 0
+        self.wait_seconds = 0.0
+
+
+class _Job:
+    __slots__ = ("user", "role", "weight", "enqueued", "future")
+
+    def __init__(self, user: str, role: str, weight: float, future: asyncio.Future):
+        self.user = user
+        self.role = role
+        self.weight = weight
+        self.enqueued = time.monotonic()
+        self.future = future
+
+
+class FairShareScheduler:
+    """
+    Weighted fair-share scheduler for CPU-heavy jobs such as model fitting.
+
+    At most ``max_concurrent`` jobs run at once in the threadpool. When a slot
+    frees up, the queued job whose user has the lowest CPU-seconds divided by the
+    weight of their role runs next, so light users overtake heavy ones. CPU-seconds
+    are measured with ``cpu_budget.thread_cpu_time`` in the worker thread, which
+    charges parallel fits for every thread they were granted, and decay with a
+    half-life of ``half_life_seconds``.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 1,
+        role_weights: Optional[dict[str, float]] = None,
+        half_life_seconds: float = 300.0,
+    ):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.max_concurrent = max_concurrent
+        self.role_weights = role_weights or {}
+        self.decay = math.log(2) / half_life_seconds
+        self._running = 0
+        self._queue: list[_Job] = []
+        self._users: dict[str, _UserState] = {}
+
+    async def run(self, user: str, role: str, fn: Callable[..., T], *args: Any) -> T:
+        """Run fn(*args) in the threadpool once the user's fair share allows it."""
+        state = self._user(user)
+        weight = self.role_weights.get(role, 1.0)
+        job = _Job(user, role, weight, asyncio.get_running_loop().create_future())
+        if self._running < self.max_concurrent and not self._queue:
+            self._running += 1
+            state.running += 1
+        else:
+            self._queue.append(job)
+            state.queued += 1
+            FAIR_SHARE_QUEUED.labels(role).inc()
+            try:
+                await job.future
+            except asyncio.CancelledError:
+                if job.future.done() and not job.future.cancelled():
+                    # The slot was granted just before the cancellation
+                    state.running -= 1
+                    self._release()
+                else:
+                    self._dequeue(job)
+                raise
+
+        wait = time.monotonic() - job.enqueued
+        state.jobs += 1
+        state.wait_seconds += wait
+        FAIR_SHARE_WAIT_SECONDS.labels(role).observe(wait)
+        cpu = [0.0]
+        task = asyncio.ensure_future(run_in_threadpool(_timed, cpu, fn, *args))
+
+        def finished(task: asyncio.Future):
+            # A cancelled caller does not stop the thread: the slot stays taken and
+            # the job is charged once the thread is actually done
+            if not task.cancelled():
+                task.exception()  # retrieved here when the caller is gone
+            state.running -= 1
+            self._charge(state, cpu[0])
+            FAIR_SHARE_CPU_SECONDS.labels(role).inc(cpu[0])
+            self._release()
+
+        task.add_done_callback(finished)
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "max_concurrent": self.max_concurrent,
+            "running": self._running,
+            "queued": len(self._queue),
+            "users": {
+                user: {
+                    "queued": s.queued,
+                    "running": s.running,
+                    "cpu_seconds": round(self._usage(s, now), 6),
+                    "jobs": s.jobs,
+                    "avg_wait_seconds": (
+                        round(s.wait_seconds / s.jobs, 6) if s.jobs else 0.0
+                    ),
+                }
+                for user, s in self._users.items()
+            },
+        }
+
+    def _user(self, user: str) -> _UserState:
+        state = self._users.get(user)
+        if state is None:
+            state = self._users[user] = _UserState(time.monotonic())
+        return state
+
+    def _usage(self, state: _UserState, now: float) -> float:
+        return state.usage * math.exp(-self.decay * (now - state.updated))
+
+    def _charge(self, state: _UserState, cpu_seconds: float):
+        now = time.monotonic()
+        state.usage = self._usage(state, now) + cpu_seconds
+        state.updated = now
+
+    def _dequeue(self, job: _Job):
+        self._queue.remove(job)
+        self._users[job.user].queued -= 1
+        FAIR_SHARE_QUEUED.labels(job.role).dec()
+
+    def _release(self):
+        self._running -= 1
+        now = time.monotonic()
+        while self._queue and self._running < self.max_concurrent:
+            job = min(
+                self._queue,
+                key=lambda j: (
+                    self._usage(self._users[j.user], now) / j.weight,
+                    j.enqueued,
+                ),
+            )
+            self._dequeue(job)
+            if job.future.cancelled():
+                continue
+            self._running += 1
+            self._users[job.user].running += 1
+            job.future.set_result(None)
+        self._prune(now)
+
+    def _prune(self, now: float):
+        """Forget idle users whose usage has decayed away."""
+        idle = [
+            user
+            for user, s in self._users.items()
+            if not s.queued and not s.running and self._usage(s, now) < 1e-3
+        ]
+        for user in idle:
+            del self._users[user]
+
+
+def _timed(cpu: list[float], fn: Callable[..., T], *args: Any) -> T:
+    start = thread_cpu_time()
+    try:
+        return fn(*args)
+    finally:
+        cpu[0] = thread_cpu_time() - start
+
+
+fair_share_scheduler = FairShareScheduler(
+    max_concurrent=FAIR_SHARE_MAX_CONCURRENT,
+    role_weights=ROLE_WEIGHTS,
+    half_life_seconds=FAIR_SHARE_HALF_LIFE_SECONDS,
+)
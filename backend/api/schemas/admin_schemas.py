@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Literal, Optional
 from pydantic import BaseModel, Field, model_validator
 
 
@@ -23,3 +23,34 @@ class UserId(BaseModel):
         if values.get("id") is None and values.get("user") is None:
             raise ValueError("At least 'id' or 'user' must be provided")
         return values
+
+
+class UserImport(BaseModel):
+    user: str = Field(min_length=1, max_length=120, description="Username")
+    password: Optional[str] = Field(
+        None, max_length=128, description="Password as plain text (stored hashed)"
+    )
+    password_hash: Optional[str] = Field(
+        None, description="Existing bcrypt hash, imported as is instead of password"
+    )
+    role: str = Field(default="client", max_length=32, description="Role of the user")
+
+    @model_validator(mode="after")
+    def check_one_password(self):
+        if (self.password is None) == (self.password_hash is None):
+            raise ValueError("Exactly one of 'password' or 'password_hash' required")
+        return self
+
+
+class UserImportResult(BaseModel):
+    row: int = Field(description="Position of the row in the input (0-based)")
+    user: Optional[str] = Field(None, description="Username")
+    status: Literal["created", "exists", "duplicate", "invalid", "error"]
+    id: Optional[int] = Field(None, description="User ID if created")
+    detail: Optional[str] = Field(None, description="Reason for non-created rows")
+
+
+class UserImportResponse(BaseModel):
+    created: int
+    skipped: int
+    results: list[UserImportResult]
@@ -1,12 +1,18 @@
-from typing import Any, Dict, List, Optional, Union
+import importlib
+from functools import lru_cache
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 
-import pandas as pd
 from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.linear_model import Lasso, LinearRegression, Ridge
 
 import backend.models as bm
-from backend.models.tabular_regressor import TabularRegressor
+from backend.api import server_timing
+from backend.api.metrics import TRAIN_PREDICT_STAGE_SECONDS
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from backend.models.tabular_regressor import TabularRegressor
 
 # --- DoS protection / validation limits ---
 
@@ -19,14 +25,45 @@ MAX_COLUMN_NAME_LENGTH: int = 64
 MAX_STRING_LENGTH: int = 64  # max length for any string cell value
 MAX_INDEX_STRING_LENGTH: int = 64
 
-# Available sklearn base models (store classes, not instances, to avoid shared state)
-str_to_sk_model = {
-    "LinearRegression": LinearRegression,
-    "Ridge": Ridge,
-    "Lasso": Lasso,
-    "RandomForestRegressor": RandomForestRegressor,
+# Available sklearn base models by module; classes are imported on first use since
+# sklearn dominates the import time of the API
+sk_model_modules = {
+    "LinearRegression": "sklearn.linear_model",
+    "Ridge": "sklearn.linear_model",
+    "Lasso": "sklearn.linear_model",
+    "RandomForestRegressor": "sklearn.ensemble",
+}
+AVAILABLE_MODELS = list(sk_model_modules.keys())
+
+
+@lru_cache(maxsize=None)
+def sk_model_class(model_type: str) -> type:
+    """Return the sklearn class of a model type (instantiate it per request)."""
+    return getattr(importlib.import_module(sk_model_modules[model_type]), model_type)
+
+
+# Models whose fit is parallelized over n_jobs (granted by the CPU budget)
+PARALLEL_MODELS = {"RandomForestRegressor"}
+
+# Relative fit/predict cost of each model per data cell (used by the cost limiter)
+model_cost_factor = {
+    "LinearRegression": 1.0,
+    "Ridge": 1.0,
+    "Lasso": 2.0,
+    "RandomForestRegressor": 50.0,
+}
+
+# Approximate peak bytes per train/predict cell of a request (parsed rows, dict rows,
+# DataFrames and their copies), measured as RSS growth on 1,000-row payloads
+MEMORY_BYTES_PER_CELL: int = 300
+# Extra bytes per training row and target held by the fitted model while fitting
+# (100 trees of ~64 B nodes for a forest); linear models fit in the per-cell share
+model_memory_per_row = {
+    "LinearRegression": 0,
+    "Ridge": 0,
+    "Lasso": 0,
+    "RandomForestRegressor": 6_400,
 }
-AVAILABLE_MODELS = list(str_to_sk_model.keys())
 
 
 class DataRow(BaseModel):
@@ -91,7 +128,9 @@ class TabularData(BaseModel):
             raise ValueError("Rows must not be empty")
         return v
 
-    def to_dataframe(self) -> pd.DataFrame:
+    def to_dataframe(self) -> "pd.DataFrame":
+        import pandas as pd
+
         dict_rows: List[Dict[str, Any]] = []
         for row in self.rows:
             dict_rows.append(row.model_dump(by_alias=True))
@@ -116,6 +155,20 @@ class TrainPredictRequest(BaseModel):
         ..., description="Rows including features only for inference"
     )
 
+    @model_validator(mode="wrap")
+    @classmethod
+    def _time_validation(cls, data: Any, handler):
+        model_type = data.get("model_type") if isinstance(data, dict) else None
+        if model_type not in AVAILABLE_MODELS:
+            model_type = "unknown"
+        start = perf_counter()
+        try:
+            return handler(data)
+        finally:
+            elapsed = perf_counter() - start
+            TRAIN_PREDICT_STAGE_SECONDS.labels("validate", model_type).observe(elapsed)
+            server_timing.record("validate", elapsed)
+
     @field_validator("model_type")
     @classmethod
     def check_model_type(cls, v):
@@ -179,10 +232,41 @@ class TrainPredictRequest(BaseModel):
             )
         return v
 
-    def get_model_instance(self) -> TabularRegressor:
+    def n_columns(self) -> int:
+        """Number of feature plus target columns used by the model."""
+        if self.feature_columns is not None:
+            n_features = len(self.feature_columns)
+        else:
+            # Extra fields of the first row (index excluded) minus the targets
+            first_row = self.train_data.rows[0].model_extra or {}
+            n_features = max(1, len(first_row) - len(self.target_columns))
+        return n_features + len(self.target_columns)
+
+    def estimated_cost(self) -> float:
+        """
+        Estimate the cost of the request as rows x columns x model factor, where
+        rows covers train and predict data and columns covers features and targets.
+        """
+        rows = len(self.train_data.rows) + len(self.predict_data.rows)
+        return rows * self.n_columns() * model_cost_factor[self.model_type]
+
+    def estimated_memory(self) -> int:
+        """
+        Estimate the peak memory of the request in bytes from rows x columns and
+        the model type (see MEMORY_BYTES_PER_CELL and model_memory_per_row).
+        """
+        train_rows = len(self.train_data.rows)
+        rows = train_rows + len(self.predict_data.rows)
+        model_bytes = train_rows * len(self.target_columns)
+        model_bytes *= model_memory_per_row[self.model_type]
+        return rows * self.n_columns() * MEMORY_BYTES_PER_CELL + model_bytes
+
+    def get_model_instance(self, n_jobs: Optional[int] = None) -> "TabularRegressor":
         """Create a fresh model instance each request to avoid shared mutable state."""
-        base_cls = str_to_sk_model[self.model_type]
-        base_model = bm.SKLearnRegressor(base_model=base_cls())
+        sk_model = sk_model_class(self.model_type)()
+        if n_jobs is not None and "n_jobs" in sk_model.get_params():
+            sk_model.set_params(n_jobs=n_jobs)
+        base_model = bm.SKLearnRegressor(base_model=sk_model)
         return bm.MultiTargetRegressor(base_model=base_model)
 
 
@@ -1,6 +1,11 @@
+import asyncio
+import hashlib
+import logging
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import NamedTuple, Optional
 
+import redis.asyncio as redis
 from fastapi import Depends, HTTPException, status
 from fastapi.security import (
     OAuth2PasswordBearer,
@@ -8,47 +13,121 @@ from fastapi.security import (
     SecurityScopes,
 )
 from jose import JWTError, jwt
-from passlib.context import CryptContext
+from sqlalchemy import select
 
+from backend.api import server_timing
+from backend.api.caching import TTLCache
 from backend.api.config import (
+    ACCESS_TOKEN_EXPIRE_MINUTES,
     ALGORITHM,
     SCOPE_IMPLICATIONS,
     SCOPES,
     SECRET_KEY,
+    TOKEN_CACHE_MAX_ENTRIES,
+    USER_CACHE_MAX_ENTRIES,
+    USER_CACHE_PUBSUB,
+    USER_CACHE_TTL_SECONDS,
     access_token_timedelta,
 )
+from backend.api.security.passwords import password_hasher
 from backend.db.models import User
-from backend.db.session import SessionLocal
+from backend.db.session import AsyncSessionLocal
 
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl="/auth/login",
     scopes=SCOPES,
 )
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 PASSWORD_MAX_LEN = 128
 USERNAME_MAX_LEN = 128
 
+logger = logging.getLogger(__name__)
+
+# Detached user rows for get_current_user; admin routes invalidate modified users
+user_cache: TTLCache[str, User] = TTLCache(
+    USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL_SECONDS
+)
+USER_CACHE_CHANNEL = "webpredictor:user_cache:invalidate"
+# Async Redis client of the lifespan publishing invalidations to other workers
+_publisher: Optional[redis.Redis] = None
+PUBLISH_TIMEOUT_SECONDS = 0.5
+
+
+class VerifiedToken(NamedTuple):
+    subject: str
+    scopes: tuple[str, ...]
+    effective_scopes: frozenset[str]
+
+
+# Verified tokens by SHA-256 digest; each entry expires with its token
+token_cache: TTLCache[bytes, VerifiedToken] = TTLCache(
+    TOKEN_CACHE_MAX_ENTRIES, ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
 
-def _get_user(username: str) -> User | None:
-    db = SessionLocal()
-    try:
-        row = db.query(User).filter(User.user == username).first()
-        return row
-    finally:
-        db.close()
 
+async def _aget_user(username: str) -> User | None:
+    with server_timing.timed("db"):
+        async with AsyncSessionLocal() as db:
+            query = select(User).where(User.user == username).limit(1)
+            return await db.scalar(query)
 
-def _verify_password(password: str, stored_hash: str | None) -> bool:
+
+async def _aget_cached_user(username: str) -> User | None:
+    user = user_cache.get(username)
+    if user is None:
+        user = await _aget_user(username)
+        if user is not None:
+            user_cache.set(username, user)
+    return user
+
+
+def use_invalidation_publisher(client: Optional[redis.Redis]):
+    """Publish user invalidations through this async Redis client (None stops)."""
+    global _publisher
+    _publisher = client
+
+
+async def invalidate_user(username: str):
+    """Drop a user from the cache of this worker and, with pub/sub, of all others."""
+    user_cache.pop(username)
+    if not USER_CACHE_PUBSUB or _publisher is None:
+        return
+    try:
+        await asyncio.wait_for(
+            _publisher.publish(USER_CACHE_CHANNEL, username), PUBLISH_TIMEOUT_SECONDS
+        )
+    except (redis.RedisError, asyncio.TimeoutError) as exc:
+        logger.warning("User cache invalidation publish failed: %r", exc)
+
+
+async def listen_user_invalidations(client):
+    """Background task dropping users invalidated by other workers."""
+    while True:
+        try:
+            async with client.pubsub() as pubsub:
+                await pubsub.subscribe(USER_CACHE_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        user_cache.pop(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            # Invalidations may have been missed while disconnected
+            logger.warning("User cache subscription failed: %s", exc)
+            user_cache.clear()
+            await asyncio.sleep(1)
+
+
+async def _verify_password(password: str, stored_hash: str | None) -> bool:
     if stored_hash is None:
         return False
-    return pwd_context.verify(password, stored_hash)
+    with server_timing.timed("auth"):
+        return await password_hasher.averify(password, stored_hash)
 
 
-def authenticate_user(username: str, password: str) -> User | None:
-    user = _get_user(username)
-    if user and _verify_password(password, user.password):
+async def authenticate_user(username: str, password: str) -> User | None:
+    user = await _aget_user(username)
+    if user and await _verify_password(password, user.password):
         return user
     return None
 
@@ -63,7 +142,41 @@ def create_access_token(
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-def get_current_user(
+def verify_token(token: str) -> VerifiedToken | None:
+    """
+    Decode and verify a token, expanding its scopes with SCOPE_IMPLICATIONS.
+    Results are cached by token digest until the token expires; None if invalid.
+    """
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    verified = token_cache.get(key)
+    if verified is not None:
+        return verified
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    username = payload.get("sub")
+    if username is None:
+        return None
+    scopes = tuple(payload.get("scopes", []))
+    effective_scopes = set(scopes)
+    for s in scopes:
+        implied = SCOPE_IMPLICATIONS.get(s)
+        if implied:
+            effective_scopes.update(implied)
+    verified = VerifiedToken(username, scopes, frozenset(effective_scopes))
+    ttl_seconds = payload["exp"] - time.time() if "exp" in payload else None
+    token_cache.set(key, verified, ttl_seconds=ttl_seconds)
+    return verified
+
+
+def token_scopes(token: str) -> list[str]:
+    """Return the scopes granted by a valid token, or [] if it does not verify."""
+    verified = verify_token(token)
+    return list(verified.scopes) if verified is not None else []
+
+
+async def get_current_user(
     security_scopes: SecurityScopes, token: str = Depends(oauth2_scheme)
 ) -> User:
     authenticate_value = (
@@ -76,24 +189,14 @@ def get_current_user(
         detail="Invalid token",
         headers={"WWW-Authenticate": authenticate_value},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        token_scopes: list[str] = payload.get("scopes", [])
-        if username is None:
-            raise credentials_exception
-    except JWTError:
+    with server_timing.timed("auth"):
+        verified = verify_token(token)
+    if verified is None:
         raise credentials_exception
 
     # Verify required scopes
-    effective_scopes = set(token_scopes)
-    for s in token_scopes:
-        implied = SCOPE_IMPLICATIONS.get(s)
-        if implied:
-            effective_scopes.update(implied)
-
     for required in security_scopes.scopes:
-        if required not in effective_scopes:
+        if required not in verified.effective_scopes:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Insufficient scope. Missing: {required}",
@@ -101,7 +204,7 @@ def get_current_user(
             )
 
     # Return user
-    user = _get_user(username)
+    user = await _aget_cached_user(verified.subject)
     if user is None:
         raise credentials_exception
     return user
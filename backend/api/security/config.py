@@ -21,3 +21,13 @@ DOCS_CSP = "; ".join(
         "base-uri 'none'",
     ]
 )
+
+# Headers added to every response unless the route already set them
+SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    "Strict-Transport-Security": "max-age=63072000; includeSubDomains; preload",
+    "Content-Security-Policy": DEFAULT_CSP,
+}
@@ -0,0 +1,134 @@
+import logging
+import math
+import time
+from typing import Optional
+
+from fastapi import HTTPException, status
+from redis.exceptions import RedisError
+
+from backend.api.config import COST_BUDGET, COST_LIMIT_ENABLED
+from backend.api.metrics import COST_LIMIT_CHARGED, COST_LIMIT_REJECTIONS
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "webpredictor:cost"
+
+# Token bucket refilled from the Redis clock; returns the seconds to wait as a string
+# (0 when the cost was charged) since Lua numbers are truncated in integer replies.
+_CHARGE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(retry_after)
+"""
+
+
+class InMemoryBudgetStore:
+    """Per-process budget store, used for tests and whenever Redis is unavailable."""
+
+    def __init__(self):
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    async def charge(self, key: str, cost: float, capacity: float, rate: float):
+        """Charge cost to key; return 0 if charged, else seconds until it fits."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * rate)
+        retry_after = 0.0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            retry_after = (cost - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        return retry_after
+
+    def reset(self):
+        self._buckets.clear()
+
+
+class RedisBudgetStore:
+    """Budget store shared by all workers, charged atomically with a Lua script."""
+
+    def __init__(self, redis_client):
+        self._script = redis_client.register_script(_CHARGE_SCRIPT)
+
+    async def charge(self, key: str, cost: float, capacity: float, rate: float):
+        retry_after = await self._script(
+            keys=[f"{REDIS_KEY_PREFIX}:{key}"], args=[capacity, rate, cost]
+        )
+        return float(retry_after)
+
+
+class CostLimiter:
+    """
+    Charges each request its estimated cost against a per-user budget of
+    ``capacity`` units refilled over ``seconds``.
+
+    Requests costing more than the whole budget are charged the whole budget, so
+    they stay possible once the budget is full. If the Redis store fails, budgets
+    fall back to a per-process store until Redis answers again.
+    """
+
+    def __init__(self, capacity: int, seconds: int, enabled: bool = True):
+        self.capacity = capacity
+        self.rate = capacity / seconds
+        self.enabled = enabled
+        self.local_store = InMemoryBudgetStore()
+        self.store = self.local_store
+        self._redis_failed = False
+
+    def use_redis(self, redis_client: Optional[object]):
+        """Share budgets through Redis (None keeps them per process)."""
+        if redis_client is None:
+            self.store = self.local_store
+        else:
+            self.store = RedisBudgetStore(redis_client)
+
+    async def charge(self, user: str, cost: float, model_type: str):
+        """Charge cost to the user's budget or raise 429 with Retry-After."""
+        if not self.enabled:
+            return
+        cost = min(cost, self.capacity)
+        retry_after = await self._charge(user, cost)
+        if retry_after > 0:
+            COST_LIMIT_REJECTIONS.labels(model_type).inc()
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Cost budget exceeded",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+        COST_LIMIT_CHARGED.labels(model_type).inc(cost)
+
+    async def _charge(self, user: str, cost: float) -> float:
+        if self.store is self.local_store:
+            return await self.local_store.charge(user, cost, self.capacity, self.rate)
+        try:
+            retry_after = await self.store.charge(user, cost, self.capacity, self.rate)
+        except (RedisError, OSError) as exc:
+            if not self._redis_failed:
+                logger.warning("Cost limiter running local-only, Redis failed: %s", exc)
+            self._redis_failed = True
+            return await self.local_store.charge(user, cost, self.capacity, self.rate)
+        if self._redis_failed:
+            logger.info("Cost limiter using Redis again")
+            self._redis_failed = False
+        return retry_after
+
+
+cost_limiter = CostLimiter(
+    capacity=COST_BUDGET[0], seconds=COST_BUDGET[1], enabled=COST_LIMIT_ENABLED
+)
@@ -1,12 +1,25 @@
+import asyncio
 import base64
 import hashlib
 import hmac
+import logging
+import math
+import os
+import time
+from functools import lru_cache
+from typing import Optional
 
-from fastapi import Request
+from fastapi import HTTPException, Request, Response, status
 
-from backend.api.config import IP_KEY_SALT
+from backend.api.config import HASH_IP_CACHE_SIZE, IP_KEY_SALT, RATE_LIMIT_SYNC_SECONDS
+from backend.api.metrics import RATE_LIMIT_REJECTIONS
 
+logger = logging.getLogger(__name__)
 
+REDIS_KEY_PREFIX = "webpredictor:rl"
+
+
+@lru_cache(maxsize=HASH_IP_CACHE_SIZE)
 def hash_ip(ip: str) -> str:
     """
     Return a hashed representation of the given IP address.
@@ -21,20 +34,209 @@ def hash_ip(ip: str) -> str:
 async def real_ip(request: Request) -> str:
     ip = ""
     if request.headers.get("x-forwarded-for"):
-        print("DEBUG: x-forwarded-for header found")
         xff = request.headers.get("x-forwarded-for")
         ip = xff.split(",")[0].strip()
     elif request.headers.get("x-real-ip"):
-        print("DEBUG: x-real-ip header found")
         xrip = request.headers.get("x-real-ip")
         ip = xrip.strip()
 
     if len(ip) > 100:
-        ip == ""
+        ip = ""
     if ip.count(":") == 1 and ip.split(":")[1].isdigit():
         ip = ip.split(":")[0]
 
     if ip == "":
         ip = "0.0.0.0"
-    print(f"DEBUG: Using hashed IP address {hash_ip(ip)} for rate limiting")
-    return hash_ip(ip)
\ No newline at end of file
+    return hash_ip(ip)
+
+
+class _Bucket:
+    __slots__ = (
+        "capacity",
+        "rate",
+        "seconds",
+        "tokens",
+        "updated",
+        "unsynced",
+        "window",
+        "own",
+        "others",
+    )
+
+    def __init__(self, capacity: int, seconds: int, now: float):
+        self.capacity = capacity
+        self.rate = capacity / seconds
+        self.seconds = seconds
+        self.tokens = float(capacity)
+        self.updated = now
+        self.unsynced = 0  # admissions not yet pushed to Redis
+        self.window = -1  # Redis window the own/others counts belong to
+        self.own = 0  # admissions of this worker pushed in the current window
+        self.others = 0  # admissions of other workers seen in the current window
+
+
+class TwoTierRateLimit:
+    """
+    Rate limit state enforced in-process and synchronized with Redis in batches.
+
+    Every key has a local token bucket (``times`` tokens refilled over
+    ``seconds``), so admission decisions never wait on Redis. A background task
+    pushes local admissions to per-window Redis counters every ``sync_seconds``
+    with one pipeline and deducts what other workers admitted from the local
+    buckets. If Redis is missing or failing the limiter keeps working locally.
+
+    Accuracy bound: a single worker is exact. With N workers the global number
+    of admissions for a key can exceed ``times`` per ``seconds`` by at most
+    ``(N - 1) * times`` in the worst case (every worker starting with a full
+    bucket), and by about ``(N - 1) * times * sync_seconds / seconds`` once the
+    buckets have been synchronized.
+    """
+
+    def __init__(self, sync_seconds: float = 1.0, max_keys: int = 100_000):
+        self.sync_seconds = sync_seconds
+        self.max_keys = max_keys
+        self.enabled = True
+        self.redis = None
+        self.redis_available = False
+        self._buckets: dict[str, _Bucket] = {}
+        self._task: Optional[asyncio.Task] = None
+        # Process that started the sync task (a forked worker must start its own)
+        self.task_pid: Optional[int] = None
+
+    def acquire(self, key: str, times: int, seconds: int) -> float:
+        """Take one token for key; return 0 if admitted, else seconds to retry."""
+        if not self.enabled:
+            return 0.0
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._prune(now)
+            bucket = self._buckets[key] = _Bucket(times, seconds, now)
+        bucket.tokens = min(
+            bucket.capacity, bucket.tokens + (now - bucket.updated) * bucket.rate
+        )
+        bucket.updated = now
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            bucket.unsynced += 1
+            return 0.0
+        return (1 - bucket.tokens) / bucket.rate
+
+    def start(self, redis_client):
+        """Start synchronizing with Redis (None keeps the limiter local-only)."""
+        self.redis = redis_client
+        self.redis_available = redis_client is not None
+        if redis_client is not None and self._task is None:
+            self._task = asyncio.create_task(self._sync_loop())
+            self.task_pid = os.getpid()
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self.task_pid = None
+        await self.sync()
+
+    def reset(self):
+        self._buckets.clear()
+
+    async def sync(self):
+        """Push pending admissions to Redis and apply other workers' usage."""
+        if self.redis is None:
+            return
+        pending = [(k, b, b.unsynced) for k, b in self._buckets.items() if b.unsynced]
+        if not pending:
+            return
+        now = time.time()
+        pipe = self.redis.pipeline(transaction=False)
+        windows = []
+        for key, bucket, sent in pending:
+            window = int(now // bucket.seconds)
+            windows.append(window)
+            redis_key = f"{REDIS_KEY_PREFIX}:{key}:{window}"
+            pipe.incrby(redis_key, sent)
+            pipe.expire(redis_key, 2 * bucket.seconds)
+        try:
+            results = await pipe.execute()
+        except Exception as exc:
+            if self.redis_available:
+                logger.warning("Rate limiter running local-only, Redis failed: %s", exc)
+            self.redis_available = False
+            # Drop the backlog so a recovered Redis is not flooded with stale counts
+            for _, bucket, sent in pending:
+                bucket.unsynced -= sent
+            return
+
+        if not self.redis_available:
+            logger.info("Rate limiter synchronized with Redis again")
+        self.redis_available = True
+        for (_, bucket, sent), window, total in zip(pending, windows, results[::2]):
+            if bucket.window != window:
+                bucket.window, bucket.own, bucket.others = window, 0, 0
+            bucket.unsynced -= sent
+            bucket.own += sent
+            others = int(total) - bucket.own
+            if others > bucket.others:
+                # Tokens may go negative so other workers' usage is paid back
+                bucket.tokens = max(
+                    -bucket.capacity, bucket.tokens - (others - bucket.others)
+                )
+                bucket.others = others
+
+    async def _sync_loop(self):
+        while True:
+            await asyncio.sleep(self.sync_seconds)
+            try:
+                await self.sync()
+                self._prune(time.monotonic())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Rate limiter synchronization failed")
+
+    def _prune(self, now: float):
+        """Forget synced buckets that have refilled completely."""
+        idle = [
+            k
+            for k, b in self._buckets.items()
+            if not b.unsynced and b.tokens + (now - b.updated) * b.rate >= b.capacity
+        ]
+        for key in idle:
+            del self._buckets[key]
+
+
+rate_limit_state = TwoTierRateLimit(sync_seconds=RATE_LIMIT_SYNC_SECONDS)
+
+
+class RateLimiter:
+    """
+    FastAPI dependency allowing ``times`` requests per ``seconds`` for each client
+    IP and route, backed by the shared two-tier rate limit state.
+    """
+
+    def __init__(
+        self,
+        times: int,
+        seconds: int,
+        state: TwoTierRateLimit = rate_limit_state,
+    ):
+        self.times = times
+        self.seconds = seconds
+        self.state = state
+
+    async def __call__(self, request: Request, response: Response):
+        path = request.scope["path"]
+        key = f"{await real_ip(request)}:{path}:{self.times}:{self.seconds}"
+        retry_after = self.state.acquire(key, self.times, self.seconds)
+        if retry_after > 0:
+            RATE_LIMIT_REJECTIONS.labels(path).inc()
+            raise HTTPException(
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                "Too Many Requests",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
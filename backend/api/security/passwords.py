@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from backend.api.config import PASSWORD_POOL_MAX_QUEUE, PASSWORD_POOL_WORKERS
+from backend.api.metrics import (
+    PASSWORD_POOL_ACTIVE,
+    PASSWORD_POOL_QUEUED,
+    PASSWORD_POOL_REJECTIONS,
+    PASSWORD_POOL_WAIT_SECONDS,
+)
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification on a dedicated, bounded thread pool.
+
+    bcrypt releases the GIL, so jobs run next to request handling instead of
+    occupying the shared request threadpool. At most ``max_workers`` jobs run at
+    once and ``max_queue`` more may wait; further jobs are rejected with 503.
+    """
+
+    def __init__(self, max_workers: int = 1, max_queue: int = 64):
+        self.context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="bcrypt"
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+
+    def _submit(self, fn: Callable[..., T], *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            PASSWORD_POOL_REJECTIONS.inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many concurrent password operations",
+                headers={"Retry-After": "1"},
+            )
+        queued_at = time.perf_counter()
+        PASSWORD_POOL_QUEUED.inc()
+
+        def job() -> T:
+            PASSWORD_POOL_QUEUED.dec()
+            PASSWORD_POOL_WAIT_SECONDS.observe(time.perf_counter() - queued_at)
+            PASSWORD_POOL_ACTIVE.inc()
+            try:
+                return fn(*args)
+            finally:
+                PASSWORD_POOL_ACTIVE.dec()
+                self._slots.release()
+
+        return self._executor.submit(job)
+
+    def hash(self, password: str) -> str:
+        return self._submit(self.context.hash, password).result()
+
+    def verify(self, password: str, stored_hash: str) -> bool:
+        return self._submit(self.context.verify, password, stored_hash).result()
+
+    async def ahash(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(self.context.hash, password))
+
+    async def ahash_many(self, passwords: list[str]) -> list[str]:
+        """Hash many passwords keeping at most max_workers jobs in the pool."""
+        in_flight = asyncio.Semaphore(self.max_workers)
+
+        async def hash_one(password: str) -> str:
+            async with in_flight:
+                return await self.ahash(password)
+
+        return list(await asyncio.gather(*(hash_one(p) for p in passwords)))
+
+    def is_hash(self, value: str) -> bool:
+        """Whether value is a hash produced by this hasher's schemes."""
+        return self.context.identify(value) is not None
+
+    async def averify(self, password: str, stored_hash: str) -> bool:
+        return await asyncio.wrap_future(
+            self._submit(self.context.verify, password, stored_hash)
+        )
+
+
+password_hasher = PasswordHasher(
+    max_workers=PASSWORD_POOL_WORKERS, max_queue=PASSWORD_POOL_MAX_QUEUE
+)
@@ -0,0 +1,46 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Iterator, Optional
+
+# Stage durations of the current request; None outside instrumented requests
+_timings: ContextVar[Optional[list[tuple[str, float]]]] = ContextVar(
+    "server_timing", default=None
+)
+
+
+def record(name: str, seconds: float):
+    """Add a stage duration to the Server-Timing header of the current request."""
+    timings = _timings.get()
+    if timings is not None:
+        timings.append((name, seconds))
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Time the block into the Server-Timing header (no-op outside a request)."""
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timings.append((name, perf_counter() - start))
+
+
+def start() -> list[tuple[str, float]]:
+    """Start collecting stage durations for the current request."""
+    timings: list[tuple[str, float]] = []
+    _timings.set(timings)
+    return timings
+
+
+def header_value(timings: list[tuple[str, float]], total: float) -> str:
+    """Format durations (summed per name, in order) as a Server-Timing value."""
+    totals: dict[str, float] = {}
+    for name, seconds in timings:
+        totals[name] = totals.get(name, 0.0) + seconds
+    totals["total"] = total
+    return ", ".join(f"{name};dur={s * 1000:.3f}" for name, s in totals.items())
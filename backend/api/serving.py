@@ -0,0 +1,32 @@
+import logging
+import os
+
+from backend.api.security.cost_limiter import RedisBudgetStore, cost_limiter
+from backend.api.security.limiter import rate_limit_state
+from backend.db.session import pool_pid
+
+logger = logging.getLogger(__name__)
+
+
+def check_worker_setup(redis_client) -> dict:
+    """
+    Verify at startup that this worker, not a parent it was forked from, owns its
+    rate limiter sync task, its cost limiter Redis store and its connection pools:
+    the sync task and the pools record the pid of the process that created them.
+    Raises RuntimeError otherwise, so a misconfigured worker fails to boot.
+    """
+    pid = os.getpid()
+    state = {
+        "pid": pid,
+        "rate_limiter": redis_client is None or rate_limit_state.task_pid == pid,
+        "cost_limiter": redis_client is None
+        or isinstance(cost_limiter.store, RedisBudgetStore),
+        "db_pools": pool_pid() == pid,
+    }
+    failed = [name for name, ok in state.items() if ok is False]
+    if failed:
+        raise RuntimeError(f"Worker {state['pid']} not set up: {', '.join(failed)}")
+    logger.info(
+        "Worker %d ready: rate limiter, cost limiter and DB pools set up", state["pid"]
+    )
+    return state
@@ -0,0 +1,56 @@
+import logging
+import time
+
+from starlette.concurrency import run_in_threadpool
+
+from backend.api.schemas.tabular_regressor_schemas import (
+    AVAILABLE_MODELS,
+    TrainPredictRequest,
+    sk_model_class,
+)
+from backend.models.name_conventions import INDEX_COL, PRED_SUFFIX
+
+logger = logging.getLogger(__name__)
+
+# Set once warm_up has run; workers forked after a warm-up in the parent inherit it
+warmed_up = False
+
+
+def warm_up() -> float:
+    """
+    Import the estimator classes, pandas and the sklearn metrics deferred at import
+    time, and run a tiny fit/predict of every model so the first request does not
+    pay for them. Returns the seconds spent.
+    """
+    global warmed_up
+    start = time.perf_counter()
+    from sklearn.metrics import mean_squared_error
+
+    rows = [{"index": i, "x": float(i), "t": 2.0 * i} for i in range(8)]
+    for model_type in AVAILABLE_MODELS:
+        sk_model_class(model_type)
+        payload = TrainPredictRequest(
+            model_type=model_type,
+            target_columns=["t"],
+            train_data={"rows": rows},
+            predict_data={"rows": rows[:2]},
+        )
+        train_df = payload.train_data.to_dataframe()
+        model = payload.get_model_instance(n_jobs=1)
+        model.fit(train_df[[INDEX_COL, "x"]], train_df[[INDEX_COL, "t"]])
+        preds = model.predict(train_df[[INDEX_COL, "x"]])
+        mean_squared_error(train_df["t"], preds["t" + PRED_SUFFIX])
+    warmed_up = True
+    return time.perf_counter() - start
+
+
+async def warm_up_in_background():
+    """Run warm_up in the threadpool, logging instead of raising on failure."""
+    if warmed_up:
+        return
+    try:
+        seconds = await run_in_threadpool(warm_up)
+    except Exception:
+        logger.exception("Model warm-up failed")
+        return
+    logger.info("Model warm-up finished in %.2fs", seconds)
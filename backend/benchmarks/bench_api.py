@@ -0,0 +1,149 @@
+"""
+Request-path costs of /tabular_regressor/train_predict: TabularData.to_dataframe,
+_format_predictions and the whole request through the ASGI app (with Redis
+mocked, and rate limiting, cost limiting and the result cache disabled so every
+request fits a model).
+
+Usage: python -m backend.benchmarks.bench_api [--quick] [--output api.json]
+"""
+
+import argparse
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+from backend.benchmarks.common import (
+    measure,
+    print_table,
+    save_results,
+    summarize,
+)
+
+import httpx
+import numpy as np
+import pandas as pd
+
+from backend.api.schemas.tabular_regressor_schemas import TabularData
+from backend.db.dev_init_db import create_user, init_db
+from backend.models.name_conventions import INDEX_COL, PRED_SUFFIX
+
+BENCH_USER = "bench-client"
+BENCH_PASS = "bench-password"
+MODELS = ["LinearRegression", "RandomForestRegressor"]
+GRID = {"rows": [100, 1_000], "columns": [10, 100]}
+QUICK_GRID = {"rows": [100], "columns": [10]}
+
+
+def _rows(n_rows: int, n_columns: int, target: bool = True) -> list[dict]:
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(n_rows, n_columns))
+    rows = []
+    for i in range(n_rows):
+        row = {"index": i, **{f"x{j}": float(v) for j, v in enumerate(values[i])}}
+        if target:
+            row["y"] = float(values[i, 0] * 2)
+        rows.append(row)
+    return rows
+
+
+def _predictions_frame(n_rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {INDEX_COL: np.arange(n_rows), "y" + PRED_SUFFIX: rng.normal(size=n_rows)}
+    )
+
+
+def _payload(model_type: str, n_rows: int, n_columns: int) -> dict:
+    return {
+        "model_type": model_type,
+        "target_columns": ["y"],
+        "feature_columns": [f"x{j}" for j in range(n_columns)],
+        "train_data": {"rows": _rows(n_rows, n_columns)},
+        "predict_data": {"rows": _rows(n_rows, n_columns, target=False)},
+    }
+
+
+def run_conversions(grid: dict, repeat: int) -> list[dict]:
+    from backend.api.routers.tabular_regressor import _format_predictions
+
+    results = []
+    for n_rows in grid["rows"]:
+        for n_columns in grid["columns"]:
+            data = TabularData(rows=_rows(n_rows, n_columns))
+            stats = measure(data.to_dataframe, repeat=repeat)
+            name = f"api/to_dataframe/rows={n_rows}/columns={n_columns}"
+            results.append({"name": name, **stats})
+        preds_df = _predictions_frame(n_rows)
+        stats = measure(lambda: _format_predictions(preds_df), repeat=repeat)
+        results.append({"name": f"api/format_predictions/rows={n_rows}", **stats})
+    return results
+
+
+def run_endpoint(grid: dict, repeat: int) -> list[dict]:
+    with patch("redis.asyncio.from_url", return_value=AsyncMock()):
+        from backend.api.main import app
+        from backend.api.result_cache import result_cache
+        from backend.api.security.cost_limiter import cost_limiter
+        from backend.api.security.limiter import rate_limit_state
+
+        init_db()
+        create_user(BENCH_USER, BENCH_PASS, role="client")
+        with (
+            patch.object(rate_limit_state, "enabled", False),
+            patch.object(cost_limiter, "enabled", False),
+            patch.object(result_cache, "enabled", False),
+        ):
+            return asyncio.run(_run_endpoint(app, grid, repeat))
+
+
+async def _run_endpoint(app, grid: dict, repeat: int) -> list[dict]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        resp = await c.post(
+            "/auth/login",
+            data={"username": BENCH_USER, "password": BENCH_PASS, "scope": "client"},
+        )
+        resp.raise_for_status()
+        headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+        results = []
+        for model_type in MODELS:
+            for n_rows in grid["rows"]:
+                for n_columns in grid["columns"]:
+                    payload = _payload(model_type, n_rows, n_columns)
+                    timings = []
+                    for _ in range(repeat + 1):  # the first request warms up
+                        start = time.perf_counter()
+                        resp = await c.post(
+                            "/tabular_regressor/train_predict",
+                            json=payload,
+                            headers=headers,
+                        )
+                        timings.append(time.perf_counter() - start)
+                        resp.raise_for_status()
+                    name = (
+                        f"api/train_predict/{model_type}"
+                        f"/rows={n_rows}/columns={n_columns}"
+                    )
+                    results.append({"name": name, **summarize(timings[1:])})
+        return results
+
+
+def run(grid: dict, repeat: int) -> list[dict]:
+    return run_conversions(grid, repeat) + run_endpoint(grid, repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--quick", action="store_true", help="Small grid only")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+    results = run(QUICK_GRID if args.quick else GRID, args.repeat)
+    print_table("train_predict request path", results)
+    if args.output:
+        save_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Per-request authentication overhead: the previous get_current_user path (JWT
+decode, scope expansion and a users query on every call) against the cached path
+(verified-token cache and user cache).
+
+Usage: python -m backend.benchmarks.bench_auth [--calls 2000]
+"""
+
+import argparse
+import asyncio
+
+from backend.benchmarks.common import measure, print_table
+
+from fastapi.security import SecurityScopes
+from jose import jwt
+
+from backend.api.config import ALGORITHM, SCOPE_IMPLICATIONS, SECRET_KEY
+from backend.api.security import auth
+from backend.db.dev_init_db import create_user, init_db
+from backend.db.models import User
+from backend.db.session import SessionLocal
+
+BENCH_USER = "bench-user"
+
+
+def legacy_verify(token: str) -> tuple[str, set[str]]:
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    scopes = payload.get("scopes", [])
+    effective_scopes = set(scopes)
+    for s in scopes:
+        effective_scopes.update(SCOPE_IMPLICATIONS.get(s, ()))
+    return payload["sub"], effective_scopes
+
+
+def legacy_current_user(token: str, required: list[str]):
+    username, effective_scopes = legacy_verify(token)
+    assert all(r in effective_scopes for r in required)
+    db = SessionLocal()
+    try:
+        return db.query(User).filter(User.user == username).first()
+    finally:
+        db.close()
+
+
+def run(calls: int) -> list[dict]:
+    init_db()
+    create_user(BENCH_USER, "bench-password", role="admin")
+    token = auth.create_access_token(BENCH_USER, scopes=["admin"])
+    security_scopes = SecurityScopes(scopes=["client"])
+    loop = asyncio.new_event_loop()
+
+    async def cached_current_user():
+        for _ in range(calls):
+            await auth.get_current_user(security_scopes, token)
+
+    cases = {
+        "jwt.decode + scopes (legacy)": lambda: legacy_verify(token),
+        "verify_token (cached)": lambda: auth.verify_token(token),
+        "get_current_user (legacy)": lambda: legacy_current_user(token, ["client"]),
+    }
+    runs = {
+        name: (lambda fn=fn: [fn() for _ in range(calls)]) for name, fn in cases.items()
+    }
+    runs["get_current_user (cached)"] = lambda: loop.run_until_complete(
+        cached_current_user()
+    )
+    results = []
+    for name, fn in runs.items():
+        stats = measure(fn, repeat=3)
+        results.append({"case": name, "us_per_call": stats["median_s"] / calls * 1e6})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=2_000)
+    args = parser.parse_args()
+    print_table("Authentication overhead per request", run(args.calls))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Latency and throughput of many small concurrent predictions against one fitted
+model, with and without the PredictBatcher micro-batching layer.
+
+Usage: python -m backend.benchmarks.bench_batching [--concurrency 64] [--windows 0 2]
+"""
+
+import argparse
+import asyncio
+import time
+
+from backend.benchmarks.common import percentile, print_table
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+
+from backend.api.batching import PredictBatcher
+from backend.models import MultiTargetRegressor, SKLearnRegressor
+from backend.models.name_conventions import INDEX_COL
+
+N_FEATURES = 20
+MODELS = {
+    "LinearRegression": LinearRegression,
+    "RandomForestRegressor": RandomForestRegressor,
+}
+
+
+def _fitted_model(model_cls) -> MultiTargetRegressor:
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(1_000, N_FEATURES))).add_prefix("x")
+    X.insert(0, INDEX_COL, np.arange(len(X)))
+    y = pd.DataFrame({INDEX_COL: X[INDEX_COL], "y": X["x0"] * 2 + X["x1"]})
+    model = MultiTargetRegressor(base_model=SKLearnRegressor(base_model=model_cls()))
+    model.fit(X, y)
+    return model
+
+
+def _request_frames(n_requests: int, rows: int) -> list[pd.DataFrame]:
+    rng = np.random.default_rng(1)
+    frames = []
+    for _ in range(n_requests):
+        X = pd.DataFrame(rng.normal(size=(rows, N_FEATURES))).add_prefix("x")
+        X.insert(0, INDEX_COL, np.arange(rows))
+        frames.append(X)
+    return frames
+
+
+async def _drive(batcher, model, frames, concurrency: int) -> tuple[list[float], float]:
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(X):
+        async with semaphore:
+            start = time.perf_counter()
+            await batcher.predict(model, X)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(X) for X in frames))
+    return latencies, time.perf_counter() - start
+
+
+def run(windows: list[float], concurrency: int, n_requests: int, rows: int):
+    results = []
+    frames = _request_frames(n_requests, rows)
+    for name, model_cls in MODELS.items():
+        model = _fitted_model(model_cls)
+        for window_ms in windows:
+            batcher = PredictBatcher(window_ms=window_ms, max_rows=1_000)
+            latencies, elapsed = asyncio.run(
+                _drive(batcher, model, frames, concurrency)
+            )
+            results.append(
+                {
+                    "model": name,
+                    "window_ms": window_ms,
+                    "p50_ms": percentile(latencies, 50) * 1000,
+                    "p99_ms": percentile(latencies, 99) * 1000,
+                    "req_per_s": n_requests / elapsed,
+                }
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--windows", type=float, nargs="+", default=[0, 2])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--rows", type=int, default=1)
+    args = parser.parse_args()
+    results = run(args.windows, args.concurrency, args.requests, args.rows)
+    print_table("Concurrent predictions (micro-batching)", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Import time of backend.api.main measured with `python -X importtime` in fresh
+interpreters. Prints the heaviest imports and exits with 1 when the median exceeds
+--budget-ms or when a module that should load lazily (--deny) was imported.
+
+Usage: python -m backend.benchmarks.bench_import_time [--budget-ms 1500]
+    [--deny sklearn pandas scipy] [--runs 5] [--top 15]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+from backend.benchmarks.common import print_table
+
+MODULE = "backend.api.main"
+DEFAULT_DENY = ["sklearn", "scipy", "pandas", "joblib"]
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Cumulative import time in microseconds of every module imported by module."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def top_level(times: dict[str, int], module: str, top: int) -> list[dict]:
+    """The heaviest top-level packages imported along with module."""
+    packages = {}
+    for name, us in times.items():
+        package = name.split(".")[0]
+        if name == package and name != module.split(".")[0]:
+            packages[package] = max(packages.get(package, 0), us)
+    ranked = sorted(packages.items(), key=lambda item: -item[1])[:top]
+    return [{"package": p, "cumulative_ms": us / 1000} for p, us in ranked]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default=MODULE)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, help="Fail above this median")
+    parser.add_argument("--deny", nargs="*", default=DEFAULT_DENY)
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(args.runs)]
+    totals = [times[args.module] / 1000 for times in runs]
+    median_ms = statistics.median(totals)
+    print_table(
+        f"Heaviest imports of {args.module}", top_level(runs[-1], args.module, args.top)
+    )
+    print(f"\n{args.module}: median {median_ms:.1f} ms over {args.runs} runs")
+
+    failures = []
+    denied = sorted(m for m in args.deny if m in runs[-1])
+    if denied:
+        failures.append(f"imported at startup: {', '.join(denied)}")
+    if args.budget_ms is not None and median_ms > args.budget_ms:
+        failures.append(f"median {median_ms:.1f} ms above budget {args.budget_ms} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Fit, predict, save and load times of SKLearnRegressor (single target) and
+MultiTargetRegressor (several targets) for every JOBLIB_MODELS entry over a grid
+of rows x feature columns x targets.
+
+Usage: python -m backend.benchmarks.bench_models [--quick] [--output models.json]
+"""
+
+import argparse
+import itertools
+import tempfile
+
+from backend.benchmarks.common import measure, print_table, save_results
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import Lasso, LinearRegression, Ridge
+
+from backend.models import MultiTargetRegressor, SKLearnRegressor, load_model
+from backend.models.name_conventions import INDEX_COL
+from backend.models.tabular_regressor import JOBLIB_MODELS
+
+SK_MODELS = {
+    "LinearRegression": LinearRegression,
+    "Ridge": Ridge,
+    "Lasso": Lasso,
+    "RandomForestRegressor": RandomForestRegressor,
+}
+GRID = {"rows": [100, 1_000], "columns": [10, 100], "targets": [1, 3]}
+QUICK_GRID = {"rows": [100], "columns": [10], "targets": [1, 2]}
+
+
+def _dataset(rows: int, columns: int, targets: int):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(rows, columns))).add_prefix("x")
+    X.insert(0, INDEX_COL, np.arange(rows))
+    y = pd.DataFrame({INDEX_COL: X[INDEX_COL]})
+    for t in range(targets):
+        y[f"y{t}"] = X["x0"] * (t + 1) + rng.normal(scale=0.1, size=rows)
+    return X, y
+
+
+def _model(name: str, targets: int):
+    base = SKLearnRegressor(base_model=SK_MODELS[name]())
+    return MultiTargetRegressor(base_model=base) if targets > 1 else base
+
+
+def run(grid: dict, repeat: int) -> list[dict]:
+    results = []
+    for name in JOBLIB_MODELS:
+        for rows, columns, targets in itertools.product(*grid.values()):
+            X, y = _dataset(rows, columns, targets)
+            case = f"models/{name}/rows={rows}/columns={columns}/targets={targets}"
+            fitted = _model(name, targets)
+            fitted.fit(X, y)
+            with tempfile.TemporaryDirectory() as tmp:
+                path = f"{tmp}/model"
+                ops = {
+                    "fit": lambda: _model(name, targets).fit(X, y),
+                    "predict": lambda: fitted.predict(X),
+                    "save": lambda: fitted.save(path),
+                    "load": lambda: load_model(path),
+                }
+                for op, fn in ops.items():
+                    stats = measure(fn, repeat=repeat)
+                    results.append({"name": f"{case}/{op}", **stats})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--quick", action="store_true", help="Small grid only")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+    results = run(QUICK_GRID if args.quick else GRID, args.repeat)
+    print_table("Model fit/predict/save/load", results)
+    if args.output:
+        save_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Requests per second on /health with the previous security headers middleware
+(@app.middleware("http"), i.e. BaseHTTPMiddleware setting headers one by one)
+against the pure ASGI SecurityHeadersMiddleware appending a precomputed block.
+
+Both apps serve the real /health handler with no other middleware, and the
+requests go through httpx.ASGITransport so no network is involved.
+
+Usage: python -m backend.benchmarks.bench_security_headers [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import time
+
+from backend.benchmarks.common import print_table
+
+import httpx
+from fastapi import FastAPI, Request, Response
+
+from backend.api.main import welcome_root
+from backend.api.middleware.security_headers import SecurityHeadersMiddleware
+from backend.api.schemas.main_schemas import WelcomeResponse
+from backend.api.security.config import DEFAULT_CSP, SECURITY_HEADERS
+
+
+def legacy_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def add_security_headers(request: Request, call_next):
+        response: Response = await call_next(request)
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        response.headers["Strict-Transport-Security"] = (
+            "max-age=63072000; includeSubDomains; preload"
+        )
+        if "Content-Security-Policy" not in response.headers:
+            response.headers["Content-Security-Policy"] = DEFAULT_CSP
+        return response
+
+    app.get("/health", response_model=WelcomeResponse)(welcome_root)
+    return app
+
+
+def asgi_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(SecurityHeadersMiddleware, headers=SECURITY_HEADERS)
+    app.get("/health", response_model=WelcomeResponse)(welcome_root)
+    return app
+
+
+async def requests_per_second(app: FastAPI, n_requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        for _ in range(50):  # warm-up
+            await c.get("/health")
+        start = time.perf_counter()
+        for _ in range(n_requests):
+            resp = await c.get("/health")
+        elapsed = time.perf_counter() - start
+    assert resp.headers["X-Frame-Options"] == "DENY"
+    return n_requests / elapsed
+
+
+def run(n_requests: int, repeat: int = 3) -> list[dict]:
+    results = []
+    for name, factory in [
+        ("BaseHTTPMiddleware (legacy)", legacy_app),
+        ("pure ASGI", asgi_app),
+    ]:
+        app = factory()
+        samples = [
+            asyncio.run(requests_per_second(app, n_requests)) for _ in range(repeat)
+        ]
+        results.append({"middleware": name, "requests_per_s": max(samples)})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2_000)
+    args = parser.parse_args()
+    print_table("Security headers middleware on /health", run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Compare the legacy TrainPredictResponse serialization (iterrows + Pydantic models +
+JSONResponse) with the NumPy/orjson path used by /tabular_regressor/train_predict.
+
+Usage: python -m backend.benchmarks.bench_serialization [--rows 1000 10000 100000]
+"""
+
+import argparse
+
+from backend.benchmarks.common import measure, print_table
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from backend.api.routers.tabular_regressor import _format_predictions
+from backend.api.schemas.tabular_regressor_schemas import (
+    TrainPredictMetrics,
+    TrainPredictResponse,
+)
+from backend.models.name_conventions import INDEX_COL, PRED_SUFFIX
+
+TARGETS = ["y1", "y2"]
+METRICS = {"mse": {"y1": 0.1, "y2": 0.2}, "mae": {"y1": 0.1, "y2": 0.2}}
+
+
+def _predictions_frame(n_rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    data = {INDEX_COL: np.arange(n_rows)}
+    for t in TARGETS:
+        data[t + PRED_SUFFIX] = rng.normal(size=n_rows)
+    return pd.DataFrame(data)
+
+
+def _legacy_format_predictions(preds_df):
+    predictions = []
+    for _, row in preds_df.iterrows():
+        idx = row[INDEX_COL]
+        values = {c: float(row[c]) for c in preds_df.columns if c != INDEX_COL}
+        predictions.append({"index": idx, "values": values})
+    return predictions
+
+
+def legacy_path(preds_df: pd.DataFrame) -> bytes:
+    response = TrainPredictResponse(
+        model_type="LinearRegression",
+        model_version="bench",
+        api_version="bench",
+        targets=TARGETS,
+        metrics=TrainPredictMetrics(baseline_mse=METRICS["mse"], **METRICS),
+        predictions=_legacy_format_predictions(preds_df),
+    )
+    return JSONResponse(jsonable_encoder(response)).body
+
+
+def fast_path(preds_df: pd.DataFrame) -> bytes:
+    metrics = TrainPredictMetrics(baseline_mse=METRICS["mse"], **METRICS)
+    content = {
+        "model_type": "LinearRegression",
+        "model_version": "bench",
+        "api_version": "bench",
+        "targets": TARGETS,
+        "metrics": metrics.model_dump(),
+        "predictions": _format_predictions(preds_df),
+    }
+    return ORJSONResponse(content).body
+
+
+def run(row_counts: list[int], repeat: int) -> list[dict]:
+    results = []
+    for n_rows in row_counts:
+        preds_df = _predictions_frame(n_rows)
+        legacy = measure(lambda: legacy_path(preds_df), repeat=repeat)
+        fast = measure(lambda: fast_path(preds_df), repeat=repeat)
+        results.append(
+            {
+                "rows": n_rows,
+                "legacy_median_s": legacy["median_s"],
+                "fast_median_s": fast["median_s"],
+                "speedup": legacy["median_s"] / fast["median_s"],
+            }
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print_table("Prediction serialization", run(args.rows, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from typing import Callable
+
+# Benchmarks import backend code that reads its settings at import time
+os.environ.setdefault(
+    "USERS_DB_URL",
+    f"sqlite:///{os.path.join(tempfile.gettempdir(), 'webpredictor_bench.db')}",
+)
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("API_HOST_SECRET_KEY", "bench-secret-key")
+os.environ.setdefault("IP_KEY_SALT", "bench-salt")
+
+
+def measure(fn: Callable[[], object], repeat: int = 5, warmup: int = 1) -> dict:
+    """Run fn several times and return wall time statistics in seconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def summarize(samples: list[float]) -> dict:
+    """Wall time statistics in seconds of a list of samples."""
+    return {
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "mean_s": statistics.fmean(samples),
+        "max_s": max(samples),
+        "repeat": len(samples),
+    }
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in [0, 100]) of a list of samples."""
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def print_table(title: str, rows: list[dict]):
+    """Print benchmark rows as an aligned plain text table."""
+    print(f"\n{title}")
+    if not rows:
+        return
+    columns = list(rows[0].keys())
+    cells = [[_fmt(r.get(c)) for c in columns] for r in rows]
+    widths = [
+        max(len(c), *(len(row[i]) for row in cells)) for i, c in enumerate(columns)
+    ]
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    for row in cells:
+        print("  ".join(v.ljust(w) for v, w in zip(row, widths)))
+
+
+def _fmt(value) -> str:
+    if isinstance(value, float):
+        return f"{value:.6f}"
+    return str(value)
+
+
+def save_results(path: str, results: list[dict]):
+    """Write benchmark results as JSON together with the environment they ran in."""
+    document = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": _environment(),
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
+
+
+def load_results(path: str) -> dict[str, dict]:
+    """Read a results file written by save_results, keyed by benchmark name."""
+    with open(path) as f:
+        document = json.load(f)
+    return {r["name"]: r for r in document["results"]}
+
+
+def _environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": commit,
+    }
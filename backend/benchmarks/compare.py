@@ -0,0 +1,61 @@
+"""
+Compare two result files written by run_suite and fail on regressions: a
+benchmark regresses when its median time grows by more than the threshold.
+
+Usage: python -m backend.benchmarks.compare baseline.json current.json [--threshold 0.10]
+"""
+
+import argparse
+import sys
+
+from backend.benchmarks.common import load_results, print_table
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[dict]:
+    rows = []
+    for name in sorted(baseline.keys() | current.keys()):
+        before, after = baseline.get(name), current.get(name)
+        row = {"name": name, "baseline_s": None, "current_s": None, "ratio": None}
+        if before is None or after is None:
+            row["status"] = "added" if before is None else "removed"
+            rows.append(row)
+            continue
+        ratio = after["median_s"] / before["median_s"]
+        status = "ok"
+        if ratio > 1 + threshold:
+            status = "REGRESSION"
+        elif ratio < 1 - threshold:
+            status = "improved"
+        row.update(
+            baseline_s=before["median_s"],
+            current_s=after["median_s"],
+            ratio=ratio,
+            status=status,
+        )
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Allowed relative slowdown of the median (default 0.10)",
+    )
+    args = parser.parse_args()
+    rows = compare(
+        load_results(args.baseline), load_results(args.current), args.threshold
+    )
+    print_table(f"Median time, threshold {args.threshold:.0%}", rows)
+    regressions = [r["name"] for r in rows if r["status"] == "REGRESSION"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Closed-loop load generator for /tabular_regressor/train_predict. Runs the ASGI app
+in-process (with its lifespan and a local Redis stand-in) or targets a running
+server with --url, logs in through /auth/login and reports throughput, latency
+percentiles and error/429 rates per model.
+
+Usage: python -m backend.benchmarks.loadgen [--concurrency 16] [--duration 30]
+    [--mix LinearRegression=3,RandomForestRegressor=1] [--shapes 100x10 1000x50]
+    [--url http://127.0.0.1:8000 --username USER --password PASS]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import random
+import time
+from collections import Counter
+from unittest.mock import patch
+
+from backend.benchmarks.common import percentile, print_table, save_results
+from backend.benchmarks.local_redis import LocalRedis
+
+import httpx
+import numpy as np
+import orjson
+
+LOADGEN_USER = "loadgen-client"
+LOADGEN_PASS = "loadgen-password"
+TRAIN_PREDICT = "/tabular_regressor/train_predict"
+
+
+def _parse_mix(spec: str) -> dict[str, float]:
+    mix = {}
+    for item in spec.split(","):
+        model_type, _, weight = item.partition("=")
+        mix[model_type.strip()] = float(weight or 1)
+    return mix
+
+
+def _parse_shape(spec: str) -> tuple[int, int]:
+    rows, _, columns = spec.lower().partition("x")
+    return int(rows), int(columns)
+
+
+def _data(rng, n_rows: int, n_columns: int, n_targets: int) -> tuple[list, list]:
+    values = rng.normal(size=(n_rows, n_columns))
+    targets = values[:, :n_targets] * 2 + rng.normal(scale=0.1, size=(n_rows, 1))
+    train, predict = [], []
+    for i in range(n_rows):
+        features = {f"x{j}": float(v) for j, v in enumerate(values[i])}
+        predict.append({"index": i, **features})
+        train.append(
+            {
+                "index": i,
+                **features,
+                **{f"y{t}": float(targets[i, t]) for t in range(n_targets)},
+            }
+        )
+    return train, predict
+
+
+def build_bodies(
+    mix: dict[str, float],
+    shapes: list[tuple[int, int]],
+    n_targets: int,
+    variants: int,
+) -> dict[str, list[bytes]]:
+    """Pre-encoded request bodies by model type, `variants` datasets per shape."""
+    rng = np.random.default_rng(0)
+    datasets = [
+        (n_columns, *_data(rng, n_rows, n_columns, n_targets))
+        for n_rows, n_columns in shapes
+        for _ in range(variants)
+    ]
+    bodies = {}
+    for model_type in mix:
+        bodies[model_type] = [
+            orjson.dumps(
+                {
+                    "model_type": model_type,
+                    "target_columns": [f"y{t}" for t in range(n_targets)],
+                    "feature_columns": [f"x{j}" for j in range(n_columns)],
+                    "train_data": {"rows": train},
+                    "predict_data": {"rows": predict},
+                }
+            )
+            for n_columns, train, predict in datasets
+        ]
+    return bodies
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str) -> str:
+    resp = await client.post(
+        "/auth/login",
+        data={"username": username, "password": password, "scope": "client"},
+    )
+    resp.raise_for_status()
+    return resp.json()["access_token"]
+
+
+async def _worker(
+    worker: int,
+    client: httpx.AsyncClient,
+    token: str,
+    bodies: dict[str, list[bytes]],
+    mix: dict[str, float],
+    deadline: float,
+    budget: list[int],
+    distinct_ips: bool,
+    samples: list[tuple[str, int, float, float]],
+):
+    rng = random.Random(worker)
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+    if distinct_ips:
+        # The rate limiter keys on the client IP; spread workers over addresses
+        headers["X-Forwarded-For"] = (
+            f"10.{worker // 65536 % 256}.{worker // 256 % 256}.{worker % 256}"
+        )
+    model_types, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline and budget[0] != 0:
+        budget[0] -= 1
+        model_type = rng.choices(model_types, weights)[0]
+        body = rng.choice(bodies[model_type])
+        start = time.perf_counter()
+        try:
+            resp = await client.post(TRAIN_PREDICT, content=body, headers=headers)
+            status = resp.status_code
+        except httpx.HTTPError:
+            status = 0
+        samples.append((model_type, status, start, time.perf_counter() - start))
+
+
+async def _drive(client: httpx.AsyncClient, token: str, bodies, args) -> tuple:
+    mix = _parse_mix(args.mix)
+    samples: list[tuple[str, int, float, float]] = []
+    budget = [args.requests or -1]  # remaining requests, -1 for unlimited
+    start = time.perf_counter()
+    deadline = start + args.warmup + args.duration
+    await asyncio.gather(
+        *(
+            _worker(
+                i,
+                client,
+                token,
+                bodies,
+                mix,
+                deadline,
+                budget,
+                args.distinct_ips,
+                samples,
+            )
+            for i in range(args.concurrency)
+        )
+    )
+    measured_from = start + args.warmup
+    elapsed = time.perf_counter() - measured_from
+    return [s for s in samples if s[2] >= measured_from], elapsed
+
+
+async def run_in_process(args, bodies) -> tuple:
+    from backend.db.dev_init_db import create_user, init_db
+
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(patch("redis.asyncio.from_url", return_value=LocalRedis()))
+        from backend.api.main import app
+        from backend.api.security.cost_limiter import cost_limiter
+        from backend.api.security.limiter import rate_limit_state
+
+        # The per-IP rate limit (10 requests a minute) would turn nearly every
+        # request of a single in-process client into a 429
+        if not args.rate_limit:
+            stack.enter_context(patch.object(rate_limit_state, "enabled", False))
+        if args.no_cost_limit:
+            stack.enter_context(patch.object(cost_limiter, "enabled", False))
+        init_db()
+        create_user(LOADGEN_USER, LOADGEN_PASS, role="client")
+        transport = httpx.ASGITransport(app=app)
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://loadgen", timeout=None
+            ) as client:
+                token = await login(client, LOADGEN_USER, LOADGEN_PASS)
+                return await _drive(client, token, bodies, args)
+
+
+async def run_remote(args, bodies) -> tuple:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.url, timeout=args.timeout, limits=limits
+    ) as client:
+        token = await login(client, args.username, args.password)
+        return await _drive(client, token, bodies, args)
+
+
+def report(samples: list[tuple[str, int, float, float]], elapsed: float) -> list[dict]:
+    rows = []
+    groups = {"all": samples}
+    for model_type in sorted({s[0] for s in samples}):
+        groups[model_type] = [s for s in samples if s[0] == model_type]
+    for name, group in groups.items():
+        if not group:
+            continue
+        ok = [s[3] for s in group if 200 <= s[1] < 300]
+        limited = sum(1 for s in group if s[1] == 429)
+        errors = len(group) - len(ok) - limited
+        rows.append(
+            {
+                "name": f"loadgen/{name}",
+                "requests": len(group),
+                "ok_per_s": len(ok) / elapsed,
+                "p50_ms": percentile(ok, 50) * 1000 if ok else None,
+                "p90_ms": percentile(ok, 90) * 1000 if ok else None,
+                "p99_ms": percentile(ok, 99) * 1000 if ok else None,
+                "max_ms": max(ok) * 1000 if ok else None,
+                "rate_429": limited / len(group),
+                "error_rate": errors / len(group),
+            }
+        )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30, help="Seconds measured")
+    parser.add_argument("--warmup", type=float, default=2, help="Seconds discarded")
+    parser.add_argument("--requests", type=int, default=0, help="Stop after N")
+    parser.add_argument("--mix", default="LinearRegression=3,RandomForestRegressor=1")
+    parser.add_argument("--shapes", nargs="+", default=["100x10"], help="ROWSxCOLS")
+    parser.add_argument("--targets", type=int, default=1)
+    parser.add_argument(
+        "--variants",
+        type=int,
+        default=8,
+        help="Datasets per shape; repeats may be served by the result cache",
+    )
+    parser.add_argument(
+        "--distinct-ips",
+        action="store_true",
+        help="Send each worker from its own X-Forwarded-For address",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        action="store_true",
+        help="In-process only: keep the per-IP rate limit, disabled by default",
+    )
+    parser.add_argument("--no-cost-limit", action="store_true", help="In-process only")
+    parser.add_argument("--url", help="Target a running server instead of the app")
+    parser.add_argument("--username")
+    parser.add_argument("--password")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+    if args.url and not (args.username and args.password):
+        parser.error("--url requires --username and --password")
+
+    bodies = build_bodies(
+        _parse_mix(args.mix),
+        [_parse_shape(s) for s in args.shapes],
+        args.targets,
+        args.variants,
+    )
+    run = run_remote if args.url else run_in_process
+    samples, elapsed = asyncio.run(run(args, bodies))
+    results = report(samples, elapsed)
+    print_table(
+        f"train_predict load, concurrency {args.concurrency}, {elapsed:.1f}s", results
+    )
+    statuses = Counter(s[1] for s in samples)
+    print("\nstatus codes:", dict(sorted(statuses.items())))
+    limited = statuses[429] / len(samples) if samples else 0.0
+    print(f"429 share: {limited:.1%}")
+    if limited > 0.05:
+        print(
+            "WARNING: many requests were rate limited, so throughput and latency "
+            "measure the limiters; use --distinct-ips against a server, or drop "
+            "--rate-limit / add --no-cost-limit in-process"
+        )
+    if args.output:
+        save_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+In-memory stand-in for the redis.asyncio client, covering the calls the API makes
+(rate limit counters, the cost limiter script, user cache pub/sub), so the app can
+run with its lifespan and Redis-backed limiters but without a Redis server.
+"""
+
+import asyncio
+
+from backend.api.security.cost_limiter import InMemoryBudgetStore
+
+
+class LocalRedis:
+    def __init__(self):
+        self.counters: dict[str, int] = {}
+        self._budgets = InMemoryBudgetStore()
+
+    def pipeline(self, transaction: bool = True) -> "_Pipeline":
+        return _Pipeline(self)
+
+    def register_script(self, script: str):
+        # The only script the API registers is the cost limiter's charge script
+        async def charge(keys: list[str], args: list[float]) -> str:
+            capacity, rate, cost = args
+            return str(await self._budgets.charge(keys[0], cost, capacity, rate))
+
+        return charge
+
+    def pubsub(self) -> "_PubSub":
+        return _PubSub()
+
+    async def publish(self, channel: str, message: str) -> int:
+        return 0
+
+    async def aclose(self):
+        pass
+
+
+class _Pipeline:
+    def __init__(self, redis: LocalRedis):
+        self._redis = redis
+        self._commands: list[tuple[str, int]] = []
+
+    def incrby(self, key: str, amount: int):
+        self._commands.append((key, amount))
+
+    def expire(self, key: str, seconds: int):
+        self._commands.append((key, None))
+
+    async def execute(self) -> list:
+        results = []
+        for key, amount in self._commands:
+            if amount is None:
+                results.append(True)
+                continue
+            self._redis.counters[key] = self._redis.counters.get(key, 0) + amount
+            results.append(self._redis.counters[key])
+        self._commands.clear()
+        return results
+
+
+class _PubSub:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def subscribe(self, *channels: str):
+        pass
+
+    async def listen(self):
+        await asyncio.Event().wait()  # nothing is ever published
+        yield
@@ -0,0 +1,31 @@
+"""
+Run the model and API benchmarks and write all results to one JSON file, to be
+compared against a baseline with backend.benchmarks.compare.
+
+Usage: python -m backend.benchmarks.run_suite [--quick] [--output results.json]
+"""
+
+import argparse
+
+from backend.benchmarks import bench_api, bench_models
+from backend.benchmarks.common import print_table, save_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--quick", action="store_true", help="Small grids only")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="benchmark_results.json")
+    args = parser.parse_args()
+
+    models_grid = bench_models.QUICK_GRID if args.quick else bench_models.GRID
+    api_grid = bench_api.QUICK_GRID if args.quick else bench_api.GRID
+    results = bench_models.run(models_grid, args.repeat)
+    results += bench_api.run(api_grid, args.repeat)
+    print_table("Benchmark suite", results)
+    save_results(args.output, results)
+    print(f"\nWrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
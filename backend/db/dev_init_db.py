@@ -1,12 +1,9 @@
 import os
 
-from passlib.context import CryptContext
-
+from backend.api.security.passwords import password_hasher
 from backend.db.models import User
 from backend.db.session import Base, SessionLocal, engine
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 def init_db():
     """Create all tables. Idempotent."""
@@ -22,7 +19,7 @@ def create_user(user: str, password: str, role: str = "user"):
             return None
 
         # Create new user
-        new_user = User(user=user, password=pwd_context.hash(password), role=role)
+        new_user = User(user=user, password=password_hasher.hash(password), role=role)
         db.add(new_user)
         db.commit()  # Save to DB
         db.refresh(new_user)  # Refresh database object
@@ -0,0 +1,19 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+# --- Users database connection pools ---
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "webpredictor_db_pool_checkout_seconds",
+    "Time spent waiting to check a connection out of the pool, by pool",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "webpredictor_db_pool_checked_out",
+    "Connections currently checked out of the pool, by pool",
+    ["pool"],
+)
+DB_POOL_TIMEOUTS = Counter(
+    "webpredictor_db_pool_timeouts_total",
+    "Checkouts that timed out waiting for a free connection, by pool",
+    ["pool"],
+)
@@ -0,0 +1,65 @@
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from backend.db.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_SECONDS,
+    DB_POOL_TIMEOUTS,
+)
+
+
+class _TimedPoolMixin:
+    """Records how long checkouts wait for a connection, labelled by logging name."""
+
+    def connect(self):
+        name = self._orig_logging_name or "default"
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            DB_POOL_TIMEOUTS.labels(name).inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.labels(name).observe(time.perf_counter() - start)
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def track_pool_usage(engine: Engine, name: str):
+    """Keep the checked-out connections gauge of the engine's pool up to date."""
+    gauge = DB_POOL_CHECKED_OUT.labels(name)
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        gauge.inc()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        gauge.dec()
+
+
+def enable_sqlite_wal(engine: Engine):
+    """
+    Use WAL journaling so readers do not block on the writer, with
+    synchronous=NORMAL (durable across crashes of the app, not of the OS) and a
+    busy timeout instead of immediate "database is locked" errors.
+    """
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA busy_timeout=5000")
+        finally:
+            cursor.close()
@@ -1,26 +1,92 @@
 import os
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
+from backend.db.pool import (
+    TimedAsyncAdaptedQueuePool,
+    TimedQueuePool,
+    enable_sqlite_wal,
+    track_pool_usage,
+)
+
 # File-based SQLite for local dev
 USERS_DB_URL = os.getenv("USERS_DB_URL")
 
-if "sqlite://" in USERS_DB_URL:
+# Connection pool settings; each engine (sync and async) has its own pool
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+SQLITE_WAL = os.getenv("SQLITE_WAL", "1") == "1"
+
+
+def _pool_kwargs() -> dict:
+    return dict(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+    )
+
+
+def _sqlite_engines(url: str):
     print("INFO: Using SQLite database for users.")
-    engine = create_engine(
-        USERS_DB_URL,
+    in_memory = ":memory:" in url or url.rstrip("/").endswith("sqlite:")
+    sync_kwargs, async_kwargs = {}, {}
+    if not in_memory:
+        # In-memory databases keep SQLAlchemy's single-connection pools
+        sync_kwargs = dict(poolclass=TimedQueuePool, **_pool_kwargs())
+        async_kwargs = dict(poolclass=TimedAsyncAdaptedQueuePool, **_pool_kwargs())
+    sync_engine = create_engine(
+        url,
         connect_args={
             "check_same_thread": False
         },  # Needed for SQLite with multithreaded ASGI
+        pool_logging_name="users_sync",
+        **sync_kwargs,
     )
-elif "postgres" in USERS_DB_URL:
+    async_url = url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    async_engine = create_async_engine(
+        async_url, pool_logging_name="users_async", **async_kwargs
+    )
+    if SQLITE_WAL and not in_memory:
+        enable_sqlite_wal(sync_engine)
+        enable_sqlite_wal(async_engine.sync_engine)
+    return url, sync_engine, async_engine
+
+
+def _postgres_engines(url: str):
     print("INFO: Using PostgreSQL database for users.")
-    if USERS_DB_URL and USERS_DB_URL.startswith("postgresql://"):
-        USERS_DB_URL = USERS_DB_URL.replace("postgresql://", "postgresql+psycopg://", 1)
-    engine = create_engine(USERS_DB_URL, pool_pre_ping=True)
+    if url.startswith("postgresql://"):
+        url = url.replace("postgresql://", "postgresql+psycopg://", 1)
+    kwargs = dict(pool_pre_ping=True, pool_recycle=DB_POOL_RECYCLE, **_pool_kwargs())
+    sync_engine = create_engine(
+        url, poolclass=TimedQueuePool, pool_logging_name="users_sync", **kwargs
+    )
+    # psycopg 3 provides the async driver under the same dialect name
+    async_engine = create_async_engine(
+        url,
+        poolclass=TimedAsyncAdaptedQueuePool,
+        pool_logging_name="users_async",
+        **kwargs,
+    )
+    return url, sync_engine, async_engine
+
+
+if "sqlite://" in USERS_DB_URL:
+    USERS_DB_URL, engine, async_engine = _sqlite_engines(USERS_DB_URL)
+elif "postgres" in USERS_DB_URL:
+    USERS_DB_URL, engine, async_engine = _postgres_engines(USERS_DB_URL)
+
+track_pool_usage(engine, "users_sync")
+track_pool_usage(async_engine.sync_engine, "users_async")
+_pool_pid = os.getpid()
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
 
 
 class Base(DeclarativeBase):
@@ -36,3 +102,33 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """FastAPI dependency that provides an async DB session per request."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def pool_status() -> dict:
+    return {"sync": engine.pool.status(), "async": async_engine.pool.status()}
+
+
+def dispose_inherited_pools() -> bool:
+    """
+    Give a forked worker (gunicorn with preload_app) fresh connection pools,
+    leaving the parent's connections open for the parent. No-op in the process
+    that created the engines; returns whether the pools were replaced.
+    """
+    global _pool_pid
+    if _pool_pid == os.getpid():
+        return False
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+    _pool_pid = os.getpid()
+    return True
+
+
+def pool_pid() -> int:
+    """Pid of the process that created the current connection pools."""
+    return _pool_pid
@@ -0,0 +1,73 @@
+"""
+Gunicorn settings for the production serving mode (see start.sh):
+
+    gunicorn -c backend/gunicorn.conf.py backend.api.main:app
+
+The master imports the app and warms the models up before forking WEB_CONCURRENCY
+Uvicorn workers, so imported modules and warm-up state are shared copy-on-write.
+Workers are recycled after GUNICORN_MAX_REQUESTS requests (plus jitter) and get
+GUNICORN_GRACEFUL_TIMEOUT seconds to finish in-flight requests. With several
+workers, Prometheus metrics are aggregated through PROMETHEUS_MULTIPROC_DIR and
+METRICS_PORT is served by the master.
+"""
+
+import gc
+import glob
+import os
+import tempfile
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+# Worker heartbeat timeout; fits run in threads, so the event loop keeps beating
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+accesslog = "-"
+
+# Both must be set before the app (and prometheus_client) is imported by preload
+_metrics_port = int(os.getenv("METRICS_PORT", "0"))
+if workers > 1:
+    if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus_")
+    # Values left by a previous run would be aggregated with the new workers'
+    for path in glob.glob(os.path.join(os.environ["PROMETHEUS_MULTIPROC_DIR"], "*.db")):
+        os.remove(path)
+    # Workers would all bind the same port; the master serves it instead
+    os.environ["METRICS_PORT"] = "0"
+
+
+def when_ready(server):
+    """Runs in the master after preloading the app, before the workers fork."""
+    from backend.api.config import METRICS_ADDR, WARMUP_ENABLED
+    from backend.api.cpu_budget import limit_native_threads
+    from backend.api.warmup import warm_up
+
+    # Inherited by the workers; the warm-up fits already respect the cap
+    limit_native_threads()
+    if WARMUP_ENABLED:
+        server.log.info("Models warmed up in %.2fs", warm_up())
+    if workers > 1 and _metrics_port:
+        from prometheus_client import start_http_server
+
+        from backend.api.routers.monitoring import metrics_registry
+
+        start_http_server(_metrics_port, addr=METRICS_ADDR, registry=metrics_registry())
+    # Keep the garbage collector from touching (and copying) objects shared with workers
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    from backend.db.session import dispose_inherited_pools
+
+    dispose_inherited_pools()
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
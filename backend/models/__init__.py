@@ -1,5 +1,22 @@
-from backend.models.load_model import load_model
-from backend.models.tabular_regressor import MultiTargetRegressor, SKLearnRegressor
+import importlib
+
 from backend.models.version import __version__
 
 __all__ = ["load_model", "MultiTargetRegressor", "SKLearnRegressor", "__version__"]
+
+# Submodules are imported on first attribute access, so importing backend.models
+# (or a light submodule such as hooks) does not load pandas and sklearn
+_LAZY_ATTRIBUTES = {
+    "load_model": "backend.models.load_model",
+    "MultiTargetRegressor": "backend.models.tabular_regressor",
+    "SKLearnRegressor": "backend.models.tabular_regressor",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
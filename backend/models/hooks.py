@@ -0,0 +1,34 @@
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable, Iterator
+
+# Called as hook(stage, model_name, seconds) after each timed stage
+TimingHook = Callable[[str, str, float], None]
+
+_timing_hooks: list[TimingHook] = []
+
+
+def register_timing_hook(hook: TimingHook):
+    """Register a callable receiving the duration of model stages (fit, predict)."""
+    if hook not in _timing_hooks:
+        _timing_hooks.append(hook)
+
+
+def unregister_timing_hook(hook: TimingHook):
+    if hook in _timing_hooks:
+        _timing_hooks.remove(hook)
+
+
+@contextmanager
+def timed(stage: str, model_name: str) -> Iterator[None]:
+    """Time the block and report it to the registered hooks (no-op without hooks)."""
+    if not _timing_hooks:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = perf_counter() - start
+        for hook in _timing_hooks:
+            hook(stage, model_name, elapsed)
@@ -9,6 +9,7 @@ import numpy as np
 import pandas as pd
 
 from backend.models.base import BaseFitPredictModel
+from backend.models.hooks import timed
 from backend.models.name_conventions import (
     INDEX_COL,
     MODEL_FOLDER,
@@ -49,11 +50,13 @@ class TabularRegressor(BaseFitPredictModel[pd.DataFrame, pd.DataFrame]):
             self.__y_columns = [c for c in y.columns if c != INDEX_COL]
         X_copy = X[[INDEX_COL] + self.x_columns].copy()
         y_copy = y[[INDEX_COL] + self.y_columns].copy()
-        self._fit(X_copy, y_copy)
+        with timed("fit", self.__class__.__name__):
+            self._fit(X_copy, y_copy)
 
     def predict(self, X: pd.DataFrame) -> pd.DataFrame:
         X_copy = X[[INDEX_COL] + self.x_columns].copy()
-        return self._predict(X_copy)
+        with timed("predict", self.__class__.__name__):
+            return self._predict(X_copy)
 
     def _serialize(self) -> SerializableState:
         state = super()._serialize()
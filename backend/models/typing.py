@@ -1,7 +1,12 @@
-from typing import Dict, List, TypeAlias, Union
+from typing import TYPE_CHECKING, Dict, List, TypeAlias, Union
 
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.linear_model import Lasso, LinearRegression, Ridge
+if TYPE_CHECKING:
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.linear_model import Lasso, LinearRegression, Ridge
+
+    SklearnRegressor: TypeAlias = Union[
+        LinearRegression, Ridge, Lasso, RandomForestRegressor
+    ]
 
 
 # --- General purpose types ---
@@ -10,7 +15,16 @@ JSONType: TypeAlias = Union[
 ]
 SerializableState: TypeAlias = Dict[str, JSONType]
 
+
 # --- Tabular regressor types ---
-SklearnRegressor: TypeAlias = Union[
-    LinearRegression, Ridge, Lasso, RandomForestRegressor
-]
+def __getattr__(name: str):
+    # SklearnRegressor is built on first access, so importing this module for the
+    # general purpose types does not load sklearn (slow to import)
+    if name != "SklearnRegressor":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.linear_model import Lasso, LinearRegression, Ridge
+
+    alias = Union[LinearRegression, Ridge, Lasso, RandomForestRegressor]
+    globals()[name] = alias
+    return alias
@@ -9,6 +9,11 @@ export PYTHONPATH=/app:$PYTHONPATH
 echo "Creating database..."
 python backend/db/dev_init_db.py
 
-# Start the FastAPI application
+# Start the FastAPI application: SERVER_MODE=gunicorn (default) preloads the app and
+# forks WEB_CONCURRENCY workers (see backend/gunicorn.conf.py); SERVER_MODE=uvicorn
+# runs a single process
 echo "Starting API..."
-exec uvicorn backend.api.main:app --host 0.0.0.0 --port 8000
+if [ "${SERVER_MODE:-gunicorn}" = "uvicorn" ]; then
+    exec uvicorn backend.api.main:app --host 0.0.0.0 --port 8000
+fi
+exec gunicorn -c backend/gunicorn.conf.py backend.api.main:app
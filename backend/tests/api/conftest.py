@@ -1,5 +1,5 @@
 import os
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 # Ensure DB URL exists before importing backend code
 os.environ.setdefault("USERS_DB_URL", "sqlite:///./users_test.db")
@@ -21,16 +21,18 @@ def mock_redis():
     mock_redis_client.ping.return_value = True
     mock_redis_client.close.return_value = None
     mock_redis_client.flushall.return_value = None
+    # register_script is synchronous and returns an awaitable script
+    mock_redis_client.register_script = MagicMock(
+        return_value=AsyncMock(return_value="0")
+    )
+
+    from backend.api.security.limiter import rate_limit_state
 
     # Mock redis.asyncio.from_url to return our mock client
     with patch("redis.asyncio.from_url", return_value=mock_redis_client):
-        # Mock FastAPILimiter.init to do nothing
-        with patch("fastapi_limiter.FastAPILimiter.init", return_value=None):
-            # Mock the RateLimiter dependency to always pass
-            with patch("fastapi_limiter.depends.RateLimiter") as mock_rate_limiter:
-                # Return a function that does nothing (no rate limiting)
-                mock_rate_limiter.return_value = lambda: None
-                yield
+        # Disable the rate limiter so every request passes
+        with patch.object(rate_limit_state, "enabled", False):
+            yield mock_redis_client
 
 
 @pytest.fixture
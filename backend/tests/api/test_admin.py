@@ -1,3 +1,9 @@
+import json
+import uuid
+from unittest.mock import patch
+
+from backend.api.security.passwords import password_hasher
+from backend.db.session import async_engine
 from backend.db.dev_init_db import create_user, init_db
 from backend.tests.api.helpers import _auth_header
 
@@ -76,3 +82,104 @@ def test_delete_user(client):
 
     resp2 = client.post("/admin/get_user", json=payload, headers=_auth_header(token))
     assert resp2.status_code == 404, "Deleted user retrieval did not return 404"
+
+
+def test_list_users_keyset_pagination(client):
+    """Pages follow the X-Next-After-Id cursor and can be filtered by role."""
+    token = _bootstrap_admin_and_test_user(client)
+    for i in range(3):
+        create_user(f"pageuser{i}", "pagepass", role="pager")
+
+    seen, after_id = [], 0
+    while True:
+        resp = client.get(
+            "/admin/",
+            params={"after_id": after_id, "limit": 2, "role": "pager"},
+            headers=_auth_header(token),
+        )
+        assert resp.status_code == 200, "Paginated listing failed"
+        page = resp.json()
+        assert len(page) <= 2, "Page exceeds limit"
+        seen.extend(page)
+        if "X-Next-After-Id" not in resp.headers:
+            break
+        after_id = int(resp.headers["X-Next-After-Id"])
+
+    ids = [u["id"] for u in seen]
+    assert ids == sorted(set(ids)), "Pages overlap or are out of order"
+    assert {u["user"] for u in seen} == {f"pageuser{i}" for i in range(3)}
+    assert all(u["role"] == "pager" for u in seen), "Role filter ignored"
+
+
+def test_export_users_streams_ndjson(client):
+    token = _bootstrap_admin_and_test_user(client)
+    resp = client.get("/admin/export", headers=_auth_header(token))
+    assert resp.status_code == 200, "Export failed"
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    users = [json.loads(line) for line in resp.text.splitlines()]
+    assert {ADMIN_USER, TEST_USER} <= {u["user"] for u in users}, "Users missing"
+    assert all(set(u) == {"id", "user", "role"} for u in users), "Unexpected fields"
+
+
+def test_import_users_json_reports_per_row_results(client):
+    token = _bootstrap_admin_and_test_user(client)
+    a, b, c, d = (f"import{n}-{uuid.uuid4().hex[:8]}" for n in "abcd")
+    payload = [
+        {"user": a, "password": "importpass", "role": "client"},
+        {"user": TEST_USER, "password": "whatever"},
+        {"user": a, "password": "again"},
+        {"user": b, "password_hash": password_hasher.hash("hashedpass")},
+        {"user": c},
+        {"user": d, "password_hash": "not-a-hash"},
+    ]
+    resp = client.post("/admin/import_users", json=payload, headers=_auth_header(token))
+    assert resp.status_code == 200, "Bulk import failed"
+    data = resp.json()
+    statuses = [r["status"] for r in data["results"]]
+    expected = ["created", "exists", "duplicate", "created", "invalid", "invalid"]
+    assert statuses == expected, "Unexpected per-row import statuses"
+    assert data["created"] == 2 and data["skipped"] == 4, "Wrong import totals"
+
+    for user, password in [(a, "importpass"), (b, "hashedpass")]:
+        login = client.post(
+            "/auth/login",
+            data={"username": user, "password": password, "scope": "client"},
+        )
+        assert login.status_code == 200, f"Imported user '{user}' cannot log in"
+
+
+def test_import_users_csv(client):
+    token = _bootstrap_admin_and_test_user(client)
+    suffix = uuid.uuid4().hex[:8]
+    body = f"user,password,role\ncsv1-{suffix},csvpass,client\ncsv2-{suffix},pw,admin\n"
+    headers = {**_auth_header(token), "Content-Type": "text/csv"}
+    resp = client.post("/admin/import_users", content=body, headers=headers)
+    assert resp.status_code == 200, "CSV import failed"
+    results = resp.json()["results"]
+    assert [r["status"] for r in results] == ["created", "created"], "CSV rows skipped"
+    assert all(r["id"] for r in results), "Created rows without ids"
+
+
+def test_import_users_reports_only_concurrent_conflicts(client):
+    """No connection is held while hashing and a conflict fails only its own row."""
+    token = _bootstrap_admin_and_test_user(client)
+    a, b, c = (f"import{n}-{uuid.uuid4().hex[:8]}" for n in "abc")
+    checked_out = []
+    ahash_many = password_hasher.ahash_many
+
+    async def hash_while_another_request_creates_b(passwords):
+        checked_out.append(async_engine.pool.checkedout())
+        create_user(b, "created-meanwhile", role="client")
+        return await ahash_many(passwords)
+
+    payload = [{"user": user, "password": "importpass"} for user in (a, b, c)]
+    with patch.object(
+        password_hasher, "ahash_many", hash_while_another_request_creates_b
+    ):
+        resp = client.post(
+            "/admin/import_users", json=payload, headers=_auth_header(token)
+        )
+    assert resp.status_code == 200, "Bulk import failed"
+    assert checked_out == [0], "A connection was held while hashing"
+    statuses = [r["status"] for r in resp.json()["results"]]
+    assert statuses == ["created", "error", "created"], "Conflict failed the batch"
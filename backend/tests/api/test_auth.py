@@ -1,3 +1,7 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from backend.api.security import auth
 from backend.db.dev_init_db import create_user, init_db
 
 ADMIN_USER = "admin"
@@ -46,3 +50,35 @@ def test_scopes_endpoint(client):
     assert all(
         k in data["scopes"] for k in ["admin", "client"]
     ), "Expected scopes 'admin' and 'client' not present"
+
+
+def test_verified_tokens_are_cached():
+    """A token is decoded once and later verifications hit the cache."""
+    token = auth.create_access_token("someone", scopes=["admin"])
+    with patch.object(auth.jwt, "decode", wraps=auth.jwt.decode) as decode:
+        first = auth.verify_token(token)
+        second = auth.verify_token(token)
+    assert decode.call_count == 1, "Cached token was decoded again"
+    assert first == second, "Cached verification differs"
+    assert first.subject == "someone", "Token subject mismatch"
+    assert first.effective_scopes == {"admin", "client"}, "Implied scopes missing"
+
+
+def test_invalid_or_expired_tokens_are_rejected():
+    """Tampered and expired tokens do not verify and are not cached."""
+    token = auth.create_access_token("someone", scopes=["client"])
+    assert auth.verify_token(token[:-2] + "xx") is None, "Tampered token verified"
+    expired = auth.create_access_token(
+        "someone", scopes=["client"], expires_delta=timedelta(seconds=-1)
+    )
+    assert auth.verify_token(expired) is None, "Expired token verified"
+
+
+async def test_async_user_lookup_and_authentication():
+    """The async engine finds users and authenticates them without the threadpool."""
+    _ensure_users_created()
+    user = await auth._aget_user(CLIENT_USER)
+    assert user is not None and user.role == "client", "Async lookup failed"
+    assert await auth._aget_user("missing-user") is None, "Unknown user found"
+    assert await auth.authenticate_user(CLIENT_USER, CLIENT_PASS), "Valid login failed"
+    assert not await auth.authenticate_user(CLIENT_USER, "wrong"), "Bad password ok"
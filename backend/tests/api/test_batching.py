@@ -0,0 +1,72 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from backend.api.batching import PredictBatcher
+from backend.models import SKLearnRegressor
+from backend.models.name_conventions import INDEX_COL
+
+
+@pytest.fixture
+def fitted_model():
+    X = pd.DataFrame({INDEX_COL: [0, 1, 2, 3], "x1": [0.0, 1.0, 2.0, 3.0]})
+    y = pd.DataFrame({INDEX_COL: [0, 1, 2, 3], "y": [1.0, 3.0, 5.0, 7.0]})
+    model = SKLearnRegressor(base_model=LinearRegression())
+    model.fit(X, y)
+    return model
+
+
+def _request_frame(index, x1):
+    return pd.DataFrame({INDEX_COL: [index], "x1": [x1]})
+
+
+async def test_concurrent_predictions_share_one_call(fitted_model):
+    """Concurrent requests within the window run a single predict call."""
+    batcher = PredictBatcher(window_ms=20, max_rows=1_000)
+    frames = [_request_frame(f"row{i}", float(i)) for i in range(5)]
+    with patch.object(fitted_model, "predict", wraps=fitted_model.predict) as spy:
+        results = await asyncio.gather(
+            *(batcher.predict(fitted_model, X) for X in frames)
+        )
+    assert spy.call_count == 1, "Requests were not batched into one predict call"
+    for i, result in enumerate(results):
+        assert result[INDEX_COL].tolist() == [f"row{i}"], "Result split mismatch"
+        assert result["y_hat"].iloc[0] == pytest.approx(2 * i + 1), "Wrong prediction"
+
+
+async def test_max_rows_flushes_before_window(fitted_model):
+    """Reaching max_rows flushes the batch without waiting for the window."""
+    batcher = PredictBatcher(window_ms=5_000, max_rows=2)
+    start = time.perf_counter()
+    await asyncio.gather(
+        batcher.predict(fitted_model, _request_frame(1, 1.0)),
+        batcher.predict(fitted_model, _request_frame(2, 2.0)),
+    )
+    assert time.perf_counter() - start < 1, "Full batch waited for the window"
+
+
+async def test_disabled_batcher_predicts_each_request(fitted_model):
+    """A zero window predicts each request separately."""
+    batcher = PredictBatcher(window_ms=0)
+    with patch.object(fitted_model, "predict", wraps=fitted_model.predict) as spy:
+        await asyncio.gather(
+            batcher.predict(fitted_model, _request_frame(1, 1.0)),
+            batcher.predict(fitted_model, _request_frame(2, 2.0)),
+        )
+    assert spy.call_count == 2, "Disabled batcher merged requests"
+
+
+async def test_batch_errors_propagate(fitted_model):
+    """A failing batched predict raises in every waiting request."""
+    batcher = PredictBatcher(window_ms=5)
+    with patch.object(fitted_model, "predict", side_effect=ValueError("boom")):
+        results = await asyncio.gather(
+            batcher.predict(fitted_model, _request_frame(1, 1.0)),
+            batcher.predict(fitted_model, _request_frame(2, 2.0)),
+            return_exceptions=True,
+        )
+    assert all(isinstance(r, ValueError) for r in results), "Errors not propagated"
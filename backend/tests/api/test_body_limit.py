@@ -0,0 +1,98 @@
+import gzip
+from unittest.mock import patch
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from backend.api.middleware import compression
+from backend.api.middleware.body_limit import BodySizeLimitMiddleware
+from backend.api.security.auth import create_access_token
+from backend.tests.api.helpers import _auth_header
+
+LIMITS = {"/upload": {"client": 1_000, "admin": 5_000, "anonymous": 100}}
+
+
+def _limited_client():
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def upload(request: Request):
+        return {"received": len(await request.body())}
+
+    @app.post("/other")
+    async def other(request: Request):
+        return {"received": len(await request.body())}
+
+    app.add_middleware(BodySizeLimitMiddleware, limits=LIMITS, default_limit=10)
+    return TestClient(app)
+
+
+def _rejections(route, role):
+    value = REGISTRY.get_sample_value(
+        "webpredictor_request_body_rejections_total", {"route": route, "role": role}
+    )
+    return value or 0.0
+
+
+def test_limits_depend_on_route_and_role():
+    """Each role gets its route limit and unknown routes the default limit."""
+    client = _limited_client()
+    client_token = create_access_token("someone", scopes=["client"])
+    admin_token = create_access_token("root", scopes=["admin"])
+    body = b"x" * 2_000
+
+    resp = client.post("/upload", content=body, headers=_auth_header(client_token))
+    assert resp.status_code == 413, "Client limit not enforced"
+    resp = client.post("/upload", content=body, headers=_auth_header(admin_token))
+    assert resp.status_code == 200, "Admin limit not applied"
+    resp = client.post("/upload", content=b"x" * 500)
+    assert resp.status_code == 413, "Anonymous limit not enforced"
+    resp = client.post("/other", content=b"x" * 11)
+    assert resp.status_code == 413, "Default limit not enforced"
+    resp = client.post("/other", content=b"x" * 10)
+    assert resp.json() == {"received": 10}, "Body within limit rejected"
+
+
+def test_streamed_body_without_content_length():
+    """Chunked bodies are counted while streaming and rejected past the limit."""
+    client = _limited_client()
+    before = _rejections("/upload", "anonymous")
+
+    def chunks():
+        for _ in range(10):
+            yield b"x" * 50
+
+    resp = client.post("/upload", content=chunks())
+    assert resp.status_code == 413, "Streamed oversized body not rejected"
+    assert "exceeds 100 bytes" in resp.json()["detail"], "Unexpected error detail"
+    assert _rejections("/upload", "anonymous") == before + 1, "Rejection not counted"
+
+
+def test_app_rejects_oversized_login_body(client):
+    """The API applies the default limit to routes without a specific limit."""
+    resp = client.post("/auth/login", data={"username": "u" * 100_000, "password": "p"})
+    assert resp.status_code == 413, "Oversized login body was not rejected"
+
+
+def test_compressed_body_stops_decompressing_at_limit(client):
+    """A compressed body is only inflated until the route/role limit is passed."""
+    inflated = []
+    iter_decompressed = compression._iter_decompressed
+
+    def counting(data, encoding):
+        for chunk in iter_decompressed(data, encoding):
+            inflated.append(len(chunk))
+            yield chunk
+
+    with patch.object(compression, "_iter_decompressed", counting):
+        resp = client.post(
+            "/auth/login",
+            content=gzip.compress(b"username=" + b"u" * 10_000_000),
+            headers={
+                "Content-Type": "application/x-www-form-urlencoded",
+                "Content-Encoding": "gzip",
+            },
+        )
+    assert resp.status_code == 413, "Oversized compressed body was not rejected"
+    assert sum(inflated) <= 2 * compression.READ_CHUNK_SIZE, "Body fully inflated"
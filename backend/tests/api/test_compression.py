@@ -0,0 +1,106 @@
+import gzip
+import json
+
+import zstandard
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from backend.api.middleware.compression import CompressionMiddleware
+from backend.db.dev_init_db import create_user, init_db
+from backend.tests.api.helpers import _auth_header
+
+CLIENT_USER = "client"
+CLIENT_PASS = "clientpass"
+
+
+def _echo_app():
+    async def app(scope, receive, send):
+        body = await Request(scope, receive).body()
+        response = JSONResponse({"received": len(body)})
+        await response(scope, receive, send)
+
+    return app
+
+
+def test_large_response_is_gzip_compressed(client):
+    """Responses above the threshold are compressed when the client accepts gzip."""
+    resp = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200, "'/openapi.json' did not return HTTP 200"
+    assert resp.headers.get("content-encoding") == "gzip", "Response not gzipped"
+    assert "Accept-Encoding" in resp.headers.get("vary", ""), "Missing Vary header"
+    assert "paths" in resp.json(), "Compressed body did not decode"
+
+
+def test_zstd_preferred_when_accepted(client):
+    """zstd is chosen over gzip when both are acceptable."""
+    resp = client.get("/openapi.json", headers={"Accept-Encoding": "gzip, zstd"})
+    assert resp.headers.get("content-encoding") == "zstd", "zstd not negotiated"
+
+
+def test_small_or_unaccepted_responses_not_compressed(client):
+    """Small responses and clients without Accept-Encoding get identity bodies."""
+    small = client.get("/auth/scopes", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers, "Small response was compressed"
+    plain = client.get("/openapi.json", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers, "Identity response compressed"
+
+
+def test_gzip_request_body_is_decompressed(client):
+    """A gzip request body reaches the endpoint decompressed."""
+    init_db()
+    create_user(CLIENT_USER, CLIENT_PASS, role="client")
+    token = client.post(
+        "/auth/login",
+        data={"username": CLIENT_USER, "password": CLIENT_PASS, "scope": "client"},
+    ).json()["access_token"]
+    payload = {
+        "model_type": "LinearRegression",
+        "target_columns": ["target1"],
+        "train_data": {
+            "rows": [
+                {"index": 1, "feat1": 0.1, "target1": 10.0},
+                {"index": 2, "feat1": 0.2, "target1": 20.0},
+            ]
+        },
+        "predict_data": {"rows": [{"index": 3, "feat1": 0.3}]},
+    }
+    headers = {
+        **_auth_header(token),
+        "Content-Type": "application/json",
+        "Content-Encoding": "gzip",
+    }
+    resp = client.post(
+        "/tabular_regressor/train_predict",
+        content=gzip.compress(json.dumps(payload).encode()),
+        headers=headers,
+    )
+    assert resp.status_code == 200, "Compressed request was not accepted"
+    assert len(resp.json()["predictions"]) == 1, "Predictions length mismatch"
+
+
+def test_decompressed_size_cap():
+    """Bodies expanding beyond the cap are rejected with 413."""
+    app = CompressionMiddleware(_echo_app(), max_decompressed_size=1024)
+    client = TestClient(app)
+    ok = client.post(
+        "/",
+        content=zstandard.compress(b"a" * 1000),
+        headers={"Content-Encoding": "zstd"},
+    )
+    assert ok.json() == {"received": 1000}, "Body within cap not decompressed"
+    bomb = client.post(
+        "/", content=gzip.compress(b"a" * 100_000), headers={"Content-Encoding": "gzip"}
+    )
+    assert bomb.status_code == 413, "Decompression bomb was not rejected"
+
+
+def test_invalid_request_encodings():
+    """Unknown encodings yield 415 and corrupt bodies yield 400."""
+    client = TestClient(CompressionMiddleware(_echo_app()))
+    unknown = client.post("/", content=b"x", headers={"Content-Encoding": "br"})
+    assert unknown.status_code == 415, "Unsupported encoding not rejected"
+    corrupt = client.post(
+        "/", content=b"not gzip", headers={"Content-Encoding": "gzip"}
+    )
+    assert corrupt.status_code == 400, "Corrupt body not rejected"
@@ -0,0 +1,119 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from backend.api.schemas.tabular_regressor_schemas import TrainPredictRequest
+from backend.api.security.cost_limiter import CostLimiter
+from backend.db.dev_init_db import create_user, init_db
+from backend.tests.api.helpers import _auth_header
+
+COST_USER = "costuser"
+COST_PASS = "costpass"
+
+
+def _request(model_type, n_rows, n_features):
+    features = {f"f{i}": float(i) for i in range(n_features)}
+    rows = [{"index": i, **features, "t": 1.0} for i in range(n_rows)]
+    return TrainPredictRequest(
+        model_type=model_type,
+        target_columns=["t"],
+        train_data={"rows": rows},
+        predict_data={"rows": [{"index": 0, **features}]},
+    )
+
+
+def test_estimated_cost_scales_with_size_and_model():
+    """Cost grows with rows, columns and the model factor."""
+    small = _request("LinearRegression", 1, 1).estimated_cost()
+    wide = _request("LinearRegression", 1, 10).estimated_cost()
+    forest = _request("RandomForestRegressor", 1, 1).estimated_cost()
+    assert small == 2 * 2 * 1.0, "Unexpected cost for a 2 x 2 LinearRegression"
+    assert wide > small, "More columns did not cost more"
+    assert forest > small, "RandomForestRegressor not weighted above linear"
+
+
+async def test_budget_rejects_heavy_users_with_retry_after():
+    """A user exhausting the budget is rejected; other users are unaffected."""
+    limiter = CostLimiter(capacity=100, seconds=60)
+    await limiter.charge("heavy", 80, "RandomForestRegressor")
+    with pytest.raises(HTTPException) as exc_info:
+        await limiter.charge("heavy", 80, "RandomForestRegressor")
+    assert exc_info.value.status_code == 429, "Over-budget request admitted"
+    assert int(exc_info.value.headers["Retry-After"]) == 36, "Wrong Retry-After"
+    await limiter.charge("light", 1, "LinearRegression")
+
+
+async def test_cost_above_budget_is_capped():
+    """Requests costlier than the whole budget are still possible when it is full."""
+    limiter = CostLimiter(capacity=100, seconds=60)
+    await limiter.charge("user", 10_000, "RandomForestRegressor")
+    with pytest.raises(HTTPException):
+        await limiter.charge("user", 1, "LinearRegression")
+
+
+async def test_redis_failure_falls_back_to_local_budget():
+    class FailingScript:
+        async def __call__(self, keys, args):
+            raise ConnectionError("redis down")
+
+    class FakeRedis:
+        def register_script(self, script):
+            return FailingScript()
+
+    limiter = CostLimiter(capacity=10, seconds=60)
+    limiter.use_redis(FakeRedis())
+    await limiter.charge("user", 10, "LinearRegression")
+    with pytest.raises(HTTPException):
+        await limiter.charge("user", 1, "LinearRegression")
+
+
+async def test_redis_store_charges_through_the_script(mock_redis):
+    """Budgets are charged by the Lua script, which decides the Retry-After."""
+    limiter = CostLimiter(capacity=100, seconds=60)
+    limiter.use_redis(mock_redis)
+    script = mock_redis.register_script.return_value
+    await limiter.charge("user", 10, "LinearRegression")
+    script.assert_awaited_once_with(
+        keys=["webpredictor:cost:user"], args=[100, 100 / 60, 10]
+    )
+
+    script.return_value = "36"
+    with pytest.raises(HTTPException) as exc_info:
+        await limiter.charge("user", 80, "RandomForestRegressor")
+    assert exc_info.value.headers["Retry-After"] == "36", "Script result ignored"
+    assert not limiter._redis_failed, "Redis store not used"
+
+
+async def test_store_bugs_are_not_taken_for_redis_outages(mock_redis):
+    mock_redis.register_script.return_value = AsyncMock(side_effect=TypeError("bug"))
+    limiter = CostLimiter(capacity=100, seconds=60)
+    limiter.use_redis(mock_redis)
+    with pytest.raises(TypeError):
+        await limiter.charge("user", 10, "LinearRegression")
+
+
+def test_train_predict_charges_cost_budget(client):
+    """The endpoint answers 429 once the user's budget is spent."""
+    from backend.api.security.cost_limiter import cost_limiter
+
+    init_db()
+    create_user(COST_USER, COST_PASS, role="client")
+    resp = client.post(
+        "/auth/login",
+        data={"username": COST_USER, "password": COST_PASS, "scope": "client"},
+    )
+    token = resp.json()["access_token"]
+    payload = _request("LinearRegression", 2, 2).model_dump()
+    other = _request("LinearRegression", 3, 2).model_dump()
+
+    cost_limiter.local_store.reset()
+    url = "/tabular_regressor/train_predict"
+    with patch.multiple(cost_limiter, capacity=15, rate=15 / 60):
+        first = client.post(url, json=payload, headers=_auth_header(token))
+        cached = client.post(url, json=payload, headers=_auth_header(token))
+        second = client.post(url, json=other, headers=_auth_header(token))
+    assert first.status_code == 200, "Request within budget rejected"
+    assert cached.status_code == 200, "Cached response charged to the budget"
+    assert second.status_code == 429, "Request beyond budget admitted"
+    assert "Retry-After" in second.headers, "Missing Retry-After header"
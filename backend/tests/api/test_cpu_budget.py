@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from backend.api.cpu_budget import CpuBudget, set_n_jobs
+from backend.api.schemas.tabular_regressor_schemas import TrainPredictRequest
+
+
+def _acquire_in_thread(budget, granted):
+    thread = threading.Thread(target=lambda: granted.append(budget.acquire()))
+    thread.start()
+    return thread
+
+
+def _wait_for(predicate):
+    deadline = time.monotonic() + 5
+    while not predicate():
+        assert time.monotonic() < deadline, "Timed out"
+        time.sleep(0.001)
+
+
+def test_busy_budget_makes_fits_wait_for_a_thread():
+    """An exhausted budget blocks later fits instead of oversubscribing."""
+    budget = CpuBudget(threads=4)
+    first = budget.acquire()
+    assert first == 4, "Idle budget did not grant all threads"
+
+    granted = []
+    thread = _acquire_in_thread(budget, granted)
+    _wait_for(lambda: budget.waiting == 1)
+    assert budget.in_use == 4 and not granted, "Fit granted beyond the budget"
+
+    budget.release(first)
+    thread.join(timeout=5)
+    assert granted == [4], "Waiting fit not granted the released threads"
+    budget.release(granted[0])
+    assert budget.in_use == 0, "Threads leaked"
+
+
+def test_fit_waiting_too_long_for_a_thread_is_rejected():
+    budget = CpuBudget(threads=2, timeout=0.01)
+    first = budget.acquire()
+    with pytest.raises(HTTPException) as exc_info:
+        budget.acquire()
+    assert exc_info.value.status_code == 503, "Timed out fit not rejected with 503"
+    assert budget.waiting == 0 and budget.in_use == first, "Waiter not cleaned up"
+
+
+def test_waiting_fits_split_the_released_threads():
+    budget = CpuBudget(threads=4)
+    first = budget.acquire()
+    granted = []
+    threads = [_acquire_in_thread(budget, granted) for _ in range(2)]
+    _wait_for(lambda: budget.waiting == 2)
+
+    budget.release(first)
+    for thread in threads:
+        thread.join(timeout=5)
+    assert sorted(granted) == [2, 2], "Released threads not shared among waiters"
+    assert budget.in_use == 4, "Granted threads exceed the budget"
+
+
+def test_budget_respects_per_fit_and_requested_caps():
+    budget = CpuBudget(threads=8, max_jobs_per_fit=3)
+    with budget.allocate() as n_jobs:
+        assert n_jobs == 3, "Per-fit cap ignored"
+        with budget.allocate(max_jobs=1) as single:
+            assert single == 1, "Requested cap ignored"
+        assert budget.in_use == 3, "Nested allocation not released"
+    assert budget.in_use == 0, "Allocation not released"
+
+
+def test_n_jobs_is_applied_to_parallel_models():
+    payload = TrainPredictRequest(
+        model_type="RandomForestRegressor",
+        target_columns=["t1", "t2"],
+        train_data={
+            "rows": [{"index": i, "x": i, "t1": i, "t2": -i} for i in range(5)]
+        },
+        predict_data={"rows": [{"index": 0, "x": 1.0}]},
+    )
+    model = payload.get_model_instance(n_jobs=3)
+    assert model.base_model.base_model.n_jobs == 3, "n_jobs not set on estimator"
+
+    train_df = payload.train_data.to_dataframe()
+    model.fit(train_df[["index", "x"]], train_df[["index", "t1", "t2"]])
+    set_n_jobs(model, 1)
+    assert all(
+        m.base_model.n_jobs == 1 for m in model.base_model.values()
+    ), "n_jobs not reset on fitted estimators"
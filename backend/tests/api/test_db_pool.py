@@ -0,0 +1,42 @@
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+
+from backend.db.dev_init_db import init_db
+from backend.db.session import SessionLocal, async_engine, engine
+
+
+def _checkouts(pool: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "webpredictor_db_pool_checkout_seconds_count", {"pool": pool}
+    )
+    return value or 0.0
+
+
+def test_sqlite_connections_use_wal():
+    init_db()
+    with engine.connect() as conn:
+        journal_mode = conn.execute(text("PRAGMA journal_mode")).scalar()
+        synchronous = conn.execute(text("PRAGMA synchronous")).scalar()
+    assert journal_mode == "wal", "SQLite journal mode is not WAL"
+    assert synchronous == 1, "SQLite synchronous is not NORMAL"
+
+
+def test_pool_checkouts_are_measured():
+    before = _checkouts("users_sync")
+    db = SessionLocal()
+    try:
+        db.execute(text("SELECT 1"))
+        checked_out = REGISTRY.get_sample_value(
+            "webpredictor_db_pool_checked_out", {"pool": "users_sync"}
+        )
+        assert checked_out >= 1, "Checked-out gauge not updated"
+    finally:
+        db.close()
+    assert _checkouts("users_sync") == before + 1, "Checkout wait not recorded"
+
+
+async def test_async_pool_checkouts_are_measured():
+    before = _checkouts("users_async")
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    assert _checkouts("users_async") == before + 1, "Async checkout not recorded"
@@ -0,0 +1,124 @@
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+from starlette.responses import Response
+
+from backend.api.security.limiter import RateLimiter, TwoTierRateLimit, hash_ip
+
+
+def _request(ip="1.2.3.4", path="/limited"):
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "headers": [(b"x-forwarded-for", ip.encode())],
+    }
+    return Request(scope)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def incrby(self, key, amount):
+        self.commands.append(("incrby", key, amount))
+
+    def expire(self, key, seconds):
+        self.commands.append(("expire", key, seconds))
+
+    async def execute(self):
+        if self.redis.fail:
+            raise ConnectionError("redis down")
+        results = []
+        for command, key, value in self.commands:
+            if command == "incrby":
+                self.redis.counters[key] = self.redis.counters.get(key, 0) + value
+                results.append(self.redis.counters[key])
+            else:
+                results.append(True)
+        return results
+
+
+class FakeRedis:
+    def __init__(self):
+        self.counters = {}
+        self.fail = False
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+async def test_rate_limiter_rejects_with_retry_after():
+    """Requests beyond the bucket capacity get 429 with Retry-After."""
+    limiter = RateLimiter(times=2, seconds=60, state=TwoTierRateLimit())
+    await limiter(_request(), Response())
+    await limiter(_request(), Response())
+    with pytest.raises(HTTPException) as exc_info:
+        await limiter(_request(), Response())
+    assert exc_info.value.status_code == 429, "Over-limit request was admitted"
+    assert int(exc_info.value.headers["Retry-After"]) >= 1, "Missing Retry-After"
+
+    # Other clients have their own bucket
+    await limiter(_request(ip="5.6.7.8"), Response())
+
+
+def test_bucket_refills_over_time():
+    """Tokens refill at times/seconds per second."""
+    state = TwoTierRateLimit()
+    assert state.acquire("k", 1, 1) == 0, "First request rejected"
+    assert state.acquire("k", 1, 1) > 0, "Empty bucket admitted a request"
+    state._buckets["k"].updated -= 1.0
+    assert state.acquire("k", 1, 1) == 0, "Bucket did not refill"
+
+
+async def test_sync_deducts_other_workers_usage():
+    """Admissions pushed by other workers are taken from the local bucket."""
+    redis = FakeRedis()
+    worker_a, worker_b = TwoTierRateLimit(), TwoTierRateLimit()
+    worker_a.redis = worker_b.redis = redis
+    for _ in range(3):
+        assert worker_a.acquire("k", 5, 60) == 0, "Worker A rejected early"
+    await worker_a.sync()
+
+    assert worker_b.acquire("k", 5, 60) == 0, "Worker B rejected early"
+    await worker_b.sync()
+    # Worker B has seen 3 admissions from A plus its own: one token left
+    assert worker_b.acquire("k", 5, 60) == 0, "Worker B lost its last token"
+    assert worker_b.acquire("k", 5, 60) > 0, "Global limit not enforced"
+    assert sum(redis.counters.values()) == 4, "Admissions not pushed to Redis"
+
+
+async def test_sync_falls_back_to_local_only_when_redis_fails():
+    """A failing Redis leaves the local buckets in charge."""
+    redis = FakeRedis()
+    redis.fail = True
+    state = TwoTierRateLimit()
+    state.start(redis)
+    try:
+        assert state.acquire("k", 2, 60) == 0, "Request rejected"
+        await state.sync()
+        assert not state.redis_available, "Redis failure not detected"
+        assert state.acquire("k", 2, 60) == 0, "Local bucket lost a token"
+        assert state.acquire("k", 2, 60) > 0, "Local limit not enforced"
+
+        redis.fail = False
+        await state.sync()
+        assert state.redis_available, "Redis recovery not detected"
+    finally:
+        await state.stop()
+
+
+def test_hash_ip_is_cached():
+    """Repeated IPs hash once and map to stable identifiers."""
+    hash_ip.cache_clear()
+    first = hash_ip("10.0.0.1")
+    assert hash_ip("10.0.0.1") == first, "Hash is not stable"
+    assert hash_ip.cache_info().hits == 1, "Hash was recomputed"
+    assert hash_ip("10.0.0.2") != first, "Different IPs share a hash"
+
+
+def test_disabled_state_admits_everything():
+    state = TwoTierRateLimit()
+    state.enabled = False
+    assert all(state.acquire("k", 1, 60) == 0 for _ in range(5))
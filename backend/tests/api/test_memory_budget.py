@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from backend.api.memory_budget import MemoryBudget, RssSampler, process_rss_bytes
+from backend.api.schemas.tabular_regressor_schemas import TrainPredictRequest
+
+MiB = 1024 * 1024
+
+
+def _payload(model_type: str, rows: int) -> TrainPredictRequest:
+    return TrainPredictRequest(
+        model_type=model_type,
+        target_columns=["t"],
+        train_data={"rows": [{"index": i, "x": i, "t": i} for i in range(rows)]},
+        predict_data={"rows": [{"index": 0, "x": 1.0}]},
+    )
+
+
+def test_estimate_grows_with_rows_and_model():
+    linear = _payload("LinearRegression", 100).estimated_memory()
+    assert _payload("LinearRegression", 1000).estimated_memory() > 5 * linear
+    assert _payload("RandomForestRegressor", 100).estimated_memory() > linear
+
+
+async def test_requests_wait_for_budget_in_arrival_order():
+    budget = MemoryBudget(budget_bytes=10 * MiB, queue_timeout=5)
+    order = []
+    release = asyncio.Event()
+
+    async def request(name: str, nbytes: int):
+        async with budget.reserve(nbytes, "LinearRegression"):
+            order.append(name)
+            await release.wait()
+
+    first = asyncio.create_task(request("first", 6 * MiB))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(request("second", 6 * MiB))
+    third = asyncio.create_task(request("third", 1 * MiB))
+    await asyncio.sleep(0.01)
+    assert order == ["first"], "Requests over the budget were admitted"
+    assert budget.stats()["queued"] == 2, "Waiting requests not queued"
+
+    release.set()
+    await asyncio.gather(first, second, third)
+    assert order == ["first", "second", "third"], "Admission order not kept"
+    assert budget.reserved == 0, "Reservations leaked"
+
+
+async def test_oversized_and_timed_out_requests_are_rejected():
+    budget = MemoryBudget(budget_bytes=10 * MiB, queue_timeout=0.01)
+    with pytest.raises(HTTPException) as exc:
+        async with budget.reserve(11 * MiB, "RandomForestRegressor"):
+            pass
+    assert exc.value.status_code == 413, "Oversized request not rejected"
+
+    async with budget.reserve(8 * MiB, "LinearRegression"):
+        with pytest.raises(HTTPException) as exc:
+            async with budget.reserve(4 * MiB, "LinearRegression"):
+                pass
+        assert exc.value.status_code == 503, "Queued request did not time out"
+        assert "Retry-After" in exc.value.headers, "Retry-After missing"
+    assert budget.reserved == 0, "Reservations leaked"
+    assert budget.stats()["queued"] == 0, "Timed out request still queued"
+
+
+@pytest.mark.skipif(process_rss_bytes() is None, reason="needs /proc")
+def test_sampler_reports_peak_rss_growth():
+    sampler = RssSampler(interval_s=0.001)
+    watch = sampler.start()
+    data = bytearray(64 * MiB)
+    data[::4096] = b"x" * len(data[::4096])  # touch every page
+    peak = sampler.stop(watch)
+    del data
+    assert peak >= 48 * MiB, "Peak RSS growth not captured"
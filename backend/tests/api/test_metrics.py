@@ -0,0 +1,57 @@
+from backend.db.dev_init_db import create_user, init_db
+from backend.tests.api.helpers import _auth_header
+
+ADMIN_USER = "admin"
+ADMIN_PASS = "adminpass"
+METRICS_CLIENT = "metricsclient"
+METRICS_PASS = "metricspass"
+
+
+def _login(client, username, password, scope):
+    resp = client.post(
+        "/auth/login",
+        data={"username": username, "password": password, "scope": scope},
+    )
+    assert resp.status_code == 200, f"Login of '{username}' failed"
+    return resp.json()["access_token"]
+
+
+def test_metrics_endpoint_requires_admin_and_reports_stages(client):
+    init_db()
+    create_user(ADMIN_USER, ADMIN_PASS, role="admin")
+    create_user(METRICS_CLIENT, METRICS_PASS, role="client")
+    admin_token = _login(client, ADMIN_USER, ADMIN_PASS, "admin")
+    client_token = _login(client, METRICS_CLIENT, METRICS_PASS, "client")
+
+    payload = {
+        "model_type": "Ridge",
+        "target_columns": ["t"],
+        "train_data": {"rows": [{"index": i, "x": i, "t": 2 * i} for i in range(4)]},
+        "predict_data": {"rows": [{"index": 9, "x": 9.0}]},
+    }
+    resp = client.post(
+        "/tabular_regressor/train_predict",
+        json=payload,
+        headers=_auth_header(client_token),
+    )
+    assert resp.status_code == 200, "train_predict failed"
+
+    assert client.get("/metrics").status_code == 401, "Metrics served anonymously"
+    forbidden = client.get("/metrics", headers=_auth_header(client_token))
+    assert forbidden.status_code == 403, "Metrics served to a client"
+
+    resp = client.get("/metrics", headers=_auth_header(admin_token))
+    assert resp.status_code == 200, "Metrics endpoint failed"
+    assert resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+    for stage in ["validate", "dataframe", "fit", "metrics", "predict", "format"]:
+        sample = (
+            "webpredictor_train_predict_stage_seconds_count"
+            f'{{model_type="Ridge",stage="{stage}"}}'
+        )
+        assert sample in body, f"Stage '{stage}' not reported"
+    assert (
+        'webpredictor_model_stage_seconds_count{model_class="SKLearnRegressor"' in body
+    )
+    assert "webpredictor_train_predict_rows_total" in body, "Row counter missing"
+    assert "webpredictor_rate_limit_rejections_total" in body, "Rejections missing"
@@ -0,0 +1,30 @@
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from backend.api.security.passwords import PasswordHasher
+
+
+async def test_hash_and_verify_roundtrip():
+    """Sync and async helpers hash and verify through the pool."""
+    hasher = PasswordHasher(max_workers=2, max_queue=4)
+    stored = await hasher.ahash("secret")
+    assert await hasher.averify("secret", stored), "Async verify rejected password"
+    assert not hasher.verify("wrong", stored), "Sync verify accepted wrong password"
+    assert hasher.verify("secret", hasher.hash("secret")), "Sync roundtrip failed"
+
+
+def test_full_queue_is_rejected():
+    """Jobs beyond the worker and queue bounds fail fast with 503."""
+    hasher = PasswordHasher(max_workers=1, max_queue=0)
+    release = threading.Event()
+    busy = hasher._submit(release.wait)
+    try:
+        with pytest.raises(HTTPException) as exc_info:
+            hasher.hash("secret")
+        assert exc_info.value.status_code == 503, "Full pool did not return 503"
+    finally:
+        release.set()
+        busy.result()
+    assert hasher.verify("secret", hasher.hash("secret")), "Pool did not recover"
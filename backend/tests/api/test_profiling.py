@@ -0,0 +1,135 @@
+import contextvars
+import threading
+import time
+
+from backend.api.profiling import RequestProfile, StackSampler, profile_thread
+from backend.db.dev_init_db import create_user, init_db
+from backend.tests.api.helpers import _auth_header
+
+ADMIN_USER = "admin"
+ADMIN_PASS = "adminpass"
+CLIENT_USER = "client"
+CLIENT_PASS = "clientpass"
+
+PAYLOAD = {
+    "model_type": "RandomForestRegressor",
+    "target_columns": ["t"],
+    "train_data": {
+        "rows": [{"index": i, "x": i, "z": i % 7, "t": 3 * i} for i in range(200)]
+    },
+    "predict_data": {"rows": [{"index": 1000, "x": 7.0, "z": 1.0}]},
+}
+
+
+def _login(client, user: str, password: str, scope: str) -> str:
+    init_db()
+    create_user(user, password, role=scope)
+    resp = client.post(
+        "/auth/login", data={"username": user, "password": password, "scope": scope}
+    )
+    assert resp.status_code == 200, "Login failed"
+    return resp.json()["access_token"]
+
+
+def _busy(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _unregistered(seconds: float):
+    _busy(seconds)
+
+
+def test_profile_reports_and_collapsed_stacks():
+    profile = RequestProfile("POST", "/x", "header")
+    profile.samples[("a:main", "b:fit", "c:inner")] = 3
+    profile.samples[("a:main", "b:fit")] = 1
+    functions = profile.top_functions(limit=2)
+    assert functions[0] == {
+        "function": "c:inner",
+        "self_samples": 3,
+        "total_samples": 3,
+    }, "Hottest function should come first"
+    assert functions[1]["function"] == "b:fit", "Self samples should rank second"
+    assert profile.collapsed() == "a:main;b:fit;c:inner 3\na:main;b:fit 1\n"
+
+
+def test_sampler_only_samples_registered_threads():
+    from backend.api import profiling
+
+    sampler = StackSampler(interval_s=0.001)
+    profile = RequestProfile("POST", "/x", "sample")
+    assert sampler.add(profile), "Sampler should accept the profile"
+    token = profiling._current.set(profile)
+
+    def work(registered: bool):
+        if registered:
+            with profile_thread():
+                _busy(0.2)
+        else:
+            _unregistered(0.2)
+
+    try:
+        # Copy the context into the threads as run_in_threadpool does
+        threads = [
+            threading.Thread(target=contextvars.copy_context().run, args=(work, r))
+            for r in (True, False)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        profiling._current.reset(token)
+        sampler.remove(profile)
+    assert profile.samples, "Registered thread was not sampled"
+    assert not any(
+        f.endswith("_unregistered") for s in profile.samples for f in s
+    ), "Unregistered thread was sampled"
+    assert len(profile.threads) == 0, "Thread registration leaked"
+
+
+def test_admin_header_profiles_request(client):
+    token = _login(client, ADMIN_USER, ADMIN_PASS, "admin")
+    headers = {**_auth_header(token), "X-Profile": "1"}
+    resp = client.post(
+        "/tabular_regressor/train_predict", json=PAYLOAD, headers=headers
+    )
+    assert resp.status_code == 200, "train_predict failed"
+    profile_id = resp.headers.get("x-profile-id")
+    assert profile_id is not None, "Profiled response has no X-Profile-Id"
+
+    resp = client.get("/admin/profiles", headers=_auth_header(token))
+    assert resp.status_code == 200, "Profile listing failed"
+    summary = next(p for p in resp.json() if p["id"] == int(profile_id))
+    assert summary["trigger"] == "header", "Profile trigger mismatch"
+    assert summary["status"] == 200, "Profile status mismatch"
+    assert summary["samples"] > 0, "Profile has no samples"
+
+    resp = client.get(f"/admin/profiles/{profile_id}", headers=_auth_header(token))
+    assert resp.status_code == 200, "Profile report failed"
+    assert resp.json()["functions"], "Profile report has no functions"
+
+    resp = client.get(
+        f"/admin/profiles/{profile_id}/collapsed", headers=_auth_header(token)
+    )
+    assert resp.status_code == 200, "Collapsed profile failed"
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert resp.text.strip(), "Collapsed profile is empty"
+
+
+def test_profile_header_ignored_without_admin_scope(client):
+    token = _login(client, CLIENT_USER, CLIENT_PASS, "client")
+    headers = {**_auth_header(token), "X-Profile": "1"}
+    resp = client.post(
+        "/tabular_regressor/train_predict", json=PAYLOAD, headers=headers
+    )
+    assert resp.status_code == 200, "train_predict failed"
+    assert "x-profile-id" not in resp.headers, "Client request was profiled"
+
+
+def test_unknown_profile_returns_404(client):
+    token = _login(client, ADMIN_USER, ADMIN_PASS, "admin")
+    resp = client.get("/admin/profiles/999999999", headers=_auth_header(token))
+    assert resp.status_code == 404, "Unknown profile should return 404"
@@ -0,0 +1,93 @@
+import time
+from unittest.mock import patch
+
+from backend.api.caching import TTLCache
+from backend.db.dev_init_db import create_user, init_db
+from backend.tests.api.helpers import _auth_header
+
+CLIENT_USER = "client"
+CLIENT_PASS = "clientpass"
+
+
+def _client_token(client):
+    init_db()
+    create_user(CLIENT_USER, CLIENT_PASS, role="client")
+    resp = client.post(
+        "/auth/login",
+        data={"username": CLIENT_USER, "password": CLIENT_PASS, "scope": "client"},
+    )
+    assert resp.status_code == 200, "Client login did not return HTTP 200"
+    return resp.json()["access_token"]
+
+
+def _payload(predict_rows):
+    return {
+        "model_type": "Ridge",
+        "target_columns": ["target1"],
+        "train_data": {
+            "rows": [
+                {"index": 1, "feat1": 0.1, "target1": 10.0},
+                {"index": 2, "feat1": 0.2, "target1": 20.0},
+                {"index": 3, "feat1": 0.3, "target1": 30.0},
+            ]
+        },
+        "predict_data": {"rows": predict_rows},
+    }
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """Entries beyond max_entries evict the least recently used key."""
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1, "Fresh entry not returned"
+    cache.set("c", 3)
+    assert cache.get("b") is None, "LRU entry was not evicted"
+    assert cache.get("a") == 1 and cache.get("c") == 3, "Recent entries evicted"
+    assert cache.stats()["hits"] == 3 and cache.stats()["misses"] == 1
+
+
+def test_ttl_cache_expires_entries():
+    """Entries are not returned after their TTL."""
+    cache = TTLCache(max_entries=2, ttl_seconds=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None, "Expired entry returned"
+    assert len(cache) == 0, "Expired entry kept in cache"
+
+
+def test_signed_redis_payload_rejects_tampering():
+    """Redis payloads are signed and tampered payloads are discarded."""
+    from backend.api.result_cache import ResultCache
+
+    cache = ResultCache(signing_key="key")
+    signed = cache._sign(b"payload")
+    assert cache._unsign(signed) == b"payload", "Signed payload not recovered"
+    assert cache._unsign(signed[:-1] + b"X") is None, "Tampered payload accepted"
+
+
+def test_repeated_train_data_skips_fit(client):
+    """Same training set reuses the fitted model; identical requests reuse responses."""
+    from backend.api.result_cache import result_cache
+    from backend.api.routers import tabular_regressor
+
+    token = _client_token(client)
+    result_cache.clear()
+    url = "/tabular_regressor/train_predict"
+    first = _payload([{"index": 101, "feat1": 0.15}])
+    second = _payload([{"index": 102, "feat1": 0.25}])
+
+    with patch.object(
+        tabular_regressor, "_fit_model", wraps=tabular_regressor._fit_model
+    ) as fit_spy:
+        resp1 = client.post(url, json=first, headers=_auth_header(token))
+        resp2 = client.post(url, json=second, headers=_auth_header(token))
+        resp3 = client.post(url, json=first, headers=_auth_header(token))
+
+    assert resp1.status_code == resp2.status_code == resp3.status_code == 200
+    assert fit_spy.call_count == 1, "Model was fitted again for the same train data"
+    assert resp1.json() == resp3.json(), "Cached response differs from original"
+    assert resp2.json()["predictions"][0]["index"] == 102, "Wrong cached predictions"
+    stats = result_cache.stats()
+    assert stats["responses"]["hits"] == 1, "Identical request missed response cache"
+    assert stats["models"]["hits"] == 1, "Repeated train data missed model cache"
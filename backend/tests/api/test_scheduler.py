@@ -0,0 +1,137 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.api.cpu_budget import CpuBudget
+from backend.api.scheduler import FairShareScheduler
+
+
+def _busy(seconds):
+    """Burn CPU so thread_time advances."""
+    end = time.thread_time() + seconds
+    while time.thread_time() < end:
+        pass
+    return seconds
+
+
+async def _wait_queued(scheduler, n):
+    while scheduler.stats()["queued"] < n:
+        await asyncio.sleep(0.001)
+
+
+async def test_scheduler_accounts_cpu_seconds_per_user():
+    scheduler = FairShareScheduler(max_concurrent=1)
+    assert await scheduler.run("alice", "client", _busy, 0.02) == 0.02
+    stats = scheduler.stats()["users"]["alice"]
+    assert stats["cpu_seconds"] >= 0.015, "CPU-seconds not accounted"
+    assert stats["jobs"] == 1, "Job not counted"
+
+
+async def test_parallel_fit_is_charged_for_its_threads():
+    """A fit on n_jobs joblib threads is charged about n_jobs times its wall time."""
+    import numpy as np
+    from sklearn.ensemble import RandomForestRegressor
+
+    rng = np.random.default_rng(0)
+    X, y = rng.random((500, 5)), rng.random(500)
+    budget = CpuBudget(threads=4)
+
+    def fit():
+        with budget.allocate() as n_jobs:
+            start = time.perf_counter()
+            RandomForestRegressor(n_estimators=20, n_jobs=n_jobs).fit(X, y)
+            return n_jobs, time.perf_counter() - start
+
+    scheduler = FairShareScheduler(max_concurrent=1)
+    n_jobs, wall = await scheduler.run("alice", "client", fit)
+    assert n_jobs == 4, "Idle budget did not grant all threads"
+    cpu_seconds = scheduler.stats()["users"]["alice"]["cpu_seconds"]
+    assert cpu_seconds >= 0.9 * n_jobs * wall, "Parallel fit undercharged"
+
+
+async def test_light_users_overtake_heavy_users():
+    """Queued jobs run in order of usage divided by role weight."""
+    scheduler = FairShareScheduler(max_concurrent=1)
+    await scheduler.run("heavy", "client", _busy, 0.05)
+    await scheduler.run("light", "client", _busy, 0.01)
+
+    gate = threading.Event()
+    order = []
+    blocker = asyncio.create_task(scheduler.run("other", "client", gate.wait))
+    await asyncio.sleep(0.01)
+    heavy = asyncio.create_task(scheduler.run("heavy", "client", order.append, "heavy"))
+    light = asyncio.create_task(scheduler.run("light", "client", order.append, "light"))
+    await _wait_queued(scheduler, 2)
+    users = scheduler.stats()["users"]
+    assert users["heavy"]["queued"] == 1, "Queue depth not reported per user"
+
+    gate.set()
+    await asyncio.gather(blocker, heavy, light)
+    assert order == ["light", "heavy"], "Heavy user was not deprioritized"
+
+
+async def test_role_weight_scales_fair_share():
+    """An admin with twice the usage of a client but weight 4 goes first."""
+    scheduler = FairShareScheduler(max_concurrent=1, role_weights={"admin": 4.0})
+    await scheduler.run("root", "admin", _busy, 0.04)
+    await scheduler.run("bob", "client", _busy, 0.02)
+
+    gate = threading.Event()
+    order = []
+    blocker = asyncio.create_task(scheduler.run("other", "client", gate.wait))
+    await asyncio.sleep(0.01)
+    bob = asyncio.create_task(scheduler.run("bob", "client", order.append, "bob"))
+    root = asyncio.create_task(scheduler.run("root", "admin", order.append, "root"))
+    await _wait_queued(scheduler, 2)
+    gate.set()
+    await asyncio.gather(blocker, bob, root)
+    assert order == ["root", "bob"], "Role weight ignored"
+
+
+async def test_cancelled_job_leaves_queue():
+    scheduler = FairShareScheduler(max_concurrent=1)
+    gate = threading.Event()
+    blocker = asyncio.create_task(scheduler.run("a", "client", gate.wait))
+    await asyncio.sleep(0.01)
+    queued = asyncio.create_task(scheduler.run("b", "client", _busy, 0))
+    await _wait_queued(scheduler, 1)
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    assert scheduler.stats()["queued"] == 0, "Cancelled job kept in queue"
+    gate.set()
+    await blocker
+    assert scheduler.stats()["running"] == 0, "Slot leaked"
+
+
+async def test_cancelled_running_job_keeps_its_slot_until_done():
+    """Cancelling the caller does not free the slot or skip the charge."""
+    scheduler = FairShareScheduler(max_concurrent=1)
+    gate = threading.Event()
+    order = []
+
+    def job():
+        gate.wait()
+        _busy(0.02)
+        order.append("cancelled")
+
+    running = asyncio.create_task(scheduler.run("alice", "client", job))
+    await asyncio.sleep(0.01)
+    running.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await running
+    try:
+        queued = asyncio.create_task(
+            scheduler.run("bob", "client", order.append, "next")
+        )
+        await asyncio.wait_for(_wait_queued(scheduler, 1), timeout=5)
+        assert scheduler.stats()["running"] == 1, "Slot freed while the fit runs"
+    finally:
+        gate.set()
+
+    await queued
+    assert order == ["cancelled", "next"], "Queued job started before the thread ended"
+    cpu_seconds = scheduler.stats()["users"]["alice"]["cpu_seconds"]
+    assert cpu_seconds >= 0.015, "Cancelled job not charged"
@@ -0,0 +1,28 @@
+from backend.api.security.config import DEFAULT_CSP, DOCS_CSP, SECURITY_HEADERS
+
+
+def test_security_headers_added_to_responses(client):
+    resp = client.get("/health")
+    assert resp.status_code == 200, "Health endpoint failed"
+    for name, value in SECURITY_HEADERS.items():
+        assert resp.headers.get(name) == value, f"Missing or wrong {name} header"
+    assert resp.headers["Content-Security-Policy"] == DEFAULT_CSP, "Wrong CSP"
+
+
+def test_route_csp_is_not_overridden(client):
+    """Routes setting their own CSP (docs) keep it; the other headers are added."""
+    resp = client.get("/docs")
+    assert resp.status_code == 200, "Docs endpoint failed"
+    assert resp.headers["Content-Security-Policy"] == DOCS_CSP, "Docs CSP overridden"
+    assert resp.headers.get_list("Content-Security-Policy") == [
+        DOCS_CSP
+    ], "Duplicate CSP headers"
+    assert resp.headers["X-Frame-Options"] == "DENY", "Security headers missing"
+
+
+def test_security_headers_on_middleware_rejections(client):
+    """Early responses of other middlewares (413 body limit) carry the headers."""
+    resp = client.post("/auth/login", data={"username": "u" * 100_000, "password": "p"})
+    assert resp.status_code == 413, "Oversized login body was not rejected"
+    for name, value in SECURITY_HEADERS.items():
+        assert resp.headers.get(name) == value, f"Missing or wrong {name} header"
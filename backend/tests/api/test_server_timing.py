@@ -0,0 +1,61 @@
+from fastapi.testclient import TestClient
+
+from backend.api.server_timing import header_value
+from backend.db.dev_init_db import create_user, init_db
+from backend.tests.api.helpers import _auth_header
+
+TIMING_USER = "timinguser"
+TIMING_PASS = "timingpass"
+
+
+def _timed_client():
+    from backend.api.main import app
+    from backend.api.middleware.server_timing import ServerTimingMiddleware
+
+    wrapped = ServerTimingMiddleware(app, ["/tabular_regressor/", "/auth/login"])
+    return TestClient(wrapped)
+
+
+def _stages(resp) -> dict[str, float]:
+    entries = [
+        e.strip().split(";dur=") for e in resp.headers["server-timing"].split(",")
+    ]
+    return {name: float(dur) for name, dur in entries}
+
+
+def test_header_value_sums_repeated_stages():
+    value = header_value([("db", 0.001), ("fit", 0.5), ("db", 0.002)], total=1.0)
+    assert value == "db;dur=3.000, fit;dur=500.000, total;dur=1000.000"
+
+
+def test_login_and_train_predict_report_stages():
+    client = _timed_client()
+    init_db()
+    create_user(TIMING_USER, TIMING_PASS, role="client")
+    resp = client.post(
+        "/auth/login",
+        data={"username": TIMING_USER, "password": TIMING_PASS, "scope": "client"},
+    )
+    assert resp.status_code == 200, "Login failed"
+    assert {"db", "auth", "total"} <= set(_stages(resp)), "Login stages missing"
+
+    payload = {
+        "model_type": "Lasso",
+        "target_columns": ["t"],
+        "train_data": {"rows": [{"index": i, "x": i, "t": 3 * i} for i in range(5)]},
+        "predict_data": {"rows": [{"index": 7, "x": 7.0}]},
+    }
+    token = resp.json()["access_token"]
+    resp = client.post(
+        "/tabular_regressor/train_predict", json=payload, headers=_auth_header(token)
+    )
+    assert resp.status_code == 200, "train_predict failed"
+    stages = _stages(resp)
+    expected = {"auth", "validate", "dataframe", "fit", "predict", "serialize"}
+    assert expected <= set(stages), f"Missing stages in {sorted(stages)}"
+    assert stages["total"] >= stages["fit"], "Total shorter than a stage"
+
+
+def test_other_paths_are_not_instrumented():
+    resp = _timed_client().get("/health")
+    assert "server-timing" not in resp.headers, "Unlisted path instrumented"
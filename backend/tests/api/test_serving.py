@@ -0,0 +1,42 @@
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from prometheus_client import REGISTRY, generate_latest
+
+from backend.db import session
+
+
+def test_inherited_pools_are_replaced_once():
+    pool = session.engine.pool
+    with patch.object(session, "_pool_pid", -1):
+        assert session.pool_pid() != os.getpid(), "Foreign pools not detected"
+        assert session.dispose_inherited_pools(), "Inherited pools not replaced"
+        assert session.engine.pool is not pool, "Sync pool not recreated"
+        assert session.pool_pid() == os.getpid(), "Pools not owned after reset"
+        assert not session.dispose_inherited_pools(), "Own pools were replaced"
+
+
+def test_worker_setup_check_rejects_inherited_state():
+    """A sync task or pools created by another process (the master) fail the check."""
+    from backend.api.security.limiter import rate_limit_state
+    from backend.api.serving import check_worker_setup
+
+    with patch.object(rate_limit_state, "task_pid", os.getppid()):
+        with pytest.raises(RuntimeError, match="rate_limiter"):
+            check_worker_setup(AsyncMock())
+    with patch.object(session, "_pool_pid", os.getppid()):
+        with pytest.raises(RuntimeError, match="db_pools"):
+            check_worker_setup(None)
+    state = check_worker_setup(None)
+    assert state["db_pools"], "Pools should belong to the test process"
+
+
+def test_metrics_registry_aggregates_workers(monkeypatch, tmp_path):
+    from backend.api.routers.monitoring import metrics_registry
+
+    assert metrics_registry() is REGISTRY, "Default registry expected"
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    registry = metrics_registry()
+    assert registry is not REGISTRY, "Multiprocess registry expected"
+    generate_latest(registry)
@@ -82,3 +82,48 @@ def test_train_predict_endpoint(client):
         assert isinstance(
             p["values"]["target1_hat"], (int, float)
         ), "Predicted value is not numeric"
+
+
+def test_format_predictions_from_dataframe(client):
+    """Predictions are built from the DataFrame columns with native Python types."""
+    import pandas as pd
+
+    from backend.api.routers.tabular_regressor import _format_predictions
+
+    preds_df = pd.DataFrame(
+        {"index": [101, 102], "t1_hat": [1.5, 2.5], "t2_hat": [-1.0, 0.0]}
+    )
+    preds = _format_predictions(preds_df)
+    assert preds == [
+        {"index": 101, "values": {"t1_hat": 1.5, "t2_hat": -1.0}},
+        {"index": 102, "values": {"t1_hat": 2.5, "t2_hat": 0.0}},
+    ], "Formatted predictions mismatch"
+    assert type(preds[0]["index"]) is int, "Index is not a native int"
+
+
+def test_train_predict_openapi_schema(client):
+    """The fast response path still documents TrainPredictResponse in OpenAPI."""
+    schema = client.get("/openapi.json").json()
+    responses = schema["paths"]["/tabular_regressor/train_predict"]["post"]["responses"]
+    content = responses["200"]["content"]
+    assert "application/json" in content, "train_predict media type changed"
+    ref = content["application/json"]["schema"]["$ref"]
+    assert ref.endswith("/TrainPredictResponse"), "train_predict schema changed"
+
+
+def test_sklearn_regressor_annotations_resolve_at_runtime():
+    """The lazily built SklearnRegressor alias resolves in runtime introspection."""
+    import typing
+
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.linear_model import Lasso, LinearRegression, Ridge
+
+    import backend.models as bm
+
+    hints = typing.get_type_hints(bm.SKLearnRegressor.__init__)
+    assert set(typing.get_args(hints["base_model"])) == {
+        LinearRegression,
+        Ridge,
+        Lasso,
+        RandomForestRegressor,
+    }, "SklearnRegressor does not resolve to the sklearn classes"
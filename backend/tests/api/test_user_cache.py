@@ -0,0 +1,122 @@
+import asyncio
+from unittest.mock import patch
+
+from backend.api.security import auth
+from backend.db.dev_init_db import create_user, init_db
+from backend.tests.api.helpers import _auth_header
+
+ADMIN_USER = "admin"
+ADMIN_PASS = "adminpass"
+CACHED_USER = "cacheuser"
+CACHED_PASS = "cachepass"
+
+
+def _login(client, username, password, scope):
+    resp = client.post(
+        "/auth/login",
+        data={"username": username, "password": password, "scope": scope},
+    )
+    assert resp.status_code == 200, f"Login of '{username}' failed"
+    return resp.json()["access_token"]
+
+
+def _train_predict(client, token):
+    payload = {
+        "model_type": "LinearRegression",
+        "target_columns": ["t"],
+        "train_data": {"rows": [{"index": 1, "x": 1.0, "t": 2.0}]},
+        "predict_data": {"rows": [{"index": 2, "x": 2.0}]},
+    }
+    return client.post(
+        "/tabular_regressor/train_predict", json=payload, headers=_auth_header(token)
+    )
+
+
+def _bootstrap(client):
+    init_db()
+    create_user(ADMIN_USER, ADMIN_PASS, role="admin")
+    create_user(CACHED_USER, CACHED_PASS, role="client")
+    admin_token = _login(client, ADMIN_USER, ADMIN_PASS, "admin")
+    user_token = _login(client, CACHED_USER, CACHED_PASS, "client")
+    auth.user_cache.clear()
+    return admin_token, user_token
+
+
+def test_authenticated_requests_reuse_cached_user(client):
+    """Repeated requests with one token query the users table once."""
+    _, token = _bootstrap(client)
+    with patch.object(auth, "_aget_user", wraps=auth._aget_user) as db_lookup:
+        for _ in range(3):
+            resp = _train_predict(client, token)
+            assert resp.status_code == 200, "Authenticated request failed"
+    assert db_lookup.call_count == 1, "User was queried on every request"
+
+
+def test_admin_changes_invalidate_cached_user(client):
+    """change_password and delete_user drop the cached user row."""
+    admin_token, token = _bootstrap(client)
+    _train_predict(client, token)
+    assert auth.user_cache.get(CACHED_USER) is not None, "User was not cached"
+
+    payload = {"user": CACHED_USER, "password": CACHED_PASS, "role": "client"}
+    client.post(
+        "/admin/change_password", json=payload, headers=_auth_header(admin_token)
+    )
+    assert auth.user_cache.get(CACHED_USER) is None, "Password change kept cache"
+
+    _train_predict(client, token)
+    client.post(
+        "/admin/delete_user",
+        json={"user": CACHED_USER},
+        headers=_auth_header(admin_token),
+    )
+    resp = _train_predict(client, token)
+    assert resp.status_code == 401, "Deleted user still authenticated from cache"
+
+
+async def test_pubsub_listener_invalidates_users():
+    """Invalidation messages from other workers drop users from the cache."""
+    auth.user_cache.set("remote", object())
+
+    class FakePubSub:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+        async def subscribe(self, channel):
+            assert channel == auth.USER_CACHE_CHANNEL, "Wrong invalidation channel"
+
+        async def listen(self):
+            yield {"type": "subscribe", "data": 1}
+            yield {"type": "message", "data": "remote"}
+            await asyncio.Event().wait()
+
+    class FakeRedis:
+        def pubsub(self):
+            return FakePubSub()
+
+    listener = asyncio.create_task(auth.listen_user_invalidations(FakeRedis()))
+    await asyncio.sleep(0.01)
+    listener.cancel()
+    assert auth.user_cache.get("remote") is None, "Remote invalidation ignored"
+
+
+async def test_invalidation_is_published_without_blocking():
+    """Invalidations are published through the async client of the lifespan."""
+    published = []
+
+    class FakeRedis:
+        async def publish(self, channel, message):
+            published.append((channel, message))
+
+    auth.user_cache.set("remote", object())
+    auth.use_invalidation_publisher(FakeRedis())
+    try:
+        with patch.object(auth, "USER_CACHE_PUBSUB", True):
+            await auth.invalidate_user("remote")
+    finally:
+        auth.use_invalidation_publisher(None)
+    assert auth.user_cache.get("remote") is None, "Local cache entry kept"
+    assert published == [(auth.USER_CACHE_CHANNEL, "remote")], "Not published"
@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+
+from backend.api.warmup import warm_up
+
+HEAVY_MODULES = ("sklearn", "scipy", "pandas")
+
+
+def test_api_import_defers_heavy_modules():
+    """Importing the app must not load sklearn or pandas (cold start)."""
+    code = (
+        "import sys, backend.api.main; "
+        f"print('loaded:', *(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.getcwd()},
+        check=True,
+    )
+    line = next(l for l in proc.stdout.splitlines() if l.startswith("loaded:"))
+    assert line == "loaded:", f"Imported at startup: {line}"
+
+
+def test_warm_up_fits_every_model():
+    assert warm_up() > 0, "Warm-up did not run"